@@ -0,0 +1,66 @@
+"""
+Import time of the package, measured in fresh interpreters.
+
+Each statement runs ``--repeat`` times in a new Python process; the bare interpreter
+startup is reported first and subtracted from the others. Resolving a binary path
+selects the HMMER backend, which probes the binaries found on ``PATH`` or
+``HMMER_BIN`` unless their versions are cached. Use ``--max-ms`` to fail
+when ``import hmmer`` gets slower than a budget.
+
+Usage::
+
+    python benchmarks/bench_import.py --repeat 50
+    python benchmarks/bench_import.py --max-ms 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+_STATEMENTS = [
+    "pass",
+    "import hmmer",
+    "from hmmer import read_domtbl",
+    "from hmmer import HMMER",
+    "from hmmer.bin import hmmscan",
+    "from hmmer import example_filepath; example_filepath",
+]
+
+
+def _timings(statement: str, repeat: int) -> List[float]:
+    cmd = [sys.executable, "-c", statement]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.check_call(cmd)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    print(f"{'statement':<56} {'median ms':>10} {'import ms':>10}")
+    baseline = 0.0
+    package = 0.0
+    for statement in _STATEMENTS:
+        median = statistics.median(_timings(statement, args.repeat)) * 1000
+        if statement == "pass":
+            baseline = median
+        elif statement == "import hmmer":
+            package = median - baseline
+        print(f"{statement:<56} {median:10.1f} {median - baseline:10.1f}")
+
+    if args.max_ms is not None and package > args.max_ms:
+        print(f"import hmmer took {package:.1f} ms, over {args.max_ms} ms.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Latency of single-sequence scans: per-call HMMER.scan against a warm session.
+
+Usage::
+
+    python benchmarks/bench_session.py --nqueries 200 --nprofiles 500
+"""
+
+import argparse
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from statistics import mean, median
+
+from hmmer import HMMER
+from hmmer.test._synthetic import write_profiles, write_sequences
+
+
+def _queries(filepath: Path):
+    text = filepath.read_text()
+    return [">" + block for block in text.split(">")[1:]]
+
+
+def _report(name: str, latencies, elapsed: float):
+    ms = [x * 1000 for x in latencies]
+    print(
+        f"{name:<26} {mean(ms):9.2f} {median(ms):9.2f} {max(ms):9.2f} "
+        f"{len(ms) / elapsed:10.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nqueries", type=int, default=200)
+    parser.add_argument("--nprofiles", type=int, default=500)
+    parser.add_argument("--nworkers", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        profile = write_profiles(Path(tmpdir) / "db.hmm", args.nprofiles, 100)
+        seqs = Path(tmpdir) / "seqs.fasta"
+        write_sequences(seqs, args.nqueries, args.nprofiles, 100)
+        queries = _queries(seqs)
+        output = Path(tmpdir) / "output.txt"
+
+        hmmer = HMMER(profile)
+        hmmer.press()
+
+        print(
+            f"{'path':<26} {'mean ms':>9} {'median ms':>9} {'max ms':>9} {'queries/s':>10}"
+        )
+
+        latencies = []
+        start = time.perf_counter()
+        for query in queries:
+            t = time.perf_counter()
+            hmmer.scan(StringIO(query), output=output).tbl
+            latencies.append(time.perf_counter() - t)
+        _report("HMMER.scan", latencies, time.perf_counter() - start)
+
+        with hmmer.session(nworkers=args.nworkers) as session:
+            latencies = []
+            start = time.perf_counter()
+            for query in queries:
+                t = time.perf_counter()
+                session.scan(StringIO(query)).tbl
+                latencies.append(time.perf_counter() - t)
+            _report("Session.scan", latencies, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            submitted = [
+                (time.perf_counter(), session.submit_scan(StringIO(q))) for q in queries
+            ]
+            latencies = []
+            for t, future in submitted:
+                future.result().tbl
+                latencies.append(time.perf_counter() - t)
+            _report("Session.submit_scan", latencies, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
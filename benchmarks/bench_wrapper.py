@@ -0,0 +1,220 @@
+"""
+Overhead of the Python layer: wrapped runs against the bare binaries, table parsing
+throughput, and fetch/emit latency.
+
+Every case runs in a fresh process so that its peak resident set size is its own;
+it excludes the HMMER binaries, which run as child processes.
+Everything is generated locally, so no network access is needed.
+
+Usage::
+
+    python benchmarks/bench_wrapper.py --sizes 1000 10000 100000 1000000
+    python benchmarks/bench_wrapper.py --only parse --sizes 1000000
+    python benchmarks/bench_wrapper.py --only wrapper fetch --repeat 50
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from subprocess import DEVNULL, check_call
+from typing import Callable, List, Tuple
+
+from hmmer import (
+    HMMER,
+    SeqDB,
+    read_domtbl,
+    read_domtbl_columns,
+    read_tbl,
+    read_tbl_columns,
+)
+from hmmer._misc import temporary_directory
+from hmmer.bin import hmmscan, hmmsearch, phmmer
+from hmmer.hmmer import make_target
+from hmmer.test._synthetic import (
+    write_domtbl,
+    write_profiles,
+    write_sequences,
+    write_tbl,
+)
+
+_READERS = {
+    "read_tbl": read_tbl,
+    "read_tbl_columns": read_tbl_columns,
+    "read_domtbl": read_domtbl,
+    "read_domtbl_columns": read_domtbl_columns,
+}
+
+
+def _peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / (1 << 10)
+
+
+def _in_child(func: Callable, *args) -> Tuple[float, int, float]:
+    # Returns elapsed seconds, number of items and peak RSS of a fresh process.
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(_measure, (func,) + args)
+
+
+def _measure(func: Callable, *args) -> Tuple[float, int, float]:
+    start = time.perf_counter()
+    count = func(*args)
+    return time.perf_counter() - start, count, _peak_rss_mb()
+
+
+def _parse(reader: str, filepath: Path) -> int:
+    return len(_READERS[reader](filepath))
+
+
+def _calls(func: Callable, repeat: int) -> int:
+    for _ in range(repeat):
+        func()
+    return repeat
+
+
+def _raw(cmd: List[str], repeat: int) -> int:
+    return _calls(lambda: check_call(cmd, stdout=DEVNULL), repeat)
+
+
+def _tempdir(query: str, repeat: int) -> int:
+    def once():
+        with temporary_directory() as tmp:
+            make_target(StringIO(query), Path(tmp.name))
+
+    return _calls(once, repeat)
+
+
+def _scan(profile: Path, query: str, repeat: int) -> int:
+    hmmer = HMMER(profile)
+    return _calls(lambda: hmmer.scan(StringIO(query), output=os.devnull).tbl, repeat)
+
+
+def _search(profile: Path, query: str, repeat: int) -> int:
+    hmmer = HMMER(profile)
+    return _calls(lambda: hmmer.search(StringIO(query), output=os.devnull).tbl, repeat)
+
+
+def _phmmer(db: Path, query: str, repeat: int) -> int:
+    seqdb = SeqDB(db)
+    return _calls(lambda: seqdb.phmmer(StringIO(query), output=os.devnull).tbl, repeat)
+
+
+def _fetch(profile: Path, keys: List[str], repeat: int) -> int:
+    hmmer = HMMER(profile)
+    return _calls(lambda: [hmmer.fetch([key]) for key in keys], repeat) * len(keys)
+
+
+def _emit(profile: Path, keys: List[str], repeat: int) -> int:
+    hmmer = HMMER(profile)
+    return _calls(lambda: [hmmer.emit(key) for key in keys], repeat) * len(keys)
+
+
+def _emit_many(profile: Path, keys: List[str], repeat: int) -> int:
+    hmmer = HMMER(profile)
+    return _calls(lambda: list(hmmer.emit_many(keys)), repeat) * len(keys)
+
+
+def _header(unit: str):
+    print(f"{'path':<28} {unit:>9} {'seconds':>9} {unit + '/sec':>13} {'RSS MB':>8}")
+
+
+def _report(name: str, elapsed: float, count: int, rss: float, extra: str = ""):
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{name:<28} {count:9d} {elapsed:9.3f} {rate:13.1f} {rss:8.1f}{extra}")
+
+
+def bench_parse(tmpdir: Path, sizes: List[int]):
+    print("\n# Parse throughput")
+    _header("rows")
+    for nrows in sizes:
+        tbl = write_tbl(tmpdir / f"tbl.{nrows}.txt", nrows)
+        domtbl = write_domtbl(tmpdir / f"domtbl.{nrows}.txt", nrows)
+        for reader in _READERS:
+            filepath = tbl if reader.startswith("read_tbl") else domtbl
+            elapsed, count, rss = _in_child(_parse, reader, filepath)
+            _report(f"{reader} {nrows}", elapsed, count, rss)
+        tbl.unlink()
+        domtbl.unlink()
+
+
+def bench_wrapper(tmpdir: Path, nprofiles: int, repeat: int):
+    print(f"\n# Wrapper overhead, mean over {repeat} single-sequence calls")
+    profile = write_profiles(tmpdir / "db.hmm", nprofiles, 100)
+    seqs = write_sequences(tmpdir / "db.fasta", nprofiles, nprofiles, 100)
+    HMMER(profile).press()
+    query_file = tmpdir / "query.fasta"
+    query = ">" + seqs.read_text().split(">")[1]
+    query_file.write_text(query)
+
+    def raw(bin: Path, *positional: Path) -> List[str]:
+        opts = ["-o", os.devnull, "--tblout", os.devnull, "--domtblout", os.devnull]
+        return [str(bin)] + opts + [str(p) for p in positional]
+
+    # The wrapped searches run the query sequence against the database.
+    cases = [
+        ("hmmscan", raw(hmmscan, profile, query_file), _scan, profile),
+        ("hmmsearch", raw(hmmsearch, profile, query_file), _search, profile),
+        ("phmmer", raw(phmmer, query_file, seqs), _phmmer, seqs),
+    ]
+
+    _header("calls")
+    elapsed, count, rss = _in_child(_tempdir, query, repeat)
+    _report("temporary dir + target", elapsed, count, rss)
+    for name, cmd, func, database in cases:
+        raw_elapsed, count, rss = _in_child(_raw, cmd, repeat)
+        _report(f"{name} (binary)", raw_elapsed, count, rss)
+        elapsed, count, rss = _in_child(func, database, query, repeat)
+        overhead = (elapsed - raw_elapsed) / repeat * 1000
+        _report(f"{name} (wrapper)", elapsed, count, rss, f"  {overhead:+.2f} ms/call")
+
+
+def bench_fetch(tmpdir: Path, nprofiles: int, repeat: int):
+    print("\n# Fetch and emit latency")
+    profile = write_profiles(tmpdir / "fetch.hmm", nprofiles, 100)
+    keys = [f"Fam{i + 1}" for i in range(0, nprofiles, max(1, nprofiles // 10))]
+
+    _header("calls")
+    for label, index in [("no index", False), ("SSI index", True)]:
+        if index:
+            HMMER(profile).index()
+        for name, func in [
+            ("fetch", _fetch),
+            ("emit", _emit),
+            ("emit_many", _emit_many),
+        ]:
+            elapsed, count, rss = _in_child(func, profile, keys, repeat)
+            _report(f"{name} ({label})", elapsed, count, rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--only", nargs="+", choices=["parse", "wrapper", "fetch"], default=None
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--nprofiles", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    only = args.only or ["parse", "wrapper", "fetch"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if "wrapper" in only:
+            bench_wrapper(Path(tmpdir), args.nprofiles, args.repeat)
+        if "fetch" in only:
+            bench_fetch(Path(tmpdir), args.nprofiles, args.repeat)
+        if "parse" in only:
+            bench_parse(Path(tmpdir), args.sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,127 @@
 from importlib import import_module as _import_module
-
-from . import typing
-from ._example import example_filepath
-from ._testit import test
-from .bin import binary_version
-from .domtbl import read_domtbl
-from .hmmer import HMMER, SeqDB
-from .tbl import read_tbl
+from typing import TYPE_CHECKING
 
 try:
     __version__ = getattr(_import_module("hmmer._version"), "version", "x.x.x")
 except ModuleNotFoundError:
     __version__ = "x.x.x"
 
+# Submodules are imported on first access of their names, so that importing the
+# package stays cheap for short-lived processes.
+_LAZY = {
+    "DirectoryQueue": "workqueue",
+    "DomTBLArchive": "archive",
+    "HMMER": "hmmer",
+    "ResultCache": "cache",
+    "SQLiteQueue": "workqueue",
+    "SSIIndex": "ssi",
+    "SeqDB": "hmmer",
+    "TBLArchive": "archive",
+    "best_hits": "postprocess",
+    "binary_version": "bin",
+    "example_filepath": "_example",
+    "filter_domains": "postprocess",
+    "iter_domain_alignments": "output",
+    "iter_domtbl": "domtbl",
+    "iter_stockholm": "stockholm",
+    "iter_tbl": "tbl",
+    "merge_scan": "workqueue",
+    "publish_scan": "workqueue",
+    "read_domtbl": "domtbl",
+    "read_domtbl_columns": "domtbl",
+    "read_tbl": "tbl",
+    "read_tbl_columns": "tbl",
+    "resolve_overlaps": "postprocess",
+    "run_worker": "workqueue",
+    "test": "_testit",
+    "write_domtbl_archive": "archive",
+    "write_domtbl_parquet": "export",
+    "write_domtbl_sqlite": "export",
+    "write_tbl_archive": "archive",
+    "write_tbl_parquet": "export",
+    "write_tbl_sqlite": "export",
+}
+
+if TYPE_CHECKING:
+    from . import typing
+    from ._example import example_filepath
+    from ._testit import test
+    from .archive import (
+        DomTBLArchive,
+        TBLArchive,
+        write_domtbl_archive,
+        write_tbl_archive,
+    )
+    from .bin import binary_version
+    from .cache import ResultCache
+    from .domtbl import iter_domtbl, read_domtbl, read_domtbl_columns
+    from .export import (
+        write_domtbl_parquet,
+        write_domtbl_sqlite,
+        write_tbl_parquet,
+        write_tbl_sqlite,
+    )
+    from .hmmer import HMMER, SeqDB
+    from .output import iter_domain_alignments
+    from .postprocess import best_hits, filter_domains, resolve_overlaps
+    from .ssi import SSIIndex
+    from .stockholm import iter_stockholm
+    from .tbl import iter_tbl, read_tbl, read_tbl_columns
+    from .workqueue import (
+        DirectoryQueue,
+        SQLiteQueue,
+        merge_scan,
+        publish_scan,
+        run_worker,
+    )
+
+
+def __getattr__(name: str):
+    if name == "typing":
+        return _import_module(f"{__name__}.typing")
+    if name in _LAZY:
+        value = getattr(_import_module(f"{__name__}.{_LAZY[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
+    "DirectoryQueue",
+    "DomTBLArchive",
     "HMMER",
+    "ResultCache",
+    "SQLiteQueue",
+    "SSIIndex",
     "SeqDB",
+    "TBLArchive",
     "__version__",
-    "example_filepath",
+    "best_hits",
     "binary_version",
+    "example_filepath",
+    "filter_domains",
+    "iter_domain_alignments",
+    "iter_domtbl",
+    "iter_stockholm",
+    "iter_tbl",
+    "merge_scan",
+    "publish_scan",
     "read_domtbl",
+    "read_domtbl_columns",
     "read_tbl",
+    "read_tbl_columns",
+    "resolve_overlaps",
+    "run_worker",
     "test",
     "typing",
+    "write_domtbl_archive",
+    "write_domtbl_parquet",
+    "write_domtbl_sqlite",
+    "write_tbl_archive",
+    "write_tbl_parquet",
+    "write_tbl_sqlite",
 ]
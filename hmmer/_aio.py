@@ -0,0 +1,119 @@
+import asyncio
+import csv
+import os
+import weakref
+from asyncio.subprocess import PIPE
+from subprocess import CalledProcessError, TimeoutExpired
+from typing import IO, AsyncIterator, List, Optional, Union
+
+from .domtbl import DomTBLRow, make_domtbl_row
+
+__all__ = ["Limiter", "run_async", "stream_domtbl"]
+
+
+class Limiter:
+    """
+    Bound on the number of concurrent processes, with one semaphore per event loop.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self._limit = limit or os.cpu_count() or 1
+        self._semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @limit.setter
+    def limit(self, limit: int):
+        self._limit = limit
+        self._semaphores.clear()
+
+    def semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_event_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self._limit)
+        return self._semaphores[loop]
+
+
+async def _kill(proc: asyncio.subprocess.Process):
+    if proc.returncode is None:
+        proc.kill()
+        await proc.wait()
+
+
+def _remaining(cmd: List[str], timeout: Optional[float], deadline: float):
+    if timeout is None:
+        return None
+    left = deadline - asyncio.get_event_loop().time()
+    if left <= 0:
+        raise TimeoutExpired(cmd, timeout)
+    return left
+
+
+async def run_async(
+    cmd: List[str],
+    limiter: Limiter,
+    timeout: Optional[float],
+    stdout: Union[int, IO, None] = None,
+):
+    """
+    Run a command without blocking the event loop.
+
+    The process is killed if it takes longer than ``timeout`` seconds, raising
+    :class:`subprocess.TimeoutExpired`, or if the calling task is cancelled. A
+    non-zero exit status raises :class:`subprocess.CalledProcessError`.
+    """
+    async with limiter.semaphore():
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=stdout)
+        try:
+            returncode = await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutExpired(cmd, timeout) from None
+        finally:
+            await _kill(proc)
+
+    if returncode != 0:
+        raise CalledProcessError(returncode, cmd)
+
+
+async def stream_domtbl(
+    cmd: List[str], limiter: Limiter, timeout: Optional[float], typed: bool = False
+) -> AsyncIterator[DomTBLRow]:
+    """
+    Run a command writing a domtbl file to its standard output and yield the rows
+    as they come.
+
+    ``timeout`` bounds the whole run, including the time spent by the consumer.
+    Closing the iterator early kills the process.
+    """
+    async with limiter.semaphore():
+        deadline = asyncio.get_event_loop().time() + (timeout or 0)
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=PIPE)
+        assert proc.stdout is not None
+        try:
+            while True:
+                left = _remaining(cmd, timeout, deadline)
+                try:
+                    line = await asyncio.wait_for(proc.stdout.readline(), left)
+                except asyncio.TimeoutError:
+                    raise TimeoutExpired(cmd, timeout) from None
+                if not line:
+                    break
+                if line.startswith(b"#"):
+                    continue
+                fields = next(
+                    csv.reader([line.decode()], delimiter=" ", skipinitialspace=True)
+                )
+                yield make_domtbl_row(fields, typed)
+
+            left = _remaining(cmd, timeout, deadline)
+            try:
+                returncode = await asyncio.wait_for(proc.wait(), left)
+            except asyncio.TimeoutError:
+                raise TimeoutExpired(cmd, timeout) from None
+        finally:
+            await _kill(proc)
+
+    if returncode != 0:
+        raise CalledProcessError(returncode, cmd)
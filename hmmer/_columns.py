@@ -0,0 +1,81 @@
+import gc
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import IO, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from ._misc import decomment
+
+__all__ = ["read_columns"]
+
+
+def _convert(fields: List[List[str]], spec: Sequence[Tuple[str, Union[type, str]]]):
+    ncols = len(spec)
+    for row in fields:
+        if len(row) < ncols:
+            row += [""] * (ncols - len(row))
+
+    table = np.array(fields, dtype=object)
+    cols = [table[:, j].astype(dtype) for j, (_, dtype) in enumerate(spec)]
+    # Free-text last column keeps the line ending.
+    cols[-1] = np.array([x.rstrip() for x in cols[-1]], dtype=object)
+    return cols
+
+
+@contextmanager
+def _nogc():
+    # Millions of short-lived lists would otherwise trigger many useless collections.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def read_columns(
+    file: Union[str, Path, IO[str]],
+    spec: Sequence[Tuple[str, Union[type, str]]],
+    chunksize: int = 1 << 18,
+) -> List[np.ndarray]:
+    """
+    Tokenize whitespace-delimited table rows into one array per column.
+
+    The last column of ``spec`` takes the rest of each line. Rows are converted in
+    chunks of ``chunksize`` lines so that intermediate Python objects stay bounded.
+    """
+    closeit = False
+    if isinstance(file, str):
+        file = Path(file)
+
+    if isinstance(file, Path):
+        file = open(file, "r")
+        closeit = True
+
+    maxsplit = len(spec) - 1
+    chunks = []
+    try:
+        lines = decomment(file)
+        while True:
+            with _nogc():
+                fields = [
+                    line.split(None, maxsplit) for line in islice(lines, chunksize)
+                ]
+                fields = [row for row in fields if row]
+                if not fields:
+                    break
+                chunks.append(_convert(fields, spec))
+    finally:
+        if closeit:
+            file.close()
+
+    if not chunks:
+        return [np.empty(0, dtype=dtype) for _, dtype in spec]
+
+    if len(chunks) == 1:
+        return chunks[0]
+
+    return [np.concatenate(col) for col in zip(*chunks)]
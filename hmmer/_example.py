@@ -1,20 +1,28 @@
 import logging
+from functools import lru_cache
 from pathlib import Path
 
-import pooch
-
 __all__ = ["example_filepath"]
 
-pooch.get_logger().setLevel(logging.ERROR)
+_REGISTRY = {
+    "Pfam-A_24.hmm.gz": "32791a1b50837cbe1fca1376a3e1c45bc84b32dd4fe28c92fd276f3f2c3a15e3"
+}
+
 
-goodboy = pooch.create(
-    path=pooch.os_cache("hmmer"),
-    base_url="https://hmmer-py.s3.eu-west-2.amazonaws.com/",
-    registry={
-        "Pfam-A_24.hmm.gz": "32791a1b50837cbe1fca1376a3e1c45bc84b32dd4fe28c92fd276f3f2c3a15e3"
-    },
-)
+@lru_cache(maxsize=None)
+def _goodboy():
+    # pooch pulls in requests, so it is only imported to download an example.
+    import pooch
+
+    pooch.get_logger().setLevel(logging.ERROR)
+    return pooch.create(
+        path=pooch.os_cache("hmmer"),
+        base_url="https://hmmer-py.s3.eu-west-2.amazonaws.com/",
+        registry=_REGISTRY,
+    )
 
 
 def example_filepath(filename: str) -> Path:
-    return Path(goodboy.fetch(filename + ".gz", processor=pooch.Decompress()))
+    import pooch
+
+    return Path(_goodboy().fetch(filename + ".gz", processor=pooch.Decompress()))
@@ -1,7 +1,17 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Union
+from typing import Dict, Iterator, Union
 
-__all__ = ["decomment", "make_path"]
+__all__ = [
+    "decomment",
+    "make_path",
+    "read_json",
+    "temporary_directory",
+    "write_json",
+]
 
 
 def decomment(rows):
@@ -15,3 +25,40 @@ def make_path(path: Union[Path, str]) -> Path:
     if isinstance(path, str):
         path = Path(path)
     return path
+
+
+@contextmanager
+def temporary_directory() -> Iterator[tempfile.TemporaryDirectory]:
+    """
+    Temporary directory that is removed on error only.
+
+    On success, it is removed once the returned object is garbage collected, so that
+    it can be handed over to whatever lazily reads files from it.
+    """
+    tmpdir = tempfile.TemporaryDirectory()
+    try:
+        yield tmpdir
+    except BaseException:
+        tmpdir.cleanup()
+        raise
+
+
+def read_json(filepath: Path) -> Dict:
+    """
+    Content of a JSON file, or an empty dictionary if it is missing or corrupt.
+    """
+    try:
+        with open(filepath, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json(filepath: Path, data: Dict):
+    """
+    Replace the content of a JSON file atomically.
+    """
+    tmp = filepath.with_name(f".{filepath.name}.{os.getpid()}")
+    with open(tmp, "w") as file:
+        json.dump(data, file)
+    os.replace(tmp, filepath)
@@ -0,0 +1,150 @@
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from subprocess import CalledProcessError, Popen, TimeoutExpired
+from typing import IO, Callable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from .domtbl import DomTBLRow, iter_domtbl
+from .metrics import Metrics, wait_measured
+from .tbl import TBLRow, iter_tbl
+
+__all__ = ["run_piped"]
+
+
+class _Thread(threading.Thread):
+    """
+    Thread that keeps the return value or the exception of its function.
+    """
+
+    def __init__(self, func: Callable, *args):
+        super().__init__(daemon=True)
+        self._func = func
+        self._args = args
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+    def run(self):
+        try:
+            self.value = self._func(*self._args)
+        except BaseException as e:
+            self.error = e
+
+
+def _feed(fd: int, target: TextIO):
+    try:
+        with os.fdopen(fd, "w") as file:
+            shutil.copyfileobj(target, file)
+    except BrokenPipeError:
+        # The binary exited early: its exit status tells why.
+        pass
+
+
+def _read(fd: int, parse: Callable[[IO[str]], Iterator]) -> Tuple[list, int, float]:
+    # Also returns the size of the text read and the CPU time of the thread, which
+    # is the parsing time as it mostly waits for the binary otherwise.
+    nbytes = 0
+
+    def lines(file: IO[str]) -> Iterator[str]:
+        nonlocal nbytes
+        for line in file:
+            nbytes += len(line)
+            yield line
+
+    start = time.thread_time()
+    with os.fdopen(fd, "r") as file:
+        rows = list(parse(lines(file)))
+    return rows, nbytes, time.thread_time() - start
+
+
+def run_piped(
+    cmd: List[str],
+    positional: Callable[[str], List[str]],
+    target: Union[Path, TextIO],
+    tbl: bool,
+    domtbl: bool,
+    stdin: Optional[IO] = None,
+    timeout: Optional[float] = None,
+    metrics: Optional[Metrics] = None,
+) -> Tuple[Optional[List[TBLRow]], Optional[List[DomTBLRow]]]:
+    """
+    Run a binary without intermediate files.
+
+    A stream ``target`` is written to the binary through a pipe, passed to it as a
+    ``/dev/fd`` path, while the tbl and domtbl tables (if ``tbl`` and ``domtbl``) are
+    read back through pipes and parsed as they are written. ``positional`` gives the
+    positional arguments of the command for the target path. The binary run and the
+    parsing are recorded in ``metrics``.
+    """
+    child_fds: List[int] = []
+    parent_fds: List[int] = []
+    threads: List[_Thread] = []
+    readers: List[Optional[_Thread]] = []
+    cmd = list(cmd)
+
+    try:
+        for enabled, option, parse in [
+            (tbl, "--tblout", iter_tbl),
+            (domtbl, "--domtblout", iter_domtbl),
+        ]:
+            if not enabled:
+                readers.append(None)
+                continue
+            r, w = os.pipe()
+            child_fds.append(w)
+            parent_fds.append(r)
+            cmd += [option, f"/dev/fd/{w}"]
+            reader = _Thread(_read, r, parse)
+            readers.append(reader)
+            threads.append(reader)
+
+        if isinstance(target, Path):
+            cmd += positional(str(target))
+        else:
+            r, w = os.pipe()
+            child_fds.append(r)
+            parent_fds.append(w)
+            cmd += positional(f"/dev/fd/{r}")
+            threads.append(_Thread(_feed, w, target))
+
+        start = time.perf_counter()
+        with Popen(cmd, stdin=stdin, pass_fds=child_fds) as proc:
+            for fd in child_fds:
+                os.close(fd)
+            child_fds = []
+
+            # Threads own the parent ends of the pipes from now on.
+            parent_fds = []
+            for thread in threads:
+                thread.start()
+            try:
+                wait_measured(proc, metrics, start, timeout)
+            except TimeoutExpired:
+                proc.kill()
+                raise
+            finally:
+                for thread in threads:
+                    thread.join()
+    finally:
+        for fd in child_fds + parent_fds:
+            os.close(fd)
+
+    if proc.returncode != 0:
+        raise CalledProcessError(proc.returncode, cmd)
+
+    for thread in threads:
+        if thread.error is not None:
+            raise thread.error
+
+    tables: List[Optional[list]] = []
+    for table, reader in zip(["tbl", "domtbl"], readers):
+        if reader is None:
+            tables.append(None)
+            continue
+        rows, nbytes, seconds = reader.value
+        if metrics is not None:
+            metrics.add_written(table, nbytes)
+            metrics.add_parse(table, nbytes, len(rows), seconds)
+        tables.append(rows)
+    return tables[0], tables[1]
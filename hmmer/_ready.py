@@ -0,0 +1,233 @@
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from subprocess import DEVNULL, check_call
+from typing import Dict, Iterator, List, Optional
+
+from . import bin as binaries
+from ._misc import read_json, write_json
+
+__all__ = ["ensure_ready", "file_digest"]
+
+PRESS_EXTS = [".h3f", ".h3i", ".h3m", ".h3p"]
+INDEX_EXTS = [".ssi"]
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+def file_digest(filepath: Path) -> str:
+    """
+    SHA-256 of a file.
+    """
+    sha = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _sibling(filepath: Path, ext: str) -> Path:
+    return filepath.with_suffix(filepath.suffix + ext)
+
+
+@contextmanager
+def _locked(filepath: Path) -> Iterator[None]:
+    with open(filepath, "a") as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def _stat(filepath: Path) -> Dict:
+    stat = filepath.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _exts(press: bool, index: bool) -> List[str]:
+    return (PRESS_EXTS if press else []) + (INDEX_EXTS if index else [])
+
+
+def _is_fresh(
+    manifest: Dict, source: Path, base: Path, exts: List[str], digest: Optional[str]
+) -> bool:
+    if manifest.get("hmmer") != binaries.binary_version:
+        return False
+    if not set(exts) <= set(manifest.get("exts", [])):
+        return False
+    generation = manifest.get("generation")
+    if not generation:
+        return False
+    dest = base / generation / source.name
+    if not all(_sibling(dest, ext).exists() for ext in exts):
+        return False
+    if digest is not None:
+        return manifest.get("sha256") == digest
+    return manifest.get("source") == _stat(source)
+
+
+def _prune_cache(cache_dir: Path, sources: Dict):
+    # Sources that no longer exist are forgotten, and the directories of contents
+    # that no source has now or had last are removed.
+    live = set()
+    for path in list(sources):
+        if not Path(path).exists():
+            del sources[path]
+            continue
+        live.add(sources[path]["sha256"])
+        live.add(sources[path].get("previous"))
+
+    for entry in cache_dir.iterdir():
+        if entry.is_dir() and _DIGEST.match(entry.name) and entry.name not in live:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _source_digest(cache_dir: Path, source: Path) -> str:
+    # Digests of sources are remembered by size and mtime, so that a large database
+    # is hashed once.
+    memo_file = cache_dir / "sources.json"
+    stat = _stat(source)
+    memo = read_json(memo_file).get(str(source))
+    if memo is not None and memo["stat"] == stat:
+        return memo["sha256"]
+
+    digest = file_digest(source)
+    with _locked(cache_dir / "sources.lock"):
+        sources = read_json(memo_file)
+        previous = sources.get(str(source), {}).get("sha256")
+        if previous == digest:
+            previous = sources[str(source)].get("previous")
+        sources[str(source)] = {"stat": stat, "sha256": digest, "previous": previous}
+        _prune_cache(cache_dir, sources)
+        write_json(memo_file, sources)
+    return digest
+
+
+def _build(source: Path, generation: Path, exts: List[str]):
+    # Artifacts are built aside, in the same file system. A new generation directory
+    # is then renamed in place whole, and an existing one only gains new files, so
+    # that readers never see artifacts of different builds side by side.
+    tmpdir = Path(tempfile.mkdtemp(prefix=".build-", dir=generation.parent))
+    try:
+        work = tmpdir / source.name
+        os.symlink(source, work)
+        # hmmfetch indexes the binary file instead once the database is pressed.
+        if any(ext in INDEX_EXTS for ext in exts):
+            check_call(
+                [str(binaries.hmmfetch), "--index", work.name],
+                cwd=tmpdir,
+                stdout=DEVNULL,
+            )
+        if any(ext in PRESS_EXTS for ext in exts):
+            check_call(
+                [str(binaries.hmmpress), "-f", work.name], cwd=tmpdir, stdout=DEVNULL
+            )
+        if generation.exists():
+            dest = generation / source.name
+            for ext in exts:
+                os.replace(_sibling(work, ext), _sibling(dest, ext))
+        else:
+            os.rename(tmpdir, generation)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _prune(base: Path, keep: List[str]):
+    # The generation replaced last is kept for readers that still use it.
+    for entry in base.iterdir():
+        if entry.is_dir() and not entry.name.startswith("."):
+            if entry.name not in keep:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+def ensure_ready(
+    source: Path,
+    press: bool = True,
+    index: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> Path:
+    """
+    Make sure that pressed and indexed files of a profile database are up to date,
+    building them if they are missing or stale, and return the path of the database
+    they sit next to.
+
+    Artifacts of each source content and HMMER version are kept in a generation
+    directory, under a ``.ready`` directory next to the source, together with a link
+    to it. A ``ready.json`` manifest, written last, names the current generation and
+    holds the size, modification time and checksum of the source. A source whose
+    modification time changed is hashed again, and rebuilt only if its content
+    changed. Concurrent callers are serialized by a lock file. New generations are
+    built aside and renamed in place whole, and the files of a generation are never
+    replaced, so that the returned path always leads to artifacts of a single build.
+
+    With ``cache_dir``, the ``.ready`` directory is replaced by a directory of the
+    cache named after the checksum of the source, so that every process using the
+    same database content shares the artifacts. Whenever a source is hashed, the
+    directories of contents that no existing source has now or had before its last
+    change are removed, so that replaced and moved databases do not pile up.
+    """
+    source = source.absolute()
+    exts = _exts(press, index)
+
+    digest = None
+    if cache_dir is None:
+        base = _sibling(source, ".ready")
+    else:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        digest = _source_digest(cache_dir, source)
+        base = cache_dir / digest
+    base.mkdir(exist_ok=True)
+
+    manifest_file = base / "ready.json"
+    manifest = read_json(manifest_file)
+    if _is_fresh(manifest, source, base, exts, digest):
+        dest = base / manifest["generation"] / source.name
+        if dest.exists():
+            return dest
+
+    with _locked(base / ".lock"):
+        manifest = read_json(manifest_file)
+        if digest is None:
+            if _is_fresh(manifest, source, base, exts, None):
+                digest = manifest["sha256"]
+            else:
+                digest = file_digest(source)
+
+        previous = manifest.get("generation", "")
+        if _is_fresh(manifest, source, base, exts, digest):
+            generation = previous
+            exts = manifest["exts"]
+        else:
+            generation = f"{binaries.binary_version}-{digest[:16]}"
+            # Artifacts built before for the same content are built too.
+            if manifest.get("sha256") == digest:
+                exts = sorted(set(exts) | set(manifest.get("exts", [])))
+            dest = base / generation / source.name
+            missing = [ext for ext in exts if not _sibling(dest, ext).exists()]
+            if len(missing) > 0:
+                _build(source, base / generation, missing)
+
+        dest = base / generation / source.name
+        if not dest.exists():
+            # Dangling link to a former path of the source.
+            link = dest.with_name(f".{dest.name}.{os.getpid()}")
+            os.symlink(source, link)
+            os.replace(link, dest)
+
+        manifest = {
+            "generation": generation,
+            "hmmer": binaries.binary_version,
+            "exts": exts,
+            "source": _stat(source),
+            "sha256": digest,
+        }
+        write_json(manifest_file, manifest)
+        _prune(base, [generation, previous])
+
+    return dest
@@ -0,0 +1,268 @@
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from subprocess import run
+from typing import TYPE_CHECKING, Dict, List, Optional, TextIO, Tuple, Union
+
+from . import bin as binaries
+from ._shard import DOMTBL_QUERY, TBL_QUERY, replace_field
+from .hmmer import Options, Result
+
+if TYPE_CHECKING:
+    from .hmmer import HMMER
+
+__all__ = ["Session"]
+
+_SCAN = 0
+_SEARCH = 1
+
+
+def _records(target: Union[Path, str, TextIO]) -> List[Tuple[str, str]]:
+    """
+    Split FASTA content into (name, rest of the record) pairs.
+    """
+    if isinstance(target, str):
+        target = Path(target)
+
+    if isinstance(target, Path):
+        text = target.read_text()
+    else:
+        text = target.read()
+
+    records = []
+    for block in ("\n" + text).split("\n>")[1:]:
+        name = block.split(None, 1)[0]
+        records.append((name, block[len(name) :].rstrip("\n") + "\n"))
+    return records
+
+
+class _Request:
+    __slots__ = ("kind", "records", "future")
+
+    def __init__(self, kind: int, records: List[Tuple[str, str]]):
+        self.kind = kind
+        self.records = records
+        self.future: "Future[Result]" = Future()
+
+
+class Session:
+    """
+    Long-lived runner of scans and searches against a profile database.
+
+    Worker threads are started once and reuse the same scratch files for every call,
+    so no temporary directory is created per query. Targets are passed to hmmscan
+    through its standard input, and scans submitted while a worker is busy are
+    batched into a single hmmscan run, amortizing the process start-up and the
+    profile database reads over many queries. Searches run one call per process, as
+    their E-values depend on the number of target sequences.
+
+    Use :meth:`.HMMER.session` to create one, preferably as a context manager.
+
+    Parameters
+    ----------
+    hmmer
+        Profile database.
+    nworkers
+        Number of concurrent binary processes. Defaults to ``1``.
+    batch_size
+        Maximum number of scan calls merged into one hmmscan run. Defaults to ``32``.
+    timeout
+        Seconds a single run may take. Defaults to no limit.
+    warm
+        Read the pressed database files once at start-up, so that the first queries
+        find them in the page cache. Defaults to ``True``.
+    """
+
+    def __init__(
+        self,
+        hmmer: "HMMER",
+        nworkers: int = 1,
+        batch_size: int = 32,
+        heuristic: bool = True,
+        cut_ga: bool = False,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        timeout: Optional[float] = None,
+        warm: bool = True,
+    ):
+        self._profile = hmmer._profile
+        self._options = Options(
+            os.devnull,
+            heuristic=heuristic,
+            cut_ga=cut_ga,
+            Z=Z,
+            domZ=domZ,
+            cpu=cpu,
+        )
+        self._batch_size = batch_size
+        self._timeout = timeout
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+
+        if warm and hmmer.is_pressed:
+            self._warm()
+
+        self._workers = []
+        for i in range(nworkers):
+            worker = threading.Thread(target=self._work, args=(i,), daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _warm(self):
+        p = self._profile
+        for ext in [".h3m", ".h3i", ".h3f", ".h3p"]:
+            with open(p.with_suffix(p.suffix + ext), "rb") as file:
+                while file.read(1 << 20):
+                    pass
+
+    def submit_scan(self, target: Union[Path, str, TextIO]) -> "Future[Result]":
+        """
+        Schedule a scan of target sequences and return its future result.
+        """
+        return self._submit(_SCAN, target)
+
+    def submit_search(self, target: Union[Path, str, TextIO]) -> "Future[Result]":
+        """
+        Schedule a search of the profiles against target sequences and return its
+        future result.
+        """
+        return self._submit(_SEARCH, target)
+
+    def scan(self, target: Union[Path, str, TextIO]) -> Result:
+        """
+        Scan target sequences against the profile database.
+        """
+        return self.submit_scan(target).result()
+
+    def search(self, target: Union[Path, str, TextIO]) -> Result:
+        """
+        Search the profiles against target sequences.
+        """
+        return self.submit_search(target).result()
+
+    def _submit(self, kind: int, target: Union[Path, str, TextIO]) -> "Future[Result]":
+        request = _Request(kind, _records(target))
+        # Nothing is queued after the stop requests, which would never be served.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Session is closed.")
+            self._queue.put(request)
+        return request.future
+
+    def close(self):
+        """
+        Finish pending calls and stop the workers.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._workers:
+                self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request.future.set_exception(RuntimeError("Session is closed."))
+        self._tmpdir.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _work(self, worker: int):
+        dirpath = Path(self._tmpdir.name) / str(worker)
+        dirpath.mkdir()
+        opts = self._options.replace(
+            tblout=dirpath / "tbl.txt", domtblout=dirpath / "domtbl.txt"
+        )
+        target = dirpath / "target.fasta"
+
+        pending: List[Optional[_Request]] = []
+        while True:
+            request = pending.pop() if pending else self._queue.get()
+            if request is None:
+                return
+
+            batch = [request]
+            while request.kind == _SCAN and len(batch) < self._batch_size:
+                try:
+                    queued = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if queued is not None and queued.kind == _SCAN:
+                    batch.append(queued)
+                else:
+                    pending.append(queued)
+                    break
+
+            try:
+                if request.kind == _SCAN:
+                    results = self._scan(batch, opts)
+                else:
+                    results = [self._search(request, opts, target)]
+            except Exception as e:
+                for r in batch:
+                    r.future.set_exception(e)
+            else:
+                for r, result in zip(batch, results):
+                    r.future.set_result(result)
+
+    def _run(self, cmd: List[str], input: Optional[str], opts: Options):
+        run(cmd, input=input, text=True, check=True, timeout=self._timeout)
+        return opts.tblout.read_text(), opts.domtblout.read_text()
+
+    def _scan(self, batch: List[_Request], opts: Options) -> List[Result]:
+        origin: List[Tuple[int, str]] = []
+        fasta = []
+        for i, request in enumerate(batch):
+            for name, rest in request.records:
+                fasta.append(f">q{len(origin)}{rest}")
+                origin.append((i, name))
+
+        cmd = [str(binaries.hmmscan)] + opts.aslist()
+        cmd += ["--qformat", "fasta", str(self._profile), "-"]
+        tbl, domtbl = self._run(cmd, "".join(fasta), opts)
+
+        tbls = _split_rows(tbl, TBL_QUERY, origin, len(batch))
+        domtbls = _split_rows(domtbl, DOMTBL_QUERY, origin, len(batch))
+        return [Result.from_text(t, d) for t, d in zip(tbls, domtbls)]
+
+    def _search(self, request: _Request, opts: Options, target: Path) -> Result:
+        with open(target, "w") as file:
+            for name, rest in request.records:
+                file.write(f">{name}{rest}")
+
+        cmd = (
+            [str(binaries.hmmsearch)]
+            + opts.aslist()
+            + [str(self._profile), str(target)]
+        )
+        tbl, domtbl = self._run(cmd, None, opts)
+        return Result.from_text(tbl, domtbl)
+
+
+def _split_rows(
+    text: str, column: int, origin: List[Tuple[int, str]], nrequests: int
+) -> List[str]:
+    rows: Dict[int, List[str]] = {i: [] for i in range(nrequests)}
+    for line in text.splitlines(keepends=True):
+        if line.startswith("#"):
+            continue
+        query = line.split(None, column + 1)[column]
+        i, name = origin[int(query[1:])]
+        rows[i].append(replace_field(line, column, name))
+    return ["".join(rows[i]) for i in range(nrequests)]
@@ -0,0 +1,364 @@
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+__all__ = [
+    "concat_files",
+    "concat_tables",
+    "count_sequences",
+    "fasta_records",
+    "merge_search_tables",
+    "profile_accessions",
+    "profile_names",
+    "replace_field",
+    "replace_tail",
+    "reported_targets",
+    "rows_by_field",
+    "select_profiles",
+    "select_sequences",
+    "sequence_names",
+    "shard_sizes",
+    "sort_rows",
+    "split_by_query",
+    "split_fasta",
+    "split_profiles",
+]
+
+_token = re.compile(r"\S+")
+
+# Column of the query name in tbl and domtbl files.
+TBL_QUERY = 2
+DOMTBL_QUERY = 3
+# Full sequence E-value column, followed by the score one.
+TBL_EVALUE = 4
+DOMTBL_EVALUE = 6
+# First column of the target description, which runs to the end of the line.
+TBL_DESCRIPTION = 18
+DOMTBL_DESCRIPTION = 22
+
+
+def count_sequences(filepath: Path) -> int:
+    """
+    Number of sequences in a FASTA file.
+    """
+    n = 0
+    with open(filepath, "rb") as file:
+        for line in file:
+            if line.startswith(b">"):
+                n += 1
+    return n
+
+
+def fasta_records(filepath: Path) -> Iterator[Tuple[str, str, str]]:
+    """
+    Name, full text and residues of each record of a FASTA file.
+    """
+
+    def record(lines: List[str]) -> Tuple[str, str, str]:
+        name = lines[0][1:].split(None, 1)[0]
+        residues = "".join("".join(line.split()) for line in lines[1:])
+        return name, "".join(lines), residues
+
+    lines: List[str] = []
+    with open(filepath, "r") as file:
+        for line in file:
+            if line.startswith(">"):
+                if lines:
+                    yield record(lines)
+                lines = []
+            if lines or line.startswith(">"):
+                lines.append(line)
+    if lines:
+        yield record(lines)
+
+
+def sequence_names(filepath: Path) -> List[str]:
+    """
+    Name of each record of a FASTA file, in order.
+    """
+    names: List[str] = []
+    with open(filepath, "rb") as file:
+        for line in file:
+            if line.startswith(b">"):
+                names.append(line[1:].split(None, 1)[0].decode())
+    return names
+
+
+def shard_sizes(nsequences: int, nshards: int) -> List[int]:
+    """
+    Split ``nsequences`` into at most ``nshards`` contiguous, non-empty blocks.
+    """
+    nshards = max(1, min(nshards, nsequences))
+    size, rem = divmod(nsequences, nshards)
+    return [size + (i < rem) for i in range(nshards)]
+
+
+def split_fasta(filepath: Path, sizes: List[int], dirpath: Path) -> List[Path]:
+    """
+    Write consecutive blocks of ``sizes[i]`` sequences to ``dirpath/shard.{i}.fasta``.
+    """
+    shards = [dirpath / f"shard.{i}.fasta" for i in range(len(sizes))]
+    i = -1
+    left = 0
+    out = None
+    with open(filepath, "rb") as file:
+        for line in file:
+            if line.startswith(b">"):
+                if left == 0:
+                    if out is not None:
+                        out.close()
+                    i += 1
+                    left = sizes[i]
+                    out = open(shards[i], "wb")
+                left -= 1
+            if out is not None:
+                out.write(line)
+    if out is not None:
+        out.close()
+    return shards
+
+
+def profile_names(filepath: Path) -> Dict[str, int]:
+    """
+    Map each profile name to its position in a HMMER3 profile file.
+    """
+    names: Dict[str, int] = {}
+    with open(filepath, "rb") as file:
+        for line in file:
+            if line.startswith(b"NAME "):
+                names.setdefault(line[5:].strip().decode(), len(names))
+    return names
+
+
+def profile_accessions(filepath: Path) -> Dict[str, str]:
+    """
+    Map each profile accession to its name in a HMMER3 profile file.
+    """
+    accs: Dict[str, str] = {}
+    name = ""
+    with open(filepath, "rb") as file:
+        for line in file:
+            if line.startswith(b"NAME "):
+                name = line[5:].strip().decode()
+            elif line.startswith(b"ACC "):
+                accs[line[4:].strip().decode()] = name
+    return accs
+
+
+def split_profiles(data: bytes) -> Dict[str, bytes]:
+    """
+    Map each profile name and accession to the text of its profile, from the
+    contents of a HMMER3 profile file.
+    """
+    profiles: Dict[str, bytes] = {}
+    keys: List[str] = []
+    lines: List[bytes] = []
+    for line in data.splitlines(keepends=True):
+        lines.append(line)
+        if line.startswith(b"NAME ") or line.startswith(b"ACC "):
+            keys.append(line.split(None, 1)[1].strip().decode())
+        elif line.startswith(b"//"):
+            text = b"".join(lines)
+            for key in keys:
+                profiles.setdefault(key, text)
+            keys = []
+            lines = []
+    return profiles
+
+
+def _split_table(filepath: Path) -> Tuple[List[str], List[str], List[str]]:
+    header: List[str] = []
+    rows: List[str] = []
+    trailer: List[str] = []
+    with open(filepath, "r") as file:
+        for line in file:
+            if not line.startswith("#"):
+                rows.append(line)
+            elif rows or trailer:
+                trailer.append(line)
+            else:
+                header.append(line)
+    if not rows:
+        # Comment lines of an empty table: the first three form the header.
+        header, trailer = header[:3], header[3:]
+    return header, rows, trailer
+
+
+def _write_table(dest: Path, header: List[str], rows: List[str], trailer: List[str]):
+    with open(dest, "w") as file:
+        file.writelines(header)
+        file.writelines(rows)
+        file.writelines(trailer)
+
+
+def concat_files(srcs: List[Path], dest: Path):
+    """
+    Concatenate files in the given order.
+    """
+    with open(dest, "wb") as out:
+        for src in srcs:
+            with open(src, "rb") as file:
+                while True:
+                    chunk = file.read(1 << 20)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+
+
+def concat_tables(srcs: List[Path], dest: Path):
+    """
+    Concatenate the rows of tbl or domtbl files sharded by query.
+
+    Header and trailer comments are taken from the first file.
+    """
+    parts = [_split_table(src) for src in srcs]
+    rows = [row for part in parts for row in part[1]]
+    _write_table(dest, parts[0][0], rows, parts[0][2])
+
+
+def rows_by_field(filepath: Path, column: int) -> Tuple[str, Dict[str, List[str]], str]:
+    """
+    Group the rows of a tbl or domtbl file by the value of a column.
+
+    The header and trailer comments are returned around the groups.
+    """
+    header, rows, trailer = _split_table(filepath)
+    groups: Dict[str, List[str]] = OrderedDict()
+    for row in rows:
+        groups.setdefault(row.split(None, column + 1)[column], []).append(row)
+    return "".join(header), groups, "".join(trailer)
+
+
+def split_by_query(filepath: Path, column: int) -> Tuple[str, Dict[str, str]]:
+    """
+    Split a tbl or domtbl file into one table per query, keeping the header and
+    trailer comments in each of them.
+
+    The table without rows is returned first, for queries that have no hit.
+    """
+    head, groups, tail = rows_by_field(filepath, column)
+    tables = {query: head + "".join(r) + tail for query, r in groups.items()}
+    return head + tail, tables
+
+
+def replace_field(line: str, index: int, value: str) -> str:
+    """
+    Replace the ``index``-th whitespace-delimited field of a table row.
+    """
+    spans = [m.span() for m in _token.finditer(line)]
+    prev_end = spans[index - 1][1] if index > 0 else -1
+    start, end = spans[index]
+    width = end - prev_end - 1
+    return line[: prev_end + 1] + f"{value:>{width}}" + line[end:]
+
+
+def reported_targets(tbls: List[Path]) -> Dict[str, List[str]]:
+    """
+    Names of the target sequences reported for each query in tbl files of a hmmsearch
+    run sharded by target sequences.
+    """
+    reported: Dict[str, List[str]] = OrderedDict()
+    for tbl in tbls:
+        for row in _split_table(tbl)[1]:
+            fields = row.split(None, TBL_QUERY + 1)
+            reported.setdefault(fields[TBL_QUERY], []).append(fields[0])
+    return reported
+
+
+def select_profiles(filepath: Path, route: Dict[str, int], dests: List[Path]):
+    """
+    Write each profile of a HMMER3 profile file named in ``route`` to
+    ``dests[route[name]]``, keeping their order.
+    """
+    outs = [open(dest, "wb") for dest in dests]
+    try:
+        lines: List[bytes] = []
+        name = ""
+        with open(filepath, "rb") as file:
+            for line in file:
+                lines.append(line)
+                if line.startswith(b"NAME "):
+                    name = line[5:].strip().decode()
+                elif line.startswith(b"//"):
+                    if name in route:
+                        outs[route[name]].writelines(lines)
+                    lines = []
+                    name = ""
+    finally:
+        for out in outs:
+            out.close()
+
+
+def select_sequences(filepath: Path, names: Set[str], dest: Path):
+    """
+    Write the records of a FASTA file whose name is in ``names`` to ``dest``,
+    keeping their order.
+    """
+    keep = False
+    with open(filepath, "rb") as file, open(dest, "wb") as out:
+        for line in file:
+            if line.startswith(b">"):
+                keep = line[1:].split(None, 1)[0].decode() in names
+            if keep:
+                out.write(line)
+
+
+def replace_tail(line: str, index: int, value: str) -> str:
+    """
+    Replace the fields of a table row from the ``index``-th one to the end of the
+    line, such as the free-text description of a target.
+    """
+    start = [m.start() for m in _token.finditer(line)][index]
+    end = "\n" if line.endswith("\n") else ""
+    return line[:start] + value + end
+
+
+def merge_search_tables(
+    tbls: List[Path],
+    domtbls: List[Path],
+    tbl_dest: Optional[Path],
+    domtbl_dest: Optional[Path],
+    order: Dict[str, int],
+):
+    """
+    Merge tbl and domtbl files of hmmsearch runs over disjoint target sequences.
+
+    Rows of each query are sorted by increasing full sequence E-value, as hmmsearch
+    does, and queries follow ``order``.
+    """
+    for srcs, dest, query_col, evalue_col in [
+        (tbls, tbl_dest, TBL_QUERY, TBL_EVALUE),
+        (domtbls, domtbl_dest, DOMTBL_QUERY, DOMTBL_EVALUE),
+    ]:
+        if dest is None:
+            continue
+        parts = [_split_table(src) for src in srcs]
+        rows = [row for _, rows, _ in parts for row in rows]
+        rows = sort_rows(rows, query_col, evalue_col, order)
+        _write_table(dest, parts[0][0], rows, parts[0][2])
+
+
+def sort_rows(
+    rows: List[str], query_col: int, evalue_col: int, order: Dict[str, int]
+) -> List[str]:
+    """
+    Sort hmmsearch rows as a single run would: queries follow ``order``, and rows of
+    a query come by increasing E-value.
+    """
+    groups: Dict[str, List[Tuple[float, float, str, str]]] = OrderedDict()
+    for row in rows:
+        fields = row.split(None, evalue_col + 2)
+        evalue = float(fields[evalue_col])
+        score = float(fields[evalue_col + 1])
+        groups.setdefault(fields[query_col], []).append(
+            (evalue, -score, fields[0], row)
+        )
+
+    queries = sorted(groups.keys(), key=lambda q: order.get(q, len(order)))
+    merged: List[str] = []
+    for query in queries:
+        group = groups[query]
+        group.sort(key=lambda x: x[:3])
+        merged += [x[3] for x in group]
+    return merged
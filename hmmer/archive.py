@@ -0,0 +1,352 @@
+import struct
+from abc import ABC, abstractmethod
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from ._misc import make_path
+from .domtbl import (
+    _DOMTBL_SPEC,
+    DomTBLColumns,
+    DomTBLCoord,
+    DomTBLFloatDomScore,
+    DomTBLFloatSeqScore,
+    DomTBLIndex,
+    DomTBLRow,
+    iter_domtbl,
+)
+from .hmmer import Result
+from .tbl import (
+    _TBL_SPEC,
+    TBLColumns,
+    TBLDom,
+    TBLFloatScore,
+    TBLIndex,
+    TBLRow,
+    iter_tbl,
+)
+
+__all__ = [
+    "DomTBLArchive",
+    "TBLArchive",
+    "write_domtbl_archive",
+    "write_tbl_archive",
+]
+
+# Archive layout, little-endian:
+#
+#   header   magic, version, kind, number of records, offsets of the records and of
+#            the string table, number of strings (padded to 64 bytes)
+#   records  fixed-size records, one field per table column; text fields hold the
+#            index of a string in the string table
+#   strings  number of strings + 1 uint64 offsets, then the UTF-8 bytes of the
+#            strings, each stored once
+_MAGIC = b"HMMERARC"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQQ")
+_HEADER_SIZE = 64
+_TBL = 0
+_DOMTBL = 1
+
+Spec = List[Tuple[str, Union[type, str]]]
+Source = Union[Result, str, Path, IO[str]]
+
+
+def _record_dtype(spec: Spec) -> np.dtype:
+    fields = []
+    for name, dtype in spec:
+        if dtype is object:
+            fields.append((name, "<u4"))
+        else:
+            fields.append((name, np.dtype(dtype).newbyteorder("<")))
+    return np.dtype(fields)
+
+
+def _pad(file: IO[bytes]) -> int:
+    offset = file.tell()
+    padding = -offset % 8
+    file.write(bytes(padding))
+    return offset + padding
+
+
+def _write(
+    filepath: Path,
+    kind: int,
+    spec: Spec,
+    values: Iterator[List[Any]],
+    chunksize: int = 1 << 16,
+):
+    dtype = _record_dtype(spec)
+    text = [j for j, (_, t) in enumerate(spec) if t is object]
+    strings: Dict[str, int] = {}
+
+    with open(filepath, "wb") as file:
+        file.write(bytes(_HEADER_SIZE))
+        nrecords = 0
+        while True:
+            chunk = list(islice(values, chunksize))
+            if not chunk:
+                break
+            for row in chunk:
+                for j in text:
+                    row[j] = strings.setdefault(row[j], len(strings))
+            records = np.array([tuple(row) for row in chunk], dtype=dtype)
+            file.write(records.tobytes())
+            nrecords += len(chunk)
+
+        strings_offset = _pad(file)
+        blobs = [s.encode() for s in strings]
+        offsets = np.zeros(len(blobs) + 1, dtype="<u8")
+        np.cumsum([len(b) for b in blobs], out=offsets[1:])
+        file.write(offsets.tobytes())
+        file.write(b"".join(blobs))
+
+        file.seek(0)
+        header = (_MAGIC, _VERSION, kind, nrecords, _HEADER_SIZE)
+        file.write(_HEADER.pack(*header, strings_offset, len(blobs)))
+
+
+def _domtbl_values(rows: Iterable[DomTBLRow]) -> Iterator[List[Any]]:
+    for r in rows:
+        fs, d = r.full_sequence, r.domain
+        yield [
+            r.target.name,
+            r.target.accession,
+            r.target.length,
+            r.query.name,
+            r.query.accession,
+            r.query.length,
+            float(fs.e_value),
+            float(fs.score),
+            float(fs.bias),
+            d.id,
+            d.size,
+            float(d.c_value),
+            float(d.i_value),
+            float(d.score),
+            float(d.bias),
+            r.hmm_coord.start,
+            r.hmm_coord.stop,
+            r.ali_coord.start,
+            r.ali_coord.stop,
+            r.env_coord.start,
+            r.env_coord.stop,
+            float(r.acc),
+            r.description,
+        ]
+
+
+def _tbl_values(rows: Iterable[TBLRow]) -> Iterator[List[Any]]:
+    for r in rows:
+        fs, bd = r.full_sequence, r.best_1_domain
+        yield [
+            r.target.name,
+            r.target.accession,
+            r.query.name,
+            r.query.accession,
+            float(fs.e_value),
+            float(fs.score),
+            float(fs.bias),
+            float(bd.e_value),
+            float(bd.score),
+            float(bd.bias),
+            float(r.domain_numbers.exp),
+            *r.domain_numbers[1:],
+            r.description,
+        ]
+
+
+def write_domtbl_archive(source: Source, filepath: Union[str, Path]) -> Path:
+    """
+    Write domtbl rows to a binary archive, to be read back by
+    :class:`DomTBLArchive`.
+
+    Parameters
+    ----------
+    source
+        Result, or domtbl file path or stream.
+    filepath
+        Destination file path.
+    """
+    filepath = make_path(filepath)
+    if isinstance(source, Result):
+        rows = source.iter_domtbl()
+    else:
+        rows = iter_domtbl(source)
+    _write(filepath, _DOMTBL, _DOMTBL_SPEC, _domtbl_values(rows))
+    return filepath
+
+
+def write_tbl_archive(source: Source, filepath: Union[str, Path]) -> Path:
+    """
+    Write tbl rows to a binary archive, to be read back by :class:`TBLArchive`.
+
+    Parameters
+    ----------
+    source
+        Result, or tbl file path or stream.
+    filepath
+        Destination file path.
+    """
+    filepath = make_path(filepath)
+    if isinstance(source, Result):
+        rows = source.iter_tbl()
+    else:
+        rows = iter_tbl(source)
+    _write(filepath, _TBL, _TBL_SPEC, _tbl_values(rows))
+    return filepath
+
+
+class _Archive(ABC):
+    _kind: int
+    _spec: Spec
+    _columns: Callable[..., Any]
+
+    def __init__(self, filepath: Union[str, Path]):
+        self._filepath = make_path(filepath)
+        self._mm = np.memmap(self._filepath, dtype=np.uint8, mode="r")
+
+        if len(self._mm) < _HEADER_SIZE:
+            raise ValueError(f"{self._filepath} is not a HMMER archive.")
+        header = _HEADER.unpack(self._mm[: _HEADER.size].tobytes())
+        magic, version, kind, nrecords, offset, strings_offset, nstrings = header
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{self._filepath} is not a HMMER archive.")
+        if kind != self._kind:
+            raise ValueError(f"{self._filepath} holds another kind of table.")
+
+        dtype = _record_dtype(self._spec)
+        end = offset + nrecords * dtype.itemsize
+        self._records = self._mm[offset:end].view(dtype)
+
+        end = strings_offset + (nstrings + 1) * 8
+        self._offsets = self._mm[strings_offset:end].view("<u8")
+        self._blob = self._mm[end:]
+        self._text = [name for name, t in self._spec if t is object]
+        self._strings: Dict[int, str] = {}
+
+    @property
+    def records(self) -> np.ndarray:
+        """
+        Records as a structured array mapping the file. Text fields hold indices
+        into the string table, resolved by :meth:`.strings`.
+        """
+        return self._records
+
+    def strings(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Strings of the given indices, as an object array.
+        """
+        unique, inverse = np.unique(ids, return_inverse=True)
+        values = np.array([self._string(i) for i in unique.tolist()], dtype=object)
+        return values[inverse.reshape(-1)]
+
+    def _string(self, i: int) -> str:
+        if i not in self._strings:
+            start, stop = self._offsets[i : i + 2].tolist()
+            self._strings[i] = self._blob[start:stop].tobytes().decode()
+        return self._strings[i]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        One column of the table. Numeric columns map the file, without copying.
+        """
+        values = self._records[name]
+        if name in self._text:
+            return self.strings(values)
+        return values
+
+    def columns(self):
+        """
+        Whole table as column arrays.
+        """
+        return self._columns(*[self.column(name) for name, _ in self._spec])
+
+    def _values(self, record: Tuple) -> List[Any]:
+        values = list(record)
+        for j, (_, t) in enumerate(self._spec):
+            if t is object:
+                values[j] = self._string(values[j])
+        return values
+
+    @abstractmethod
+    def _make_row(self, v: List[Any]):
+        """
+        Row of the table from its values.
+        """
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, i: int):
+        return self._make_row(self._values(self._records[i].item()))
+
+    def __iter__(self):
+        for start in range(0, len(self._records), 1 << 14):
+            for record in self._records[start : start + (1 << 14)].tolist():
+                yield self._make_row(self._values(record))
+
+
+class DomTBLArchive(_Archive):
+    """
+    Reader of a domtbl archive written by :func:`write_domtbl_archive`.
+
+    The file is memory-mapped: opening it reads the header only, and numeric columns
+    are served from the mapping without parsing. Names and descriptions are stored
+    once each and decoded on access.
+
+    Rows are equal, field for field, to those of :func:`.read_domtbl` with
+    ``typed=True``.
+
+    Parameters
+    ----------
+    filepath
+        Path to the archive.
+    """
+
+    _kind = _DOMTBL
+    _spec = _DOMTBL_SPEC
+    _columns = DomTBLColumns
+
+    def _make_row(self, v: List[Any]) -> DomTBLRow:
+        return DomTBLRow(
+            DomTBLIndex(v[0], v[1], v[2]),
+            DomTBLIndex(v[3], v[4], v[5]),
+            DomTBLFloatSeqScore(v[6], v[7], v[8]),
+            DomTBLFloatDomScore(v[9], v[10], v[11], v[12], v[13], v[14]),
+            DomTBLCoord(v[15], v[16]),
+            DomTBLCoord(v[17], v[18]),
+            DomTBLCoord(v[19], v[20]),
+            f"{v[21]:.2f}",
+            v[22],
+        )
+
+
+class TBLArchive(_Archive):
+    """
+    Reader of a tbl archive written by :func:`write_tbl_archive`.
+
+    Same as :class:`DomTBLArchive`, for tbl rows. Rows are equal, field for field, to
+    those of :func:`.read_tbl` with ``typed=True``.
+
+    Parameters
+    ----------
+    filepath
+        Path to the archive.
+    """
+
+    _kind = _TBL
+    _spec = _TBL_SPEC
+    _columns = TBLColumns
+
+    def _make_row(self, v: List[Any]) -> TBLRow:
+        return TBLRow(
+            TBLIndex(v[0], v[1]),
+            TBLIndex(v[2], v[3]),
+            TBLFloatScore(v[4], v[5], v[6]),
+            TBLFloatScore(v[7], v[8], v[9]),
+            TBLDom(f"{v[10]:.1f}", *v[11:18]),
+            v[18],
+        )
@@ -1,31 +1,38 @@
-from pathlib import Path as _Path
-from sys import platform as _platform
+from ._registry import (
+    TOOLS,
+    Backend,
+    backend,
+    discover_backends,
+    host_features,
+    register_backend,
+    select_backend,
+)
 
 __all__ = [
+    "Backend",
+    "backend",
+    "binary_version",
+    "discover_backends",
+    "hmmemit",
     "hmmfetch",
     "hmmpress",
     "hmmscan",
     "hmmsearch",
-    "hmmemit",
+    "host_features",
     "phmmer",
-    "binary_version",
+    "register_backend",
+    "select_backend",
 ]
 
-binary_version = "3.3.2"
-
-if _platform not in ["linux", "darwin"]:
-    raise RuntimeError(f"Unsupported platform: {_platform}.")
-
-_suffix = "manylinux2010_x86_64"
-if _platform == "darwin":
-    _suffix = "macosx_10_9_x86_64"
-
-
-_bin = _Path(__file__).parent.absolute() / f"v{binary_version}"
 
-hmmemit = _bin / f"hmmemit_{_suffix}"
-hmmfetch = _bin / f"hmmfetch_{_suffix}"
-hmmpress = _bin / f"hmmpress_{_suffix}"
-hmmscan = _bin / f"hmmscan_{_suffix}"
-hmmsearch = _bin / f"hmmsearch_{_suffix}"
-phmmer = _bin / f"phmmer_{_suffix}"
+# Binary paths are resolved on first access, which raises on platforms without
+# binaries rather than on import, so that the table readers still work.
+def __getattr__(name: str):
+    if name in TOOLS:
+        value = backend().binary(name)
+    elif name == "binary_version":
+        value = backend().version
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -0,0 +1,315 @@
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from sys import platform
+from typing import FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from .._misc import read_json, write_json
+
+__all__ = [
+    "Backend",
+    "TOOLS",
+    "backend",
+    "bundled_backend",
+    "discover_backends",
+    "host_features",
+    "probe_version",
+    "register_backend",
+    "select_backend",
+]
+
+TOOLS = ["hmmemit", "hmmfetch", "hmmpress", "hmmscan", "hmmsearch", "phmmer"]
+
+BUNDLED_VERSION = "3.3.2"
+
+# Oldest release whose options and output formats the wrappers rely on.
+MIN_VERSION = (3, 3)
+
+# SIMD extensions a build can be compiled for, slowest first.
+_FEATURE_RANK = {
+    "sse2": 1,
+    "neon": 1,
+    "asimd": 1,
+    "sse4_1": 2,
+    "avx": 3,
+    "avx2": 4,
+    "avx512f": 5,
+    "avx512bw": 6,
+}
+
+_version = re.compile(r"^# HMMER (\d+)\.(\d+)(?:\.(\d+))?", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class Backend:
+    """
+    Set of HMMER binaries.
+
+    Parameters
+    ----------
+    name
+        Where the binaries come from: ``"bundled"``, ``"env"`` (``HMMER_BIN``),
+        ``"path"`` (``PATH``), or the name given to :func:`register_backend`.
+    dirpath
+        Directory of the binaries.
+    version
+        HMMER version, such as ``"3.3.2"``.
+    suffix
+        Suffix of the binary names, such as ``"_manylinux2010_x86_64"``.
+    features
+        CPU features the build requires, such as ``{"avx2"}``.
+    """
+
+    name: str
+    dirpath: Path
+    version: str
+    suffix: str = ""
+    features: FrozenSet[str] = frozenset()
+
+    def binary(self, tool: str) -> Path:
+        return self.dirpath / f"{tool}{self.suffix}"
+
+    @property
+    def rank(self) -> int:
+        """
+        Speed rank of the fastest CPU feature of the build.
+        """
+        return max([_FEATURE_RANK.get(f, 0) for f in self.features], default=0)
+
+    @property
+    def version_info(self) -> Tuple[int, ...]:
+        return tuple(int(v) for v in self.version.split("."))
+
+
+def host_features() -> FrozenSet[str]:
+    """
+    CPU features of the host, such as ``"avx2"``, in lower case.
+    """
+    if platform == "linux":
+        try:
+            with open("/proc/cpuinfo", "r") as file:
+                for line in file:
+                    # "flags" on x86, "Features" on ARM.
+                    if line.startswith(("flags", "Features")):
+                        return frozenset(line.split(":", 1)[1].split())
+        except OSError:
+            pass
+    elif platform == "darwin":
+        keys = ["machdep.cpu.features", "machdep.cpu.leaf7_features"]
+        try:
+            output = subprocess.run(
+                ["sysctl", "-n"] + keys, capture_output=True, text=True
+            ).stdout
+        except OSError:
+            output = ""
+        features = set(output.lower().replace(".", "_").split())
+        if os.uname().machine == "arm64":
+            features |= {"neon", "asimd"}
+        return frozenset(features)
+    return frozenset()
+
+
+def _has_tools(dirpath: Path, suffix: str) -> bool:
+    return all(os.access(dirpath / f"{tool}{suffix}", os.X_OK) for tool in TOOLS)
+
+
+def probe_version(dirpath: Path, suffix: str = "") -> Optional[str]:
+    """
+    HMMER version of a directory of binaries, or ``None`` if some binary is missing
+    or does not run.
+    """
+    if not _has_tools(dirpath, suffix):
+        return None
+    try:
+        output = subprocess.run(
+            [str(dirpath / f"hmmscan{suffix}"), "-h"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        ).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    match = _version.search(output)
+    if match is None:
+        return None
+    return ".".join(v for v in match.groups() if v is not None)
+
+
+def _cache_file() -> Path:
+    # Same directory as the downloaded example files, unless XDG_CACHE_HOME is set.
+    base = os.environ.get("XDG_CACHE_HOME")
+    if base:
+        return Path(base) / "hmmer" / "backends.json"
+    if platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "hmmer" / "backends.json"
+    return Path.home() / ".cache" / "hmmer" / "backends.json"
+
+
+def _cached_version(dirpath: Path, suffix: str) -> Optional[str]:
+    # Probed versions are recorded with the size and modification time of hmmscan,
+    # so that processes do not each run it to select a backend. A cache that cannot
+    # be written, such as in a read-only home, only costs probing again.
+    if not _has_tools(dirpath, suffix):
+        return None
+    binary = dirpath / f"hmmscan{suffix}"
+    stat = binary.stat()
+    stamp = [stat.st_size, stat.st_mtime_ns]
+    cache_file = _cache_file()
+    probes = read_json(cache_file)
+    entry = probes.get(str(binary))
+    if isinstance(entry, dict) and entry.get("stamp") == stamp:
+        return entry.get("version")
+
+    version = probe_version(dirpath, suffix)
+    probes[str(binary)] = {"stamp": stamp, "version": version}
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        write_json(cache_file, probes)
+    except OSError:
+        pass
+    return version
+
+
+def _make(
+    name: str, dirpath: Path, suffix: str, features: Iterable[str]
+) -> Optional[Backend]:
+    version = _cached_version(dirpath, suffix)
+    if version is None:
+        return None
+    backend = Backend(name, dirpath, version, suffix, frozenset(features))
+    if backend.version_info[:2] < MIN_VERSION:
+        return None
+    return backend
+
+
+_registered: List[Backend] = []
+_selected: Optional[Backend] = None
+
+
+def backend() -> Backend:
+    """
+    Backend in use, selected on first call by :func:`select_backend` among
+    :func:`discover_backends`.
+    """
+    global _selected
+    if _selected is None:
+        _selected = select_backend(discover_backends())
+    return _selected
+
+
+def register_backend(
+    dirpath: Union[str, Path],
+    name: str = "custom",
+    features: Iterable[str] = (),
+    suffix: str = "",
+) -> Backend:
+    """
+    Add a set of HMMER binaries to the candidates of :func:`select_backend`.
+
+    The binaries of the package are resolved on first use, such as the first run of
+    a binary or access of :data:`hmmer.bin.hmmscan`, so backends have to be
+    registered before that. Importing the package does not resolve them.
+
+    Parameters
+    ----------
+    dirpath
+        Directory of the binaries.
+    name
+        Name of the backend, for ``HMMER_BACKEND``. Defaults to ``"custom"``.
+    features
+        CPU features the build requires, such as ``["avx2"]``. Builds that need
+        features the host lacks are not selected, and the others are preferred by
+        their fastest feature. Defaults to none.
+    suffix
+        Suffix of the binary names. Defaults to none.
+    """
+    if _selected is not None:
+        raise RuntimeError(
+            f"The {_selected.name} HMMER binaries are already in use. Register "
+            "backends before the first use of the package."
+        )
+    backend = _make(name, Path(dirpath).absolute(), suffix, features)
+    if backend is None:
+        raise ValueError(f"No usable HMMER binaries in {dirpath}.")
+    _registered.append(backend)
+    return backend
+
+
+def bundled_backend() -> Optional[Backend]:
+    """
+    Binaries shipped with the package, if built for this platform.
+    """
+    if platform == "linux":
+        suffix = "_manylinux2010_x86_64"
+    elif platform == "darwin":
+        suffix = "_macosx_10_9_x86_64"
+    else:
+        return None
+    # Trusted without running them, to keep the default path cheap.
+    dirpath = Path(__file__).parent.absolute() / f"v{BUNDLED_VERSION}"
+    return Backend("bundled", dirpath, BUNDLED_VERSION, suffix)
+
+
+def discover_backends() -> List[Backend]:
+    """
+    Candidate backends, most preferred source first: registered ones, then
+    directories of the ``HMMER_BIN`` environment variable, then the binaries found
+    on ``PATH``, then the bundled ones.
+    """
+    backends = list(_registered)
+    for dirpath in os.environ.get("HMMER_BIN", "").split(os.pathsep):
+        if dirpath:
+            backend = _make("env", Path(dirpath).absolute(), "", ())
+            if backend is not None:
+                backends.append(backend)
+
+    found = shutil.which("hmmscan")
+    if found is not None:
+        backend = _make("path", Path(found).resolve().parent, "", ())
+        if backend is not None:
+            backends.append(backend)
+
+    bundled = bundled_backend()
+    if bundled is not None:
+        backends.append(bundled)
+    return backends
+
+
+def select_backend(
+    backends: List[Backend],
+    features: Optional[FrozenSet[str]] = None,
+    name: Optional[str] = None,
+) -> Backend:
+    """
+    Fastest backend that runs on the host.
+
+    Backends whose required features the host lacks are dropped. The others are
+    ranked by their fastest feature, then by version, then by their order in
+    ``backends``.
+
+    Parameters
+    ----------
+    backends
+        Candidates, most preferred first.
+    features
+        CPU features of the host. Defaults to :func:`host_features`.
+    name
+        Only consider backends of this name. Defaults to the ``HMMER_BACKEND``
+        environment variable, or to any name.
+    """
+    if features is None:
+        features = host_features()
+    if name is None:
+        name = os.environ.get("HMMER_BACKEND") or None
+
+    usable = [b for b in backends if b.features <= features]
+    if name is not None:
+        usable = [b for b in usable if b.name == name]
+    if len(usable) == 0:
+        raise RuntimeError(f"No usable HMMER binaries for platform {platform}.")
+
+    order = {id(b): i for i, b in enumerate(usable)}
+    return max(usable, key=lambda b: (b.rank, b.version_info, -order[id(b)]))
@@ -0,0 +1,195 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from ._misc import make_path
+from .bin import backend
+
+__all__ = ["ResultCache"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    tbl TEXT NOT NULL,
+    domtbl TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    atime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_atime ON entries (atime);
+CREATE TABLE IF NOT EXISTS databases (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    checksum TEXT NOT NULL
+);
+"""
+
+
+class ResultCache:
+    """
+    On-disk cache of the table rows of single sequences, stored in a SQLite file.
+
+    Pass it as ``cache`` to :meth:`.HMMER.scan`, :meth:`.HMMER.search` or
+    :meth:`.SeqDB.phmmer`. Each sequence is keyed by a hash of its residues, the
+    checksum of the database file, the binary and the options that affect the
+    tables, so that only sequences never seen in the same setting are run.
+
+    Parameters
+    ----------
+    filepath
+        Path to the SQLite file, created if missing.
+    max_size
+        Maximum total size in bytes of the cached rows. Least recently used entries
+        are evicted beyond it. Defaults to no limit.
+    """
+
+    def __init__(self, filepath: Union[Path, str], max_size: Optional[int] = None):
+        self._filepath = make_path(filepath)
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._filepath), check_same_thread=False)
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    @property
+    def max_size(self) -> Optional[int]:
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size: Optional[int]):
+        self._max_size = max_size
+        self.evict()
+
+    def checksum(self, filepath: Path) -> str:
+        """
+        SHA-256 of a database file, computed again only when its size or
+        modification time changes.
+        """
+        filepath = filepath.absolute()
+        stat = filepath.stat()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime, checksum FROM databases WHERE path = ?",
+                (str(filepath),),
+            ).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+
+        sha = hashlib.sha256()
+        with open(filepath, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                sha.update(chunk)
+        checksum = sha.hexdigest()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO databases VALUES (?, ?, ?, ?)",
+                (str(filepath), stat.st_size, stat.st_mtime_ns, checksum),
+            )
+        return checksum
+
+    def context(self, bin: Path, options: List[str], database: Path) -> str:
+        """
+        Hash of what, besides the sequence, determines its rows.
+        """
+        # Same as the directory name of the bundled binaries, "v3.3.2".
+        version = f"v{backend().version}"
+        parts = [version, bin.name, self.checksum(database)] + options
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def key(context: str, sequence: str) -> str:
+        """
+        Key of a sequence in a given context.
+        """
+        return hashlib.sha256(f"{context}\0{sequence}".encode()).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Cached tbl and domtbl rows of the given keys, marking them as recently used.
+        """
+        keys = list(keys)
+        found: Dict[str, Tuple[str, str]] = {}
+        with self._lock, self._conn:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                query = f"SELECT key, tbl, domtbl FROM entries WHERE key IN ({marks})"
+                for key, tbl, domtbl in self._conn.execute(query, chunk):
+                    found[key] = (tbl, domtbl)
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE entries SET atime = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+        return found
+
+    def put_many(self, entries: Dict[str, Tuple[str, str]]):
+        """
+        Store the tbl and domtbl rows of the given keys.
+        """
+        now = time.time()
+        rows = [
+            (key, tbl, domtbl, len(tbl) + len(domtbl), now)
+            for key, (tbl, domtbl) in entries.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", rows
+            )
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the size limit is met.
+        """
+        if self._max_size is None:
+            return
+        with self._lock, self._conn:
+            excess = self._size() - self._max_size
+            if excess <= 0:
+                return
+            cursor = self._conn.execute("SELECT key, size FROM entries ORDER BY atime")
+            victims = []
+            for key, size in cursor:
+                if excess <= 0:
+                    break
+                victims.append((key,))
+                excess -= size
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def _size(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """
+        Total size in bytes of the cached rows.
+        """
+        with self._lock:
+            return self._size()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -2,24 +2,35 @@ import csv
 import dataclasses
 from dataclasses import dataclass
 from pathlib import Path
-from typing import IO, List, Union
-
-from gff_io.interval import PyInterval, RInterval
+from typing import IO, TYPE_CHECKING, Iterator, List, Union
 
 from ._misc import decomment
 
+if TYPE_CHECKING:
+    import numpy as np
+    from gff_io.interval import PyInterval
+
 __all__ = [
+    "DomTBLColumns",
     "DomTBLCoord",
     "DomTBLDomScore",
+    "DomTBLFloatDomScore",
+    "DomTBLFloatSeqScore",
     "DomTBLIndex",
     "DomTBLRow",
     "DomTBLSeqScore",
+    "iter_domtbl",
     "read_domtbl",
+    "read_domtbl_columns",
 ]
 
 
+# Rows are declared with ``__slots__`` so that millions of them stay compact.
+
+
 @dataclass
 class DomTBLIndex:
+    __slots__ = ("name", "accession", "length")
     name: str
     accession: str
     length: int
@@ -27,13 +38,27 @@ class DomTBLIndex:
 
 @dataclass
 class DomTBLSeqScore:
+    __slots__ = ("e_value", "score", "bias")
     e_value: str
     score: str
     bias: str
 
 
+@dataclass
+class DomTBLFloatSeqScore:
+    """
+    Same as :class:`DomTBLSeqScore`, with values converted to float.
+    """
+
+    __slots__ = ("e_value", "score", "bias")
+    e_value: float
+    score: float
+    bias: float
+
+
 @dataclass
 class DomTBLDomScore:
+    __slots__ = ("id", "size", "c_value", "i_value", "score", "bias")
     id: int
     size: int
     c_value: str
@@ -42,6 +67,21 @@ class DomTBLDomScore:
     bias: str
 
 
+@dataclass
+class DomTBLFloatDomScore:
+    """
+    Same as :class:`DomTBLDomScore`, with values converted to float.
+    """
+
+    __slots__ = ("id", "size", "c_value", "i_value", "score", "bias")
+    id: int
+    size: int
+    c_value: float
+    i_value: float
+    score: float
+    bias: float
+
+
 @dataclass
 class DomTBLCoord:
     """
@@ -56,11 +96,12 @@ class DomTBLCoord:
         :method:`.interval` instead.
     """
 
+    __slots__ = ("start", "stop")
     start: int
     stop: int
 
     @property
-    def interval(self) -> PyInterval:
+    def interval(self) -> "PyInterval":
         """
         0-start, half-open interval.
 
@@ -69,16 +110,29 @@ class DomTBLCoord:
         PyInterval
             Interval.
         """
+        from gff_io.interval import RInterval
+
         rinterval = RInterval(self.start, self.stop)
         return rinterval.to_pyinterval()
 
 
 @dataclass
 class DomTBLRow:
+    __slots__ = (
+        "target",
+        "query",
+        "full_sequence",
+        "domain",
+        "hmm_coord",
+        "ali_coord",
+        "env_coord",
+        "acc",
+        "description",
+    )
     target: DomTBLIndex
     query: DomTBLIndex
-    full_sequence: DomTBLSeqScore
-    domain: DomTBLDomScore
+    full_sequence: Union[DomTBLSeqScore, DomTBLFloatSeqScore]
+    domain: Union[DomTBLDomScore, DomTBLFloatDomScore]
     hmm_coord: DomTBLCoord
     ali_coord: DomTBLCoord
     env_coord: DomTBLCoord
@@ -95,14 +149,115 @@ class DomTBLRow:
         return {f.name: f.type for f in dataclasses.fields(self)}
 
 
-def read_domtbl(file: Union[str, Path, IO[str]]) -> List[DomTBLRow]:
+@dataclass
+class DomTBLColumns:
     """
-    Read domtbl file type.
+    Domtbl rows stored as one array per column.
+
+    Names and descriptions are object arrays, E-values, scores, biases and ``acc`` are
+    float64 arrays, and lengths, domain numbers and coordinates are int32 arrays.
+    Indexing it with a slice, a boolean mask or an array of indices gives the
+    corresponding subset of rows.
+    """
+
+    target_name: "np.ndarray"
+    target_accession: "np.ndarray"
+    target_length: "np.ndarray"
+    query_name: "np.ndarray"
+    query_accession: "np.ndarray"
+    query_length: "np.ndarray"
+    e_value: "np.ndarray"
+    score: "np.ndarray"
+    bias: "np.ndarray"
+    domain_id: "np.ndarray"
+    domain_size: "np.ndarray"
+    c_value: "np.ndarray"
+    i_value: "np.ndarray"
+    domain_score: "np.ndarray"
+    domain_bias: "np.ndarray"
+    hmm_start: "np.ndarray"
+    hmm_stop: "np.ndarray"
+    ali_start: "np.ndarray"
+    ali_stop: "np.ndarray"
+    env_start: "np.ndarray"
+    env_stop: "np.ndarray"
+    acc: "np.ndarray"
+    description: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.e_value)
+
+    def __getitem__(self, index) -> "DomTBLColumns":
+        cols = [getattr(self, f.name)[index] for f in dataclasses.fields(self)]
+        return DomTBLColumns(*cols)
+
+
+_DOMTBL_SPEC = [
+    ("target_name", object),
+    ("target_accession", object),
+    ("target_length", "int32"),
+    ("query_name", object),
+    ("query_accession", object),
+    ("query_length", "int32"),
+    ("e_value", "float64"),
+    ("score", "float64"),
+    ("bias", "float64"),
+    ("domain_id", "int32"),
+    ("domain_size", "int32"),
+    ("c_value", "float64"),
+    ("i_value", "float64"),
+    ("domain_score", "float64"),
+    ("domain_bias", "float64"),
+    ("hmm_start", "int32"),
+    ("hmm_stop", "int32"),
+    ("ali_start", "int32"),
+    ("ali_stop", "int32"),
+    ("env_start", "int32"),
+    ("env_stop", "int32"),
+    ("acc", "float64"),
+    ("description", object),
+]
+
+
+def make_domtbl_row(line: List[str], typed: bool = False) -> DomTBLRow:
+    """
+    Row from the fields of a domtbl line.
+    """
+    if typed:
+        seq_score = DomTBLFloatSeqScore(*[float(i) for i in line[6:9]])
+        dom_score = DomTBLFloatDomScore(
+            int(line[9]), int(line[10]), *[float(i) for i in line[11:15]]
+        )
+    else:
+        seq_score = DomTBLSeqScore(*line[6:9])
+        dom_score = DomTBLDomScore(int(line[9]), int(line[10]), *line[11:15])
+    return DomTBLRow(
+        DomTBLIndex(line[0], line[1], int(line[2])),
+        DomTBLIndex(line[3], line[4], int(line[5])),
+        seq_score,
+        dom_score,
+        DomTBLCoord(int(line[15]), int(line[16])),
+        DomTBLCoord(int(line[17]), int(line[18])),
+        DomTBLCoord(int(line[19]), int(line[20])),
+        line[21],
+        " ".join(line[22:]),
+    )
+
+
+def iter_domtbl(
+    file: Union[str, Path, IO[str]], typed: bool = False
+) -> Iterator[DomTBLRow]:
+    """
+    Iterate over the rows of a domtbl file, one at a time.
 
     Parameters
     ----------
     file
         File path or file stream.
+    typed
+        ``True`` to convert E-values, scores and biases to float, yielding
+        :class:`DomTBLFloatSeqScore` and :class:`DomTBLFloatDomScore` scores.
+        Defaults to ``False``.
     """
     closeit = False
     if isinstance(file, str):
@@ -112,22 +267,44 @@ def read_domtbl(file: Union[str, Path, IO[str]]) -> List[DomTBLRow]:
         file = open(file, "r")
         closeit = True
 
-    rows = []
-    for line in csv.reader(decomment(file), delimiter=" ", skipinitialspace=True):
-        row = DomTBLRow(
-            DomTBLIndex(line[0], line[1], int(line[2])),
-            DomTBLIndex(line[3], line[4], int(line[5])),
-            DomTBLSeqScore(*line[6:9]),
-            DomTBLDomScore(int(line[9]), int(line[10]), *line[11:15]),
-            DomTBLCoord(int(line[15]), int(line[16])),
-            DomTBLCoord(int(line[17]), int(line[18])),
-            DomTBLCoord(int(line[19]), int(line[20])),
-            line[21],
-            " ".join(line[22:]),
-        )
-        rows.append(row)
+    try:
+        for line in csv.reader(decomment(file), delimiter=" ", skipinitialspace=True):
+            yield make_domtbl_row(line, typed)
+    finally:
+        if closeit:
+            file.close()
+
+
+def read_domtbl(
+    file: Union[str, Path, IO[str]], typed: bool = False
+) -> List[DomTBLRow]:
+    """
+    Read domtbl file type.
+
+    Parameters
+    ----------
+    file
+        File path or file stream.
+    typed
+        ``True`` to convert E-values, scores and biases to float. Defaults to
+        ``False``.
+    """
+    return list(iter_domtbl(file, typed))
+
+
+def read_domtbl_columns(file: Union[str, Path, IO[str]]) -> DomTBLColumns:
+    """
+    Read domtbl file type into column arrays.
+
+    Much faster than :func:`read_domtbl` for large tables, as lines are tokenized in
+    bulk and numeric fields are converted a whole column at a time. Descriptions keep
+    their original spacing.
 
-    if closeit:
-        file.close()
+    Parameters
+    ----------
+    file
+        File path or file stream.
+    """
+    from ._columns import read_columns
 
-    return rows
+    return DomTBLColumns(*read_columns(file, _DOMTBL_SPEC))
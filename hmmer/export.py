@@ -0,0 +1,255 @@
+import sqlite3
+import uuid
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, List, Union
+
+import numpy as np
+
+from ._misc import make_path
+from .archive import Spec, _domtbl_values, _tbl_values
+from .domtbl import _DOMTBL_SPEC, DomTBLRow, iter_domtbl
+from .hmmer import Result
+from .tbl import _TBL_SPEC, TBLRow, iter_tbl
+
+__all__ = [
+    "write_domtbl_parquet",
+    "write_domtbl_sqlite",
+    "write_tbl_parquet",
+    "write_tbl_sqlite",
+]
+
+DomTBLSource = Union[Result, str, Path, IO[str], Iterable[Union[Result, DomTBLRow]]]
+TBLSource = Union[Result, str, Path, IO[str], Iterable[Union[Result, TBLRow]]]
+
+# Columns indexed in SQLite, in both tables.
+_INDEXED = ["target_name", "query_accession", "e_value"]
+
+
+def _rows(source, iter_result: Callable, iter_file: Callable) -> Iterator:
+    if isinstance(source, Result):
+        yield from iter_result(source)
+    elif isinstance(source, (str, Path)) or hasattr(source, "read"):
+        yield from iter_file(source)
+    else:
+        for item in source:
+            if isinstance(item, Result):
+                yield from iter_result(item)
+            else:
+                yield item
+
+
+def _domtbl_rows(source: DomTBLSource) -> Iterator[List[Any]]:
+    rows = _rows(source, Result.iter_domtbl, iter_domtbl)
+    return _typed(_domtbl_values(rows), _DOMTBL_SPEC)
+
+
+def _tbl_rows(source: TBLSource) -> Iterator[List[Any]]:
+    return _typed(_tbl_values(_rows(source, Result.iter_tbl, iter_tbl)), _TBL_SPEC)
+
+
+def _cast(dtype: Union[type, str]) -> Callable:
+    if dtype is object:
+        return str
+    if np.issubdtype(dtype, np.integer):
+        return int
+    return float
+
+
+def _typed(values: Iterator[List[Any]], spec: Spec) -> Iterator[List[Any]]:
+    # Rows of untyped tables hold some numbers as text.
+    casts = [_cast(t) for _, t in spec]
+    for row in values:
+        yield [cast(v) for cast, v in zip(casts, row)]
+
+
+def _batches(values: Iterator[List[Any]], batch_size: int) -> Iterator[List[List[Any]]]:
+    while True:
+        batch = list(islice(values, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _sqlite_type(dtype: Union[type, str]) -> str:
+    return {str: "TEXT", int: "INTEGER", float: "REAL"}[_cast(dtype)]
+
+
+def _write_sqlite(
+    values: Iterator[List[Any]],
+    spec: Spec,
+    filepath: Union[str, Path],
+    table: str,
+    append: bool,
+    batch_size: int,
+) -> int:
+    if not table.isidentifier():
+        raise ValueError(f"Invalid table name: {table!r}.")
+    names = [name for name, _ in spec]
+    columns = ", ".join(f"{name} {_sqlite_type(t)}" for name, t in spec)
+    marks = ", ".join("?" * len(spec))
+    insert = f'INSERT INTO "{table}" ({", ".join(names)}) VALUES ({marks})'
+
+    conn = sqlite3.connect(str(make_path(filepath)), timeout=60)
+    try:
+        with conn:
+            if not append:
+                conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+
+        nrows = 0
+        for batch in _batches(values, batch_size):
+            # One transaction per batch, so that concurrent writers interleave.
+            with conn:
+                conn.executemany(insert, batch)
+            nrows += len(batch)
+
+        # Indexes are built once after a fresh load, which is faster than
+        # maintaining them row by row.
+        with conn:
+            for name in _INDEXED:
+                conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{table}_{name}" ON "{table}" ({name})'
+                )
+    finally:
+        conn.close()
+    return nrows
+
+
+def _write_parquet(
+    values: Iterator[List[Any]],
+    spec: Spec,
+    filepath: Union[str, Path],
+    append: bool,
+    batch_size: int,
+) -> Path:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError(
+            "Parquet export requires pyarrow: pip install hmmer[parquet]."
+        ) from error
+
+    def arrow_type(dtype: Union[type, str]):
+        if dtype is object:
+            return pa.string()
+        return pa.from_numpy_dtype(np.dtype(dtype))
+
+    schema = pa.schema([(name, arrow_type(t)) for name, t in spec])
+    filepath = make_path(filepath)
+    if append:
+        filepath.mkdir(parents=True, exist_ok=True)
+        filepath = filepath / f"part-{uuid.uuid4().hex}.parquet"
+
+    with pq.ParquetWriter(str(filepath), schema) as writer:
+        for batch in _batches(values, batch_size):
+            arrays = [
+                pa.array([row[j] for row in batch], type=field.type)
+                for j, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+    return filepath
+
+
+def write_domtbl_sqlite(
+    source: DomTBLSource,
+    filepath: Union[str, Path],
+    table: str = "domtbl",
+    append: bool = False,
+    batch_size: int = 65536,
+) -> int:
+    """
+    Write domtbl rows to a table of a SQLite file.
+
+    Columns are named as in :class:`hmmer.typing.DomTBLColumns`, with numbers
+    stored as such. The table is indexed on ``target_name``, ``query_accession``
+    and ``e_value``.
+
+    Parameters
+    ----------
+    source
+        Result, domtbl file path or stream, or iterable of results and rows, such
+        as the rows streamed by :func:`.iter_domtbl`.
+    filepath
+        Path to the SQLite file, created if missing.
+    table
+        Name of the table, a Python identifier. Defaults to ``"domtbl"``.
+    append
+        Add the rows to the table if it exists, so that chunked or concurrent runs
+        accumulate into one file. Defaults to ``False``, replacing the table.
+    batch_size
+        Number of rows inserted per transaction. Defaults to ``65536``.
+
+    Returns
+    -------
+    Number of rows written.
+    """
+    values = _domtbl_rows(source)
+    return _write_sqlite(values, _DOMTBL_SPEC, filepath, table, append, batch_size)
+
+
+def write_tbl_sqlite(
+    source: TBLSource,
+    filepath: Union[str, Path],
+    table: str = "tbl",
+    append: bool = False,
+    batch_size: int = 65536,
+) -> int:
+    """
+    Write tbl rows to a table of a SQLite file.
+
+    Same as :func:`write_domtbl_sqlite`, for tbl rows, with columns named as in
+    :class:`hmmer.typing.TBLColumns`.
+    """
+    values = _tbl_rows(source)
+    return _write_sqlite(values, _TBL_SPEC, filepath, table, append, batch_size)
+
+
+def write_domtbl_parquet(
+    source: DomTBLSource,
+    filepath: Union[str, Path],
+    append: bool = False,
+    batch_size: int = 65536,
+) -> Path:
+    """
+    Write domtbl rows to a Parquet file, one row group per batch. Requires
+    ``pyarrow``.
+
+    Columns are named and typed as in :class:`hmmer.typing.DomTBLColumns`.
+
+    Parameters
+    ----------
+    source
+        Result, domtbl file path or stream, or iterable of results and rows.
+    filepath
+        Destination file path, or directory if ``append``.
+    append
+        Treat ``filepath`` as a dataset directory, created if missing, and add a
+        new uniquely named file to it. Readers such as :func:`pandas.read_parquet`
+        load the directory as one table. Defaults to ``False``.
+    batch_size
+        Number of rows per row group. Defaults to ``65536``.
+
+    Returns
+    -------
+    Path of the file written.
+    """
+    values = _domtbl_rows(source)
+    return _write_parquet(values, _DOMTBL_SPEC, filepath, append, batch_size)
+
+
+def write_tbl_parquet(
+    source: TBLSource,
+    filepath: Union[str, Path],
+    append: bool = False,
+    batch_size: int = 65536,
+) -> Path:
+    """
+    Write tbl rows to a Parquet file. Requires ``pyarrow``.
+
+    Same as :func:`write_domtbl_parquet`, for tbl rows, with columns named and typed
+    as in :class:`hmmer.typing.TBLColumns`.
+    """
+    values = _tbl_rows(source)
+    return _write_parquet(values, _TBL_SPEC, filepath, append, batch_size)
@@ -1,16 +1,82 @@
+import copy
+import hashlib
+import os
+import shutil
+import sys
 import tempfile
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from enum import Enum
-from io import StringIO
+from io import BytesIO, StringIO
+from itertools import islice
 from pathlib import Path
-from subprocess import PIPE, Popen, check_call, check_output
-from typing import List, Optional, TextIO, Union
-
-from fasta_reader import FASTAItem, read_fasta
-
-from ._misc import make_path
-from .bin import hmmemit, hmmfetch, hmmpress, hmmscan, hmmsearch, phmmer
-from .domtbl import DomTBLRow, read_domtbl
-from .tbl import TBLRow, read_tbl
+from subprocess import PIPE, CompletedProcess, Popen, check_call, check_output, run
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from . import bin as binaries
+from ._misc import make_path, read_json, temporary_directory, write_json
+from ._pipe import run_piped
+from ._ready import ensure_ready
+from ._shard import (
+    DOMTBL_DESCRIPTION,
+    DOMTBL_EVALUE,
+    DOMTBL_QUERY,
+    TBL_DESCRIPTION,
+    TBL_EVALUE,
+    TBL_QUERY,
+    concat_files,
+    concat_tables,
+    count_sequences,
+    fasta_records,
+    merge_search_tables,
+    profile_accessions,
+    profile_names,
+    replace_field,
+    replace_tail,
+    reported_targets,
+    rows_by_field,
+    select_profiles,
+    select_sequences,
+    sequence_names,
+    shard_sizes,
+    sort_rows,
+    split_by_query,
+    split_fasta,
+    split_profiles,
+)
+from .cache import ResultCache
+from .domtbl import DomTBLRow, iter_domtbl, read_domtbl
+from .metrics import Metrics, call_measured, wait_measured
+from .output import DomainAlignment, iter_domain_alignments
+from .pipeline import Pipeline, PipelineStats, make_pipeline, read_pipeline_stats
+from .similarity import SimilarityMatrix
+from .ssi import SSIIndex
+from .stockholm import StockholmAlignment, iter_stockholm
+from .tbl import TBLRow, iter_tbl, read_tbl, read_tbl_columns
+
+if TYPE_CHECKING:
+    from fasta_reader import FASTAItem
+
+    from ._aio import Limiter
+    from ._session import Session
 
 __all__ = ["HMMER", "Result", "SeqDB"]
 
@@ -22,35 +88,223 @@ class State(Enum):
 
 
 class Result:
-    def __init__(self, tbl: Optional[Path] = None, domtbl: Optional[Path] = None):
-        if tbl is None:
-            self._tbl = None
-        else:
-            self._tbl = read_tbl(tbl)
+    """
+    Tables produced by a HMMER run.
+
+    Tables are parsed on first access of :attr:`.tbl` or :attr:`.domtbl`. Use
+    :meth:`.iter_tbl` and :meth:`.iter_domtbl`, or iterate over the result itself to
+    get domtbl rows, to stream rows without holding them all in memory.
+
+    Time and resources spent producing and parsing the tables are recorded in
+    :attr:`.metrics`.
+
+    Tables written to a temporary directory are removed by :meth:`.close`, or once
+    the result is garbage collected.
+
+    Parameters
+    ----------
+    tbl
+        Path to the tbl file, if any.
+    domtbl
+        Path to the domtbl file, if any.
+    output
+        Path to the main output file, if any.
+    alignment
+        Path to the Stockholm alignment file (``-A``), if any.
+    """
 
-        if domtbl is None:
-            self._domtbl = None
+    def __init__(
+        self,
+        tbl: Optional[Path] = None,
+        domtbl: Optional[Path] = None,
+        output: Optional[Union[Path, str]] = None,
+        alignment: Optional[Union[Path, str]] = None,
+    ):
+        self.metrics = Metrics()
+        self._output_file = None if output is None else make_path(output)
+        self._alignment_file = None if alignment is None else make_path(alignment)
+        self._tbl_file = tbl
+        self._domtbl_file = domtbl
+        self._tbl_text: Optional[str] = None
+        self._domtbl_text: Optional[str] = None
+        self._tbl: Optional[List[TBLRow]] = None
+        self._domtbl: Optional[List[DomTBLRow]] = None
+        self._finalizer: Optional[weakref.finalize] = None
+
+    @classmethod
+    def from_text(
+        cls, tbl: Optional[str] = None, domtbl: Optional[str] = None
+    ) -> "Result":
+        """
+        Result whose tables are held in memory as text.
+
+        Parameters
+        ----------
+        tbl
+            Content of the tbl file, if any.
+        domtbl
+            Content of the domtbl file, if any.
+        """
+        result = cls()
+        result._tbl_text = tbl
+        result._domtbl_text = domtbl
+        return result
+
+    def _with_rows(
+        self, tbl: Optional[List[TBLRow]], domtbl: Optional[List[DomTBLRow]]
+    ) -> "Result":
+        # Rows already parsed from a pipe.
+        if tbl is not None:
+            self._tbl = tbl
+        if domtbl is not None:
+            self._domtbl = domtbl
+        return self
+
+    def _measured(self, metrics: Metrics) -> "Result":
+        # Record the size of the table files written.
+        self.metrics = metrics
+        for table, filepath in [("tbl", self._tbl_file), ("domtbl", self._domtbl_file)]:
+            if filepath is not None and filepath.is_file():
+                metrics.add_written(table, filepath.stat().st_size)
+        return self
+
+    def _parse(self, table: str, source: Union[Path, IO[str]], read: Callable) -> list:
+        start = time.perf_counter()
+        rows = read(source)
+        elapsed = time.perf_counter() - start
+        if isinstance(source, Path):
+            nbytes = source.stat().st_size
         else:
-            self._domtbl = read_domtbl(domtbl)
+            nbytes = len(source.getvalue())
+        self.metrics.add_parse(table, nbytes, len(rows), elapsed)
+        return rows
+
+    def _own(self, tmpdir: tempfile.TemporaryDirectory) -> "Result":
+        # Keep the temporary directory holding the tables until the result is closed
+        # or collected. The copy of a stream target is not needed anymore.
+        dirpath = Path(tmpdir.name)
+        copy = dirpath / _TARGET_COPY
+        if copy.exists():
+            copy.unlink()
+        files = [self._tbl_file, self._domtbl_file, self._output_file]
+        files.append(self._alignment_file)
+        if not any(f is not None and dirpath in f.parents for f in files):
+            tmpdir.cleanup()
+            return self
+        # Cleaning up explicitly also spares the warning of an implicit cleanup.
+        self._finalizer = weakref.finalize(self, tmpdir.cleanup)
+        return self
+
+    def close(self):
+        """
+        Remove the temporary files holding the tables and outputs of the run.
+
+        Tables parsed already stay available, the others can no longer be read.
+        Otherwise, the files are removed once the result is garbage collected. Results
+        are also context managers that close on exit.
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self) -> "Result":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _tbl_source(self) -> Union[Path, IO[str]]:
+        assert self.has_tbl
+        if self._tbl_file is not None:
+            return self._tbl_file
+        return StringIO(self._tbl_text)
+
+    def _domtbl_source(self) -> Union[Path, IO[str]]:
+        assert self.has_domtbl
+        if self._domtbl_file is not None:
+            return self._domtbl_file
+        return StringIO(self._domtbl_text)
 
     @property
     def has_tbl(self) -> bool:
-        return self._tbl is not None
+        if self._tbl is not None:
+            return True
+        return self._tbl_file is not None or self._tbl_text is not None
 
     @property
     def has_domtbl(self) -> bool:
-        return self._domtbl is not None
+        if self._domtbl is not None:
+            return True
+        return self._domtbl_file is not None or self._domtbl_text is not None
 
     @property
     def tbl(self) -> List[TBLRow]:
-        assert self._tbl is not None
+        if self._tbl is None:
+            self._tbl = self._parse("tbl", self._tbl_source(), read_tbl)
         return self._tbl
 
     @property
     def domtbl(self) -> List[DomTBLRow]:
-        assert self._domtbl is not None
+        if self._domtbl is None:
+            self._domtbl = self._parse("domtbl", self._domtbl_source(), read_domtbl)
         return self._domtbl
 
+    def iter_tbl(self) -> Iterator[TBLRow]:
+        """
+        Iterate over tbl rows without storing them.
+        """
+        if self._tbl is not None:
+            return iter(self._tbl)
+        return iter_tbl(self._tbl_source())
+
+    def iter_domtbl(self) -> Iterator[DomTBLRow]:
+        """
+        Iterate over domtbl rows without storing them.
+        """
+        if self._domtbl is not None:
+            return iter(self._domtbl)
+        return iter_domtbl(self._domtbl_source())
+
+    def __iter__(self) -> Iterator[DomTBLRow]:
+        return self.iter_domtbl()
+
+    @property
+    def pipeline_stats(self) -> List[PipelineStats]:
+        """
+        Internal pipeline statistics of each query, read from the main output.
+
+        Raises ``ValueError`` unless the main output was written to a file, which
+        requires passing ``output`` to the run.
+        """
+        if self._output_file is None or not self._output_file.is_file():
+            raise ValueError(
+                "Pipeline statistics are read from the main output, which was not "
+                "written to a file."
+            )
+        return read_pipeline_stats(self._output_file)
+
+    def iter_domain_alignments(self) -> Iterator[DomainAlignment]:
+        """
+        Iterate over the domain alignments of the main output, reading it
+        incrementally. Empty unless the main output was written to a file. See
+        :class:`hmmer.typing.DomainAlignment`.
+        """
+        if self._output_file is None or not self._output_file.is_file():
+            return iter([])
+        return iter_domain_alignments(self._output_file)
+
+    @property
+    def has_alignment(self) -> bool:
+        return self._alignment_file is not None
+
+    def iter_alignments(self) -> Iterator[StockholmAlignment]:
+        """
+        Iterate over the alignments of the ``-A`` output, one per query, reading
+        them one at a time. See :class:`hmmer.typing.StockholmAlignment`.
+        """
+        if self._alignment_file is None:
+            raise ValueError("No alignment was requested.")
+        return iter_stockholm(self._alignment_file)
+
 
 def _optional_filepath(
     filepath_or_bool: Union[Path, str, bool], tmp_filepath: Path
@@ -80,40 +334,86 @@ class Options:
         Z: Optional[int] = None,
         alignment: Optional[Union[Path, str]] = None,
         notextw: bool = False,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        pipeline: Union[str, Pipeline, None] = None,
     ):
-        self._options = []
+        self._output = output
+        self._tblout = tblout
+        self._domtblout = domtblout
+        self._pipeline = make_pipeline(pipeline, heuristic)
+        self._cut_ga = cut_ga
+        self._hmmkey = hmmkey
+        self._Z = Z
+        self._alignment = alignment
+        self._notextw = notextw
+        self._domZ = domZ
+        self._cpu = cpu
 
-        if output is not None:
-            self._options += ["-o", str(output)]
+    def aslist(self):
+        options = []
 
-        if tblout is not None:
-            self._options += ["--tblout", str(tblout)]
+        if self._output is not None:
+            options += ["-o", str(self._output)]
 
-        if domtblout is not None:
-            self._options += ["--domtblout", str(domtblout)]
+        if self._tblout is not None:
+            options += ["--tblout", str(self._tblout)]
 
-        if not heuristic:
-            self._options += ["--max"]
+        if self._domtblout is not None:
+            options += ["--domtblout", str(self._domtblout)]
 
-        if cut_ga:
-            self._options += ["--cut_ga"]
+        options += self._pipeline.aslist()
 
-        if Z:
-            self._options += ["-Z", str(Z)]
+        if self._cut_ga:
+            options += ["--cut_ga"]
 
-        if alignment is not None:
-            self._options += ["-A", str(alignment)]
+        if self._Z:
+            options += ["-Z", str(self._Z)]
 
-        if notextw:
-            self._options += ["--notextw"]
+        if self._domZ:
+            options += ["--domZ", str(self._domZ)]
 
-        self._tblout = tblout
-        self._domtblout = domtblout
-        self._hmmkey = hmmkey
-        self._alignment = alignment
+        if self._alignment is not None:
+            options += ["-A", str(self._alignment)]
 
-    def aslist(self):
-        return self._options
+        if self._notextw:
+            options += ["--notextw"]
+
+        if self._cpu is not None:
+            options += ["--cpu", str(self._cpu)]
+
+        return options
+
+    def askey(self) -> List[str]:
+        """
+        Options that affect the tables, in a normalized form for cache keys.
+        """
+        opts = self.replace(
+            output=None,
+            tblout=None,
+            domtblout=None,
+            alignment=None,
+            notextw=False,
+            cpu=None,
+        )
+        key = opts.aslist()
+        if self.has_hmmkey:
+            key += ["hmmkey", self.hmmkey]
+        return key
+
+    def replace(self, **kwargs) -> "Options":
+        """
+        Copy of the options with some of them replaced.
+        """
+        opts = copy.copy(self)
+        for name, value in kwargs.items():
+            assert hasattr(opts, f"_{name}")
+            setattr(opts, f"_{name}", value)
+        return opts
+
+    @property
+    def output(self):
+        return self._output
 
     @property
     def tblout(self):
@@ -123,6 +423,22 @@ class Options:
     def domtblout(self):
         return self._domtblout
 
+    @property
+    def alignment(self):
+        return self._alignment
+
+    @property
+    def Z(self) -> Optional[int]:
+        return self._Z
+
+    @property
+    def domZ(self) -> Optional[int]:
+        return self._domZ
+
+    @property
+    def cpu(self) -> Optional[int]:
+        return self._cpu
+
     @property
     def has_hmmkey(self) -> bool:
         return self._hmmkey is not None
@@ -133,6 +449,12 @@ class Options:
         return self._hmmkey
 
 
+_DEVNULL = Path(os.devnull)
+
+# File name of the copy of a stream target.
+_TARGET_COPY = "target.fasta"
+
+
 def make_target(target: Union[Path, str, TextIO], tmpdir: Path) -> Path:
     if isinstance(target, str):
         target = Path(target)
@@ -140,17 +462,348 @@ def make_target(target: Union[Path, str, TextIO], tmpdir: Path) -> Path:
     if isinstance(target, Path):
         return target
 
-    with open(tmpdir / "target.fasta", "w") as file:
+    with open(tmpdir / _TARGET_COPY, "w") as file:
         file.write(target.read())
 
-    return tmpdir / "target.fasta"
+    return tmpdir / _TARGET_COPY
+
+
+def _run_sharded(
+    bin: Path,
+    options: Options,
+    target: Path,
+    nworkers: int,
+    tmpdir: Path,
+    positional: Callable[[Path], List[str]],
+    order: Optional[Dict[str, int]] = None,
+    metrics: Optional[Metrics] = None,
+    profile: Optional[Path] = None,
+) -> Result:
+    """
+    Split ``target`` into shards and run ``bin`` on them concurrently.
+
+    ``positional`` gives the positional arguments of the command for a shard. If
+    ``order`` is given, ``target`` holds the target sequences of a hmmsearch run of
+    ``profile`` whose queries appear in that order: the whole database size is passed
+    as ``-Z``, and the tables are merged as a single run would sort them. Otherwise
+    shards hold independent queries and their outputs are simply concatenated.
+    """
+    if order is not None and (
+        options.output is not None or options.alignment is not None
+    ):
+        raise ValueError("Sharded searches support neither output nor alignment.")
+
+    if metrics is None:
+        metrics = Metrics()
+
+    with metrics.phase("split"):
+        nsequences = count_sequences(target)
+        shards = split_fasta(target, shard_sizes(nsequences, nworkers), tmpdir)
+
+    if options.cpu is None:
+        options = options.replace(cpu=max(1, (os.cpu_count() or 1) // len(shards)))
+
+    if order is not None and options.Z is None:
+        options = options.replace(Z=nsequences)
+
+    shard_opts = []
+    for i in range(len(shards)):
+        output = tmpdir / f"output.{i}.txt"
+        alignment = None
+        if order is not None:
+            output = _DEVNULL
+        elif options.alignment is not None:
+            alignment = tmpdir / f"alignment.{i}.sto"
+        opts = options.replace(
+            output=output,
+            tblout=tmpdir / f"tbl.{i}.txt",
+            domtblout=tmpdir / f"domtbl.{i}.txt",
+            alignment=alignment,
+        )
+        shard_opts.append(opts)
+
+    def run(i: int):
+        cmd = [str(bin)] + shard_opts[i].aslist() + positional(shards[i])
+        call_measured(cmd, metrics)
+
+    with metrics.phase("run"):
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            list(executor.map(run, range(len(shards))))
+
+    for shard in shards:
+        shard.unlink()
+
+    if order is not None and options.domZ is None:
+        assert profile is not None
+        with metrics.phase("run"):
+            reruns = _search_reported(
+                bin, options, target, profile, shard_opts, tmpdir, metrics
+            )
+        if len(reruns) > 0:
+            _remove_outputs(shard_opts)
+            shard_opts = reruns
+
+    with metrics.phase("merge"):
+        _merge_shards(options, shard_opts, order)
+
+    return Result(options.tblout, options.domtblout, options.output, options.alignment)
+
+
+def _search_reported(
+    bin: Path,
+    options: Options,
+    target: Path,
+    profile: Path,
+    shard_opts: List[Options],
+    tmpdir: Path,
+    metrics: Metrics,
+) -> List[Options]:
+    """
+    Search again the target sequences reported by sharded hmmsearch runs, with the
+    domain search space of each query set to its number of reported targets.
+
+    A single run sets ``domZ`` to the number of targets reported for the query, which
+    decides the domains reported and their conditional E-values. Targets are reported
+    on their E-values alone, computed with the whole database size, so searching the
+    reported ones again with that ``--domZ`` gives the rows of a single run. Queries
+    with the same number of reported targets are searched together. Returns the
+    options of the new runs.
+    """
+    reported = reported_targets([opts.tblout for opts in shard_opts])
+    groups: Dict[int, List[str]] = OrderedDict()
+    for query, targets in reported.items():
+        groups.setdefault(len(targets), []).append(query)
+
+    route = {query: i for i, queries in enumerate(groups.values()) for query in queries}
+    profiles = [tmpdir / f"reported.{i}.hmm" for i in range(len(groups))]
+    select_profiles(profile, route, profiles)
+
+    runs: List[Tuple[Options, List[str]]] = []
+    for i, (domZ, queries) in enumerate(groups.items()):
+        sequences = tmpdir / f"reported.{i}.fasta"
+        names = set(name for query in queries for name in reported[query])
+        select_sequences(target, names, sequences)
+        opts = options.replace(
+            output=_DEVNULL,
+            tblout=tmpdir / f"reported.{i}.tbl.txt",
+            domtblout=tmpdir / f"reported.{i}.domtbl.txt",
+            domZ=domZ,
+        )
+        runs.append((opts, [str(profiles[i]), str(sequences)]))
+
+    def run(i: int):
+        opts, positional = runs[i]
+        call_measured([str(bin)] + opts.aslist() + positional, metrics)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(shard_opts))) as executor:
+        list(executor.map(run, range(len(runs))))
+
+    for opts, positional in runs:
+        for filepath in positional:
+            Path(filepath).unlink()
+    return [opts for opts, _ in runs]
+
+
+def _merge_shards(
+    options: Options, shard_opts: List[Options], order: Optional[Dict[str, int]]
+):
+    tbls = [opts.tblout for opts in shard_opts]
+    domtbls = [opts.domtblout for opts in shard_opts]
+    if order is None:
+        if options.tblout is not None:
+            concat_tables(tbls, options.tblout)
+        if options.domtblout is not None:
+            concat_tables(domtbls, options.domtblout)
+
+        if options.alignment is not None:
+            alignments = [opts.alignment for opts in shard_opts]
+            concat_files(alignments, make_path(options.alignment))
+
+        outputs = [opts.output for opts in shard_opts]
+        if options.output is None:
+            for output in outputs:
+                with open(output, "r") as file:
+                    shutil.copyfileobj(file, sys.stdout)
+        else:
+            concat_files(outputs, make_path(options.output))
+    else:
+        merge_search_tables(tbls, domtbls, options.tblout, options.domtblout, order)
+
+    _remove_outputs(shard_opts)
+
+
+def _remove_outputs(shard_opts: List[Options]):
+    for opts in shard_opts:
+        for filepath in [opts.output, opts.tblout, opts.domtblout, opts.alignment]:
+            if filepath is not None and filepath != _DEVNULL:
+                filepath.unlink()
+
+
+def _run_piped(
+    bin: Path,
+    target: Union[Path, TextIO],
+    options: Options,
+    tblout: Union[Path, str, bool],
+    domtblout: Union[Path, str, bool],
+    positional: Callable[[str], List[str]],
+    stdin: Optional[IO] = None,
+    timeout: Optional[float] = None,
+    metrics: Optional[Metrics] = None,
+) -> Result:
+    """
+    Run ``bin`` writing no intermediate files.
+
+    Tables requested with a path are written there, the ones requested with ``True``
+    are read back through pipes.
+    """
+    if not isinstance(tblout, bool):
+        options = options.replace(tblout=make_path(tblout))
+    if not isinstance(domtblout, bool):
+        options = options.replace(domtblout=make_path(domtblout))
+
+    if isinstance(target, Path):
+        target = target.absolute()
+
+    if metrics is None:
+        metrics = Metrics()
+
+    cmd = [str(bin)] + options.aslist()
+    with metrics.phase("run"):
+        tbl, domtbl = run_piped(
+            cmd,
+            positional,
+            target,
+            tblout is True,
+            domtblout is True,
+            stdin,
+            timeout,
+            metrics,
+        )
+    result = Result(
+        options.tblout, options.domtblout, options.output, options.alignment
+    )._with_rows(tbl, domtbl)
+    return result._measured(metrics)
+
+
+def _run_cached(
+    cache: ResultCache,
+    bin: Path,
+    database: Path,
+    options: Options,
+    target: Path,
+    tmpdir: Path,
+    match: Callable[[Path, Options], Result],
+    columns: Tuple[int, int],
+    order: Optional[Dict[str, int]] = None,
+    metrics: Optional[Metrics] = None,
+    descriptions: Optional[Tuple[int, int]] = None,
+) -> Result:
+    """
+    Run ``match`` on the sequences of ``target`` missing from ``cache`` only.
+
+    ``columns`` are the tbl and domtbl columns of the sequence names, and
+    ``descriptions`` the ones of their descriptions if the rows hold them. Both are
+    rewritten from the headers of ``target``, as cached rows might come from another
+    record with the same residues. Rows of cached and fresh sequences are merged in
+    the order of ``target``, or sorted as a hmmsearch run would if ``order`` is given.
+    """
+    if metrics is None:
+        metrics = Metrics()
+
+    with metrics.phase("cache"):
+        context = cache.context(bin, options.askey(), database)
+        records = [
+            (name, text, cache.key(context, seq))
+            for name, text, seq in fasta_records(target)
+        ]
+        entries = cache.get_many(set(key for _, _, key in records))
+
+    headers = ("", "")
+    trailers = ("", "")
+    missing = OrderedDict()
+    for name, text, key in records:
+        if key not in entries:
+            missing.setdefault(key, (name, text))
+
+    if len(missing) > 0:
+        subset = tmpdir / "missing.fasta"
+        with open(subset, "w") as file:
+            for name, text in missing.values():
+                file.write(text)
+        opts = options.replace(
+            tblout=tmpdir / "missing.tbl.txt", domtblout=tmpdir / "missing.domtbl.txt"
+        )
+        match(subset, opts)
+
+        with metrics.phase("cache"):
+            tbl_head, tbl_groups, tbl_tail = rows_by_field(opts.tblout, columns[0])
+            dom_head, dom_groups, dom_tail = rows_by_field(opts.domtblout, columns[1])
+            headers = (tbl_head, dom_head)
+            trailers = (tbl_tail, dom_tail)
+
+            fresh = {}
+            for key, (name, _) in missing.items():
+                tbl = "".join(tbl_groups.get(name, []))
+                domtbl = "".join(dom_groups.get(name, []))
+                fresh[key] = (tbl, domtbl)
+            cache.put_many(fresh)
+            entries.update(fresh)
+            for filepath in [subset, opts.tblout, opts.domtblout]:
+                filepath.unlink()
+
+    with metrics.phase("merge"):
+        for i, dest in enumerate([options.tblout, options.domtblout]):
+            if dest is None:
+                continue
+            rows = []
+            for name, text, key in records:
+                for row in entries[key][i].splitlines(keepends=True):
+                    if row.split(None, columns[i] + 1)[columns[i]] != name:
+                        row = replace_field(row, columns[i], name)
+                    if descriptions is not None:
+                        row = replace_tail(row, descriptions[i], _description(text))
+                    rows.append(row)
+            if order is not None:
+                query = [TBL_QUERY, DOMTBL_QUERY][i]
+                evalue = [TBL_EVALUE, DOMTBL_EVALUE][i]
+                rows = sort_rows(rows, query, evalue, order)
+            with open(dest, "w") as file:
+                file.write(headers[i])
+                file.writelines(rows)
+                file.write(trailers[i])
+
+    return Result(options.tblout, options.domtblout, options.output, options.alignment)
+
+
+def _description(record: str) -> str:
+    # Description of a FASTA record as HMMER prints it in tables.
+    fields = record.split("\n", 1)[0][1:].split(None, 1)
+    if len(fields) < 2 or not fields[1].strip():
+        return "-"
+    return fields[1].strip()
+
+
+def _check_found(missing: List[str]):
+    if len(missing) > 0:
+        raise ValueError(f"Profiles not found: {', '.join(missing)}.")
+
+
+def _emit_seed(seed: int, keys: List[str], nsamples: int) -> int:
+    # hmmemit takes 0 for an arbitrary seed, so the derived one is positive.
+    text = "\0".join([str(seed), str(nsamples)] + keys)
+    digest = hashlib.sha256(text.encode()).digest()
+    return int.from_bytes(digest[:4], "big") % (2**31 - 1) + 1
 
 
 class HMMER:
     def __init__(self, profile: Union[Path, str]):
         self._profile = make_path(profile).absolute()
+        self._source = self._profile
         self._indexed = State.UNKNOWN
         self._timeout = 15
+        self._concurrency = os.cpu_count() or 1
+        self._limiter: Optional["Limiter"] = None
+        self._ssi: Optional[SSIIndex] = None
 
     @property
     def timeout(self) -> int:
@@ -160,8 +813,86 @@ class HMMER:
     def timeout(self, timeout: int):
         self._timeout = timeout
 
+    @property
+    def concurrency(self) -> int:
+        """
+        Maximum number of binaries run at once by the asynchronous methods of this
+        object. Defaults to the number of cores.
+        """
+        return self._concurrency
+
+    @concurrency.setter
+    def concurrency(self, concurrency: int):
+        self._concurrency = concurrency
+        self._limiter = None
+
+    def _limits(self) -> "Limiter":
+        # Created on first use, so that asyncio is imported by async methods only.
+        from ._aio import Limiter
+
+        if self._limiter is None:
+            self._limiter = Limiter(self._concurrency)
+        return self._limiter
+
+    def ensure_ready(
+        self,
+        press: bool = True,
+        index: bool = True,
+        cache_dir: Optional[Union[Path, str]] = None,
+    ):
+        """
+        Press and index the profile database unless it is already done and up to
+        date.
+
+        Artifacts are kept in a ``.ready`` directory next to the profile file, in a
+        subdirectory per content and HMMER version that holds a link to the file,
+        and this object runs the binaries against that link. They are checked
+        against the size, modification time and checksum of the profile file,
+        recorded in a manifest, and rebuilt if stale into a new subdirectory that
+        is swapped in whole. Concurrent calls, in this or other processes, are
+        serialized by a lock file.
+
+        Parameters
+        ----------
+        press
+            Ensure the files made by :meth:`.press`. Defaults to ``True``.
+        index
+            Ensure the SSI index made by :meth:`.index`. Defaults to ``True``.
+        cache_dir
+            Keep the artifacts in this directory, under a subdirectory named after
+            the checksum of the profile file, instead of next to it. Every user of
+            the same database content then shares them, and the subdirectories of
+            replaced or moved databases are removed. Defaults to ``None``.
+        """
+        if cache_dir is not None:
+            cache_dir = make_path(cache_dir)
+        self._profile = ensure_ready(self._source, press, index, cache_dir)
+        self._reset_index()
+
+    def _reset_index(self):
+        self._indexed = State.UNKNOWN
+        if self._ssi is not None:
+            self._ssi.close()
+            self._ssi = None
+
     def index(self):
-        check_call([str(hmmfetch), "--index", self._profile])
+        check_call([str(binaries.hmmfetch), "--index", self._profile])
+        self._reset_index()
+
+    @property
+    def ssi(self) -> Optional[SSIIndex]:
+        """
+        Reader of the SSI index of the profile file, if :meth:`.index` has built it.
+
+        :meth:`.fetch_profile` and :meth:`.emit` use it to look profiles up in
+        process, without running hmmfetch.
+        """
+        if self._ssi is None:
+            p = self._profile
+            filepath = p.with_suffix(p.suffix + ".ssi")
+            if filepath.exists():
+                self._ssi = SSIIndex(filepath)
+        return self._ssi
 
     @property
     def is_indexed(self) -> bool:
@@ -177,26 +908,31 @@ class HMMER:
         return self._indexed == State.YES
 
     def fetch_profile(self, key: str) -> str:
-        output = check_output([str(hmmfetch), str(self._profile), key], text=True)
+        ssi = self.ssi
+        if ssi is not None:
+            return str(ssi.profile(key), "ascii").rstrip("\n")
+
+        output = check_output(
+            [str(binaries.hmmfetch), str(self._profile), key], text=True
+        )
         if output[-1] == "\n":
             output = output[:-1]
         return output
 
     def press(self):
-        check_call([hmmpress, self._profile])
+        check_call([binaries.hmmpress, self._profile])
 
     def fetch(self, profile_accs: List[str]) -> str:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            keyfile = Path(tmpdir) / "keyfile"
-            with open(keyfile, "w") as file:
-                for acc in profile_accs:
-                    file.write(f"{acc}\n")
+        output = self._fetch_many(profile_accs, PIPE).stdout
+        if output[-1] == "\n":
+            output = output[:-1]
+        return output
 
-            cmd = f"{hmmfetch} -f {self._profile} {keyfile}"
-            output = check_output(cmd, shell=True, text=True)
-            if output[-1] == "\n":
-                output = output[:-1]
-            return output
+    def _fetch_many(self, keys: List[str], stdout) -> CompletedProcess:
+        # Keys are read from the standard input, in a single pass over the database.
+        cmd = [str(binaries.hmmfetch), "-f", str(self._profile), "-"]
+        keys_text = "".join(f"{key}\n" for key in keys)
+        return run(cmd, input=keys_text, stdout=stdout, text=True, check=True)
 
     @property
     def is_pressed(self) -> bool:
@@ -204,19 +940,167 @@ class HMMER:
         exts = [".h3f", ".h3i", ".h3m", ".h3p"]
         return all([p.with_suffix(p.suffix + ext).exists() for ext in exts])
 
-    def emit(self, hmmkey: str, nsamples=1, consensus=False, seed=0) -> List[FASTAItem]:
+    def emit(
+        self, hmmkey: str, nsamples=1, consensus=False, seed=0
+    ) -> List["FASTAItem"]:
+        from fasta_reader import read_fasta
+
         options = []
         if consensus:
             options.append("-c")
         if nsamples != 1:
             options += ["-N", str(nsamples)]
         if seed != 0:
-            options += ["-seed", str(seed)]
+            options += ["--seed", str(seed)]
 
-        flags = " ".join(options)
-        cmd = f"{hmmfetch} {self._profile} {hmmkey} | {hmmemit} {flags} -"
-        output = check_output(cmd, shell=True, text=True)
-        return read_fasta(StringIO(output)).read_items()
+        cmd_emit = [str(binaries.hmmemit)] + options + ["-"]
+        ssi = self.ssi
+        if ssi is not None:
+            output = check_output(cmd_emit, input=ssi.profile(hmmkey), text=False)
+        else:
+            cmd_fetch = [str(binaries.hmmfetch), str(self._profile), hmmkey]
+            with Popen(cmd_fetch, stdout=PIPE) as pfetch:
+                output = check_output(cmd_emit, stdin=pfetch.stdout)
+        return read_fasta(BytesIO(output)).read_items()
+
+    def emit_many(
+        self,
+        keys: Union[Iterable[str], Mapping[str, int]],
+        nsamples: int = 1,
+        consensus: bool = False,
+        seed: int = 0,
+        batch_size: int = 100,
+        nworkers: int = 1,
+    ) -> Iterator[Tuple[str, "FASTAItem"]]:
+        """
+        Sample sequences from many profiles.
+
+        The profiles are fetched once, from the SSI index if the database is indexed
+        or in a single hmmfetch pass otherwise. Consecutive keys of equal sample
+        count are then grouped into batches of up to ``batch_size`` profiles, each
+        sampled by a single hmmemit run.
+
+        Each batch is seeded from ``seed``, its sample count and its keys, so the
+        sequences depend on those only: they are the same from one call to the
+        next, whatever ``nworkers``. With ``batch_size=1``, the seed of a profile
+        depends on its key alone, so its samples do not change when other keys are
+        added or removed.
+
+        Parameters
+        ----------
+        keys
+            Names or accessions of profiles, or mapping of them to their number of
+            samples.
+        nsamples
+            Number of samples of each profile, if ``keys`` is not a mapping.
+            Defaults to ``1``.
+        consensus
+            Emit the consensus sequence of each profile instead of samples.
+            Defaults to ``False``.
+        seed
+            Base random seed. Defaults to ``0``.
+        batch_size
+            Maximum number of profiles per hmmemit run. Defaults to ``100``.
+        nworkers
+            Number of concurrent hmmemit runs. Defaults to ``1``.
+
+        Returns
+        -------
+        Key and sequence pairs, in the order of ``keys``, produced as batches
+        complete.
+        """
+        from fasta_reader import read_fasta
+
+        if isinstance(keys, Mapping):
+            counts = dict(keys)
+        else:
+            counts = dict.fromkeys(keys, nsamples)
+        if consensus:
+            counts = dict.fromkeys(counts, 1)
+        profiles = self._profile_texts(list(counts))
+
+        batches: List[Tuple[List[str], int]] = []
+        for key, n in counts.items():
+            if n <= 0:
+                continue
+            if batches and batches[-1][1] == n and len(batches[-1][0]) < batch_size:
+                batches[-1][0].append(key)
+            else:
+                batches.append(([key], n))
+
+        def emit(batch: Tuple[List[str], int]) -> List[Tuple[str, "FASTAItem"]]:
+            names, n = batch
+            cmd = [str(binaries.hmmemit)] + (["-c"] if consensus else ["-N", str(n)])
+            cmd += ["--seed", str(_emit_seed(seed, names, n)), "-"]
+            text = b"".join(profiles[name] for name in names)
+            items = read_fasta(BytesIO(check_output(cmd, input=text))).read_items()
+            return [(names[i // n], item) for i, item in enumerate(items)]
+
+        # Batches are yielded in order, keeping at most nworkers of them ahead.
+        with ThreadPoolExecutor(max_workers=max(nworkers, 1)) as executor:
+            pending: Deque[Future] = deque()
+            for batch in batches:
+                pending.append(executor.submit(emit, batch))
+                if len(pending) > nworkers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _profile_texts(self, keys: List[str]) -> Dict[str, bytes]:
+        ssi = self.ssi
+        if ssi is not None:
+            missing = [key for key in keys if key not in ssi]
+            if len(missing) > 0:
+                raise ValueError(f"Profiles not found: {', '.join(missing)}.")
+            return {key: bytes(ssi.profile(key)) for key in keys}
+
+        text = self._fetch_many(keys, PIPE).stdout
+        profiles = split_profiles(text.encode())
+        missing = [key for key in keys if key not in profiles]
+        if len(missing) > 0:
+            raise ValueError(f"Profiles not found: {', '.join(missing)}.")
+        return {key: profiles[key] for key in keys}
+
+    def session(
+        self,
+        nworkers: int = 1,
+        batch_size: int = 32,
+        heuristic: bool = True,
+        cut_ga: bool = False,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> "Session":
+        """
+        Long-lived runner for many small scans and searches.
+
+        It avoids the per-call temporary directory and target file, and batches
+        concurrent scans into single hmmscan runs. See :class:`hmmer.typing.Session`.
+
+        Parameters
+        ----------
+        nworkers
+            Number of concurrent binary processes. Defaults to ``1``.
+        batch_size
+            Maximum number of scan calls merged into one hmmscan run. Defaults to
+            ``32``.
+        timeout
+            Seconds a single run may take. Defaults to no limit.
+        """
+        from ._session import Session
+
+        return Session(
+            self,
+            nworkers=nworkers,
+            batch_size=batch_size,
+            heuristic=heuristic,
+            cut_ga=cut_ga,
+            Z=Z,
+            domZ=domZ,
+            cpu=cpu,
+            timeout=timeout,
+        )
 
     def scan(
         self,
@@ -228,25 +1112,345 @@ class HMMER:
         cut_ga: bool = False,
         hmmkey: Optional[str] = None,
         Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        nworkers: int = 1,
+        pipe: bool = False,
+        cache: Optional[ResultCache] = None,
+        pipeline: Union[str, Pipeline, None] = None,
+    ) -> Result:
+        """
+        Scan target sequences against the profile database.
+
+        Parameters
+        ----------
+        nworkers
+            Split the target sequences into up to ``nworkers`` shards and scan them
+            concurrently. Queries are independent in hmmscan, so the merged tables
+            match the ones of a single run. Defaults to ``1``.
+        cpu
+            Number of worker threads of each hmmscan process. Defaults to HMMER's
+            choice, or to the number of cores divided by ``nworkers`` in sharded
+            mode.
+        pipe
+            Write no intermediate files: a stream target is fed to the binary
+            through a pipe, and tables requested with ``True`` are read back through
+            pipes and parsed while the binary runs. As without a pipe,
+            :attr:`timeout` bounds only runs reading profiles fetched with
+            ``hmmkey``. Defaults to ``False``.
+        cache
+            Run only the sequences whose rows are not in the cache, and store the
+            rows of the new ones. The main output covers the new ones only. Defaults
+            to no caching.
+        pipeline
+            Filter thresholds of the acceleration pipeline, as a
+            :class:`hmmer.typing.Pipeline` or the name of a preset of
+            :data:`hmmer.pipeline.PRESETS`: ``"fast"``, ``"default"``,
+            ``"sensitive"`` or ``"max"``. ``heuristic=False`` is the same as
+            ``"max"``. Defaults to HMMER's thresholds.
+        """
+
+        opts = Options(
+            output,
+            heuristic=heuristic,
+            pipeline=pipeline,
+            cut_ga=cut_ga,
+            hmmkey=hmmkey,
+            Z=Z,
+            domZ=domZ,
+            cpu=cpu,
+        )
+        if pipe:
+            if nworkers > 1:
+                raise ValueError("Pipe mode does not support multiple workers.")
+            if cache is not None:
+                raise ValueError("Pipe mode does not support caching.")
+            return self._piped_match(binaries.hmmscan, target, opts, tblout, domtblout)
+
+        metrics = Metrics()
+        with temporary_directory() as tmp:
+            tmpdir = Path(tmp.name)
+            opts = opts.replace(
+                tblout=_optional_filepath(tblout, tmpdir / "tbl.txt"),
+                domtblout=_optional_filepath(domtblout, tmpdir / "domtbl.txt"),
+            )
+            with metrics.phase("target"):
+                target = make_target(target, tmpdir)
+            if cache is None:
+                result = self._match(
+                    binaries.hmmscan, target, opts, nworkers, tmpdir, metrics
+                )
+            else:
+                result = self._cached_match(
+                    cache, binaries.hmmscan, target, opts, nworkers, tmpdir, metrics
+                )
+            return result._measured(metrics)._own(tmp)
+
+    def scan_chunks(
+        self,
+        target: Union[Path, str],
+        chunk_size: int = 1000,
+        checkpoint: Optional[Union[Path, str]] = None,
+        heuristic: bool = True,
+        cut_ga: bool = False,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        nworkers: int = 1,
+        cache: Optional[ResultCache] = None,
+        pipeline: Union[str, Pipeline, None] = None,
+    ) -> Iterator[Result]:
+        """
+        Scan target sequences in chunks, yielding the result of each chunk as soon as
+        it is ready.
+
+        Only one chunk of sequences is held in memory at a time. Queries are
+        independent in hmmscan, so the rows of all chunks are the ones a single run
+        would give. The main output is discarded.
+
+        Parameters
+        ----------
+        chunk_size
+            Number of sequences per chunk. Defaults to ``1000``.
+        checkpoint
+            JSON file recording the number of chunks finished. A chunk counts as
+            finished once the next one is requested, so that an interrupted run
+            started again with the same checkpoint resumes after the last chunk the
+            caller has fully processed. It is removed when all chunks are done.
+        """
+        target = make_path(target).absolute()
+        stat = target.stat()
+        state = {
+            "target": str(target),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "chunk_size": chunk_size,
+        }
+
+        done = 0
+        if checkpoint is not None:
+            checkpoint = make_path(checkpoint)
+            saved = read_json(checkpoint)
+            if saved:
+                if {k: saved.get(k) for k in state} != state:
+                    raise ValueError(f"{checkpoint} is for another scan.")
+                done = saved["done"]
+
+        def scan(chunk: List["FASTAItem"]) -> Result:
+            fasta = StringIO("".join(f">{i.defline}\n{i.sequence}\n" for i in chunk))
+            return self.scan(
+                fasta,
+                output=os.devnull,
+                heuristic=heuristic,
+                pipeline=pipeline,
+                cut_ga=cut_ga,
+                Z=Z,
+                domZ=domZ,
+                cpu=cpu,
+                nworkers=nworkers,
+                pipe=nworkers == 1 and cache is None,
+                cache=cache,
+            )
+
+        from fasta_reader import read_fasta
+
+        items = iter(read_fasta(target))
+        # Sequences of finished chunks are skipped, not scanned.
+        for _ in islice(items, done * chunk_size):
+            pass
+
+        while True:
+            chunk = list(islice(items, chunk_size))
+            if len(chunk) == 0:
+                break
+            yield scan(chunk)
+            done += 1
+            if checkpoint is not None:
+                write_json(checkpoint, dict(state, done=done))
+
+        if checkpoint is not None and checkpoint.exists():
+            checkpoint.unlink()
+
+    def search(
+        self,
+        target: Union[Path, str, TextIO],
+        output: Optional[Union[Path, str]] = None,
+        tblout: Union[Path, str, bool] = True,
+        domtblout: Union[Path, str, bool] = True,
+        heuristic: bool = True,
+        cut_ga: bool = False,
+        hmmkey: Optional[str] = None,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        nworkers: int = 1,
+        pipe: bool = False,
+        cache: Optional[ResultCache] = None,
+        pipeline: Union[str, Pipeline, None] = None,
+        alignment: Optional[Union[Path, str]] = None,
     ) -> Result:
+        """
+        Search the profiles against target sequences.
+
+        Parameters
+        ----------
+        nworkers
+            Split the target sequences into up to ``nworkers`` shards and search them
+            concurrently. ``Z`` defaults to the total number of target sequences so
+            that E-values match the ones of a single run. Unless ``domZ`` is given,
+            the reported targets are then searched again with ``domZ`` set to their
+            total number, so that reported domains and conditional E-values match
+            too. Rows whose printed E-value and score tie might come in a different
+            order. No main output nor alignment is written, so ``output`` and
+            ``alignment`` must be ``None``. Defaults to ``1``.
+        cpu
+            Number of worker threads of each hmmsearch process. Defaults to HMMER's
+            choice, or to the number of cores divided by ``nworkers`` in sharded
+            mode.
+        pipe
+            Write no intermediate files: a stream target is fed to the binary
+            through a pipe, and tables requested with ``True`` are read back through
+            pipes and parsed while the binary runs. As without a pipe,
+            :attr:`timeout` bounds only runs reading profiles fetched with
+            ``hmmkey``. Defaults to ``False``.
+        cache
+            Run only the sequences whose rows are not in the cache, and store the
+            rows of the new ones. The main output covers the new ones only. Defaults
+            to no caching. Target sequences are cached one by one, which requires
+            ``Z`` and ``domZ`` so that their E-values do not depend on each other.
+        pipeline
+            Filter thresholds of the acceleration pipeline, as a
+            :class:`hmmer.typing.Pipeline` or the name of a preset of
+            :data:`hmmer.pipeline.PRESETS`: ``"fast"``, ``"default"``,
+            ``"sensitive"`` or ``"max"``. ``heuristic=False`` is the same as
+            ``"max"``. Defaults to HMMER's thresholds.
+        alignment
+            Write the hits of each profile as a Stockholm alignment (``-A``), read
+            back with :meth:`hmmer.typing.Result.iter_alignments`. Not supported
+            with ``nworkers``. With ``cache``, only new sequences are aligned.
+            Defaults to no alignment.
+        """
+
+        opts = Options(
+            output,
+            heuristic=heuristic,
+            pipeline=pipeline,
+            cut_ga=cut_ga,
+            hmmkey=hmmkey,
+            Z=Z,
+            domZ=domZ,
+            cpu=cpu,
+        )
+        if pipe:
+            if nworkers > 1:
+                raise ValueError("Pipe mode does not support multiple workers.")
+            if cache is not None:
+                raise ValueError("Pipe mode does not support caching.")
+            if alignment is not None:
+                opts = opts.replace(alignment=make_path(alignment))
+            return self._piped_match(
+                binaries.hmmsearch, target, opts, tblout, domtblout
+            )
+
+        metrics = Metrics()
+        with temporary_directory() as tmp:
+            tmpdir = Path(tmp.name)
+            opts = opts.replace(
+                tblout=_optional_filepath(tblout, tmpdir / "tbl.txt"),
+                domtblout=_optional_filepath(domtblout, tmpdir / "domtbl.txt"),
+                alignment=_optional_filepath(alignment, tmpdir / "alignment.sto"),
+            )
+            with metrics.phase("target"):
+                target = make_target(target, tmpdir)
+            if cache is None:
+                result = self._match(
+                    binaries.hmmsearch, target, opts, nworkers, tmpdir, metrics
+                )
+            else:
+                result = self._cached_match(
+                    cache, binaries.hmmsearch, target, opts, nworkers, tmpdir, metrics
+                )
+            return result._measured(metrics)._own(tmp)
+
+    def search_many(
+        self,
+        keys: Iterable[str],
+        target: Union[Path, str, TextIO],
+        output: Optional[Union[Path, str]] = None,
+        heuristic: bool = True,
+        cut_ga: bool = False,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        nworkers: int = 1,
+        pipeline: Union[str, Pipeline, None] = None,
+    ) -> Dict[str, Result]:
+        """
+        Search many selected profiles against target sequences.
+
+        The profiles are fetched in a single hmmfetch pass, using the SSI index if
+        the database is indexed, into a sub-database that is searched by a single
+        hmmsearch run (or ``nworkers`` sharded ones). Profiles are searched
+        independently by hmmsearch, so the result of each key is the one a search
+        with ``hmmkey=key`` would give.
+
+        Parameters
+        ----------
+        keys
+            Names or accessions of distinct profiles.
+        nworkers
+            See :meth:`.search`.
+
+        Returns
+        -------
+        Result of each key.
+
+        Raises ``ValueError`` naming the keys that match no profile.
+        """
+        keys = list(dict.fromkeys(keys))
+
+        # hmmfetch fails on the first missing key with an index, and skips missing
+        # keys without one.
+        ssi = self.ssi
+        if ssi is not None:
+            _check_found([key for key in keys if key not in ssi])
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            tbl_file = _optional_filepath(tblout, Path(tmpdir) / "tbl.txt")
-            domtbl_file = _optional_filepath(domtblout, Path(tmpdir) / "domtbl.txt")
+            tmp = Path(tmpdir)
+            subdb = tmp / "profiles.hmm"
+            with open(subdb, "w") as file:
+                self._fetch_many(keys, file)
+
+            names = profile_names(subdb)
+            accs = profile_accessions(subdb)
+            _check_found([key for key in keys if key not in names and key not in accs])
 
             opts = Options(
                 output,
-                tblout=tbl_file,
-                domtblout=domtbl_file,
+                tblout=tmp / "tbl.txt",
+                domtblout=tmp / "domtbl.txt",
                 heuristic=heuristic,
+                pipeline=pipeline,
                 cut_ga=cut_ga,
-                hmmkey=hmmkey,
                 Z=Z,
+                domZ=domZ,
+                cpu=cpu,
             )
-            target = make_target(target, Path(tmpdir))
-            return self._match(hmmscan, target, opts)
+            target = make_target(target, tmp)
+            HMMER(subdb)._match(binaries.hmmsearch, target, opts, nworkers, tmp)
 
-    def search(
+            tbl_empty, tbls = split_by_query(opts.tblout, TBL_QUERY)
+            domtbl_empty, domtbls = split_by_query(opts.domtblout, DOMTBL_QUERY)
+
+        results: Dict[str, Result] = {}
+        for key in keys:
+            name = key if key in names else accs[key]
+            tbl = tbls.get(name, tbl_empty)
+            domtbl = domtbls.get(name, domtbl_empty)
+            results[key] = Result.from_text(tbl, domtbl)
+        return results
+
+    async def ascan(
         self,
         target: Union[Path, str, TextIO],
         output: Optional[Union[Path, str]] = None,
@@ -256,48 +1460,385 @@ class HMMER:
         cut_ga: bool = False,
         hmmkey: Optional[str] = None,
         Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        pipeline: Union[str, Pipeline, None] = None,
+        timeout: Optional[float] = None,
     ) -> Result:
+        """
+        Asynchronous version of :meth:`.scan`.
+
+        At most :attr:`.concurrency` binaries run at once. The run is killed if the
+        awaiting task is cancelled.
+
+        Parameters
+        ----------
+        timeout
+            Seconds after which the run is killed, raising
+            :class:`subprocess.TimeoutExpired`. Defaults to no limit, as in
+            :meth:`.scan`.
+        """
+        from ._aio import run_async
+
+        with temporary_directory() as tmp:
+            tmpdir = Path(tmp.name)
+            opts = Options(
+                output,
+                tblout=_optional_filepath(tblout, tmpdir / "tbl.txt"),
+                domtblout=_optional_filepath(domtblout, tmpdir / "domtbl.txt"),
+                heuristic=heuristic,
+                pipeline=pipeline,
+                cut_ga=cut_ga,
+                hmmkey=hmmkey,
+                Z=Z,
+                domZ=domZ,
+                cpu=cpu,
+            )
+            cmd = await self._acommand(binaries.hmmscan, target, opts, tmpdir)
+            await run_async(cmd, self._limits(), timeout)
+            return Result(
+                opts.tblout, opts.domtblout, opts.output, opts.alignment
+            )._own(tmp)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tbl_file = _optional_filepath(tblout, Path(tmpdir) / "tbl.txt")
-            domtbl_file = _optional_filepath(domtblout, Path(tmpdir) / "domtbl.txt")
-
+    async def asearch(
+        self,
+        target: Union[Path, str, TextIO],
+        output: Optional[Union[Path, str]] = None,
+        tblout: Union[Path, str, bool] = True,
+        domtblout: Union[Path, str, bool] = True,
+        heuristic: bool = True,
+        cut_ga: bool = False,
+        hmmkey: Optional[str] = None,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        pipeline: Union[str, Pipeline, None] = None,
+        alignment: Optional[Union[Path, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Result:
+        """
+        Asynchronous version of :meth:`.search`.
+
+        At most :attr:`.concurrency` binaries run at once. The run is killed if the
+        awaiting task is cancelled.
+
+        Parameters
+        ----------
+        timeout
+            Seconds after which the run is killed, raising
+            :class:`subprocess.TimeoutExpired`. Defaults to no limit, as in
+            :meth:`.search`.
+        """
+        from ._aio import run_async
+
+        with temporary_directory() as tmp:
+            tmpdir = Path(tmp.name)
             opts = Options(
                 output,
-                tblout=tbl_file,
-                domtblout=domtbl_file,
+                tblout=_optional_filepath(tblout, tmpdir / "tbl.txt"),
+                domtblout=_optional_filepath(domtblout, tmpdir / "domtbl.txt"),
+                heuristic=heuristic,
+                pipeline=pipeline,
+                cut_ga=cut_ga,
+                hmmkey=hmmkey,
+                Z=Z,
+                domZ=domZ,
+                cpu=cpu,
+                alignment=_optional_filepath(alignment, tmpdir / "alignment.sto"),
+            )
+            cmd = await self._acommand(binaries.hmmsearch, target, opts, tmpdir)
+            await run_async(cmd, self._limits(), timeout)
+            return Result(
+                opts.tblout, opts.domtblout, opts.output, opts.alignment
+            )._own(tmp)
+
+    def ascan_rows(
+        self,
+        target: Union[Path, str, TextIO],
+        output: Optional[Union[Path, str]] = None,
+        heuristic: bool = True,
+        cut_ga: bool = False,
+        hmmkey: Optional[str] = None,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        typed: bool = False,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[DomTBLRow]:
+        """
+        Scan target sequences and yield domtbl rows while hmmscan is running.
+
+        Rows come as hmmscan writes them, which is in blocks as its output is
+        buffered. The main output is discarded unless ``output`` is given. Closing
+        the iterator kills hmmscan: when breaking out of the iteration, call its
+        ``aclose`` method, as it is otherwise closed only once garbage collected.
+        See :meth:`.ascan` for the concurrency limit and ``timeout``, which here
+        includes the time spent by the consumer.
+        """
+        return self._astream(
+            binaries.hmmscan,
+            target,
+            output,
+            heuristic,
+            cut_ga,
+            hmmkey,
+            Z,
+            domZ,
+            cpu,
+            typed,
+            timeout,
+        )
+
+    def asearch_rows(
+        self,
+        target: Union[Path, str, TextIO],
+        output: Optional[Union[Path, str]] = None,
+        heuristic: bool = True,
+        cut_ga: bool = False,
+        hmmkey: Optional[str] = None,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        typed: bool = False,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[DomTBLRow]:
+        """
+        Search the profiles against target sequences and yield domtbl rows while
+        hmmsearch is running.
+
+        See :meth:`.ascan_rows`.
+        """
+        return self._astream(
+            binaries.hmmsearch,
+            target,
+            output,
+            heuristic,
+            cut_ga,
+            hmmkey,
+            Z,
+            domZ,
+            cpu,
+            typed,
+            timeout,
+        )
+
+    async def _astream(
+        self,
+        bin: Path,
+        target: Union[Path, str, TextIO],
+        output: Optional[Union[Path, str]],
+        heuristic: bool,
+        cut_ga: bool,
+        hmmkey: Optional[str],
+        Z: Optional[int],
+        domZ: Optional[int],
+        cpu: Optional[int],
+        typed: bool,
+        timeout: Optional[float],
+    ) -> AsyncIterator[DomTBLRow]:
+        from ._aio import stream_domtbl
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmpdir = Path(tmp)
+            opts = Options(
+                output or os.devnull,
+                domtblout=Path("/dev/stdout"),
                 heuristic=heuristic,
                 cut_ga=cut_ga,
                 hmmkey=hmmkey,
                 Z=Z,
+                domZ=domZ,
+                cpu=cpu,
             )
-            target = make_target(target, Path(tmpdir))
-            return self._match(hmmsearch, target, opts)
+            cmd = await self._acommand(bin, target, opts, tmpdir)
+            rows = stream_domtbl(cmd, self._limits(), timeout, typed)
+            try:
+                async for row in rows:
+                    yield row
+            finally:
+                await rows.aclose()
+
+    async def _acommand(
+        self,
+        bin: Path,
+        target: Union[Path, str, TextIO],
+        options: Options,
+        tmpdir: Path,
+    ) -> List[str]:
+        from ._aio import run_async
+
+        profile = self._profile
+        if options.has_hmmkey:
+            profile = tmpdir / "profile.hmm"
+            with open(profile, "w") as file:
+                cmd = [str(binaries.hmmfetch), str(self._profile), options.hmmkey]
+                await run_async(cmd, self._limits(), self._timeout, stdout=file)
+            options = options.replace(hmmkey=None)
+
+        target = make_target(target, tmpdir).absolute()
+        return [str(bin)] + options.aslist() + [str(profile), str(target)]
 
-    def _match(self, bin: Path, target: Path, options: Options) -> Result:
+    def _match(
+        self,
+        bin: Path,
+        target: Path,
+        options: Options,
+        nworkers: int = 1,
+        tmpdir: Optional[Path] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> Result:
         target = target.absolute()
+        if metrics is None:
+            metrics = Metrics()
+
+        if nworkers > 1:
+            assert tmpdir is not None
+            return self._sharded_match(bin, target, options, nworkers, tmpdir, metrics)
 
         cmd_match = [str(bin)] + options.aslist()
 
+        with metrics.phase("run"):
+            if options.has_hmmkey:
+
+                cmd_fetch = [str(binaries.hmmfetch), str(self._profile), options.hmmkey]
+                start = time.perf_counter()
+                with Popen(cmd_fetch, stdout=PIPE) as pfetch:
+                    cmd_match += ["-", str(target)]
+                    with Popen(cmd_match, stdin=pfetch.stdout) as pmatch:
+                        wait_measured(pmatch, metrics, start, self._timeout)
+                    wait_measured(pfetch, metrics, start)
+
+            else:
+                cmd_match += [str(self._profile), str(target)]
+                call_measured(cmd_match, metrics)
+
+        return Result(
+            options.tblout, options.domtblout, options.output, options.alignment
+        )
+
+    def _cached_match(
+        self,
+        cache: ResultCache,
+        bin: Path,
+        target: Path,
+        options: Options,
+        nworkers: int,
+        tmpdir: Path,
+        metrics: Metrics,
+    ) -> Result:
+        order = None
+        columns = (TBL_QUERY, DOMTBL_QUERY)
+        descriptions = None
+        if bin == binaries.hmmsearch:
+            if options.Z is None or options.domZ is None:
+                raise ValueError("Caching searches requires Z and domZ.")
+            order = {} if options.has_hmmkey else profile_names(self._profile)
+            columns = (0, 0)
+            descriptions = (TBL_DESCRIPTION, DOMTBL_DESCRIPTION)
+
+        def match(subset: Path, opts: Options) -> Result:
+            return self._match(bin, subset, opts, nworkers, tmpdir, metrics)
+
+        database = self._profile
+        return _run_cached(
+            cache,
+            bin,
+            database,
+            options,
+            target,
+            tmpdir,
+            match,
+            columns,
+            order,
+            metrics,
+            descriptions,
+        )
+
+    def _piped_match(
+        self,
+        bin: Path,
+        target: Union[Path, str, TextIO],
+        options: Options,
+        tblout: Union[Path, str, bool],
+        domtblout: Union[Path, str, bool],
+    ) -> Result:
+        if isinstance(target, str):
+            target = Path(target)
+
+        metrics = Metrics()
+        with ExitStack() as stack:
+            stdin = None
+            pfetch = None
+            timeout = None
+            profile = str(self._profile)
+            if options.has_hmmkey:
+                cmd_fetch = [str(binaries.hmmfetch), profile, options.hmmkey]
+                start = time.perf_counter()
+                pfetch = stack.enter_context(Popen(cmd_fetch, stdout=PIPE))
+                stdin = pfetch.stdout
+                timeout = self._timeout
+                profile = "-"
+                options = options.replace(hmmkey=None)
+            elif bin == binaries.hmmsearch and not isinstance(target, Path):
+                # hmmsearch rewinds the target for every profile, so a stream
+                # target has to be stored first.
+                tmpdir = stack.enter_context(tempfile.TemporaryDirectory())
+                with metrics.phase("target"):
+                    target = make_target(target, Path(tmpdir))
+
+            def positional(target: str) -> List[str]:
+                return [profile, target]
+
+            result = _run_piped(
+                bin,
+                target,
+                options,
+                tblout,
+                domtblout,
+                positional,
+                stdin,
+                timeout,
+                metrics,
+            )
+            if pfetch is not None:
+                wait_measured(pfetch, metrics, start)
+            return result
+
+    def _sharded_match(
+        self,
+        bin: Path,
+        target: Path,
+        options: Options,
+        nworkers: int,
+        tmpdir: Path,
+        metrics: Metrics,
+    ) -> Result:
+        profile = self._profile
         if options.has_hmmkey:
+            profile = tmpdir / "profile.hmm"
+            with open(profile, "w") as file, metrics.phase("run"):
+                cmd = [str(binaries.hmmfetch), str(self._profile), options.hmmkey]
+                call_measured(cmd, metrics, self._timeout, stdout=file)
+            options = options.replace(hmmkey=None)
 
-            cmd_fetch = [str(hmmfetch), str(self._profile), options.hmmkey]
-            with Popen(cmd_fetch, stdout=PIPE) as pfetch:
-                cmd_match += ["-", str(target)]
-                with Popen(cmd_match, stdin=pfetch.stdout) as pmatch:
-                    pmatch.wait(timeout=self._timeout)
+        order = None
+        if bin == binaries.hmmsearch:
+            order = profile_names(profile)
 
-        else:
-            cmd_match += [str(self._profile), str(target)]
-            check_call(cmd_match)
+        def positional(shard: Path) -> List[str]:
+            return [str(profile), str(shard)]
 
-        return Result(options.tblout, options.domtblout)
+        return _run_sharded(
+            bin, options, target, nworkers, tmpdir, positional, order, metrics, profile
+        )
 
 
 class SeqDB:
     def __init__(self, db: Union[Path, str]):
         self.sequences = make_path(db).absolute()
         self._timeout = 15
+        self._concurrency = os.cpu_count() or 1
+        self._limiter: Optional["Limiter"] = None
 
     @property
     def timeout(self) -> int:
@@ -307,13 +1848,94 @@ class SeqDB:
     def timeout(self, timeout: int):
         self._timeout = timeout
 
-    def _match(self, bin: Path, target: Path, options: Options) -> Result:
+    @property
+    def concurrency(self) -> int:
+        """
+        Maximum number of binaries run at once by the asynchronous methods of this
+        object. Defaults to the number of cores.
+        """
+        return self._concurrency
+
+    @concurrency.setter
+    def concurrency(self, concurrency: int):
+        self._concurrency = concurrency
+        self._limiter = None
+
+    def _limits(self) -> "Limiter":
+        # Created on first use, so that asyncio is imported by async methods only.
+        from ._aio import Limiter
+
+        if self._limiter is None:
+            self._limiter = Limiter(self._concurrency)
+        return self._limiter
+
+    def _match(
+        self,
+        bin: Path,
+        target: Path,
+        options: Options,
+        nworkers: int = 1,
+        tmpdir: Optional[Path] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> Result:
         target = target.absolute()
         sequence_db = self.sequences
+        if metrics is None:
+            metrics = Metrics()
+
+        if nworkers > 1:
+            assert tmpdir is not None
+
+            def positional(shard: Path) -> List[str]:
+                return [str(shard), str(sequence_db)]
+
+            return _run_sharded(
+                bin, options, target, nworkers, tmpdir, positional, None, metrics
+            )
+
         cmd_match = [str(bin)] + options.aslist() + [str(target), str(sequence_db)]
-        check_call(cmd_match)
+        with metrics.phase("run"):
+            call_measured(cmd_match, metrics)
+
+        return Result(
+            options.tblout, options.domtblout, options.output, options.alignment
+        )
+
+    def _cached_match(
+        self,
+        cache: ResultCache,
+        bin: Path,
+        target: Path,
+        options: Options,
+        nworkers: int,
+        tmpdir: Path,
+        metrics: Metrics,
+    ) -> Result:
+        def match(subset: Path, opts: Options) -> Result:
+            return self._match(bin, subset, opts, nworkers, tmpdir, metrics)
+
+        database = self.sequences
+        columns = (TBL_QUERY, DOMTBL_QUERY)
+        return _run_cached(
+            cache, bin, database, options, target, tmpdir, match, columns, None, metrics
+        )
+
+    def _piped_match(
+        self,
+        bin: Path,
+        target: Union[Path, str, TextIO],
+        options: Options,
+        tblout: Union[Path, str, bool],
+        domtblout: Union[Path, str, bool],
+    ) -> Result:
+        if isinstance(target, str):
+            target = Path(target)
+        sequence_db = str(self.sequences)
 
-        return Result(options.tblout, options.domtblout)
+        def positional(target: str) -> List[str]:
+            return [target, sequence_db]
+
+        return _run_piped(bin, target, options, tblout, domtblout, positional)
 
     def phmmer(
         self,
@@ -325,23 +1947,266 @@ class SeqDB:
         Z: Optional[int] = None,
         alignment: Optional[Union[Path, str]] = None,
         notextw: bool = False,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        nworkers: int = 1,
+        pipe: bool = False,
+        cache: Optional[ResultCache] = None,
+        pipeline: Union[str, Pipeline, None] = None,
     ) -> Result:
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tbl_file = _optional_filepath(tblout, Path(tmpdir) / "tbl.txt")
-            domtbl_file = _optional_filepath(domtblout, Path(tmpdir) / "domtbl.txt")
-            alignment_file = _optional_filepath(
-                alignment, Path(tmpdir) / "alignment.sto"
+        """
+        Search query sequences against the sequence database.
+
+        Parameters
+        ----------
+        nworkers
+            Split the query sequences into up to ``nworkers`` shards and search them
+            concurrently. Queries are independent in phmmer, so the merged tables
+            match the ones of a single run. Defaults to ``1``.
+        cpu
+            Number of worker threads of each phmmer process. Defaults to HMMER's
+            choice, or to the number of cores divided by ``nworkers`` in sharded
+            mode.
+        pipe
+            Write no intermediate files: a stream target is fed to the binary
+            through a pipe, and tables requested with ``True`` are read back through
+            pipes and parsed while the binary runs. As without a pipe, runs are not
+            bounded by :attr:`timeout`. Defaults to ``False``.
+        cache
+            Run only the sequences whose rows are not in the cache, and store the
+            rows of the new ones. The main output covers the new ones only. Defaults
+            to no caching.
+        pipeline
+            Filter thresholds of the acceleration pipeline, as a
+            :class:`hmmer.typing.Pipeline` or the name of a preset of
+            :data:`hmmer.pipeline.PRESETS`: ``"fast"``, ``"default"``,
+            ``"sensitive"`` or ``"max"``. ``heuristic=False`` is the same as
+            ``"max"``. Defaults to HMMER's thresholds.
+        """
+
+        opts = Options(
+            output,
+            heuristic=heuristic,
+            pipeline=pipeline,
+            notextw=notextw,
+            Z=Z,
+            domZ=domZ,
+            cpu=cpu,
+        )
+        if pipe:
+            if nworkers > 1:
+                raise ValueError("Pipe mode does not support multiple workers.")
+            if cache is not None:
+                raise ValueError("Pipe mode does not support caching.")
+            if alignment is not None:
+                opts = opts.replace(alignment=make_path(alignment))
+            return self._piped_match(binaries.phmmer, target, opts, tblout, domtblout)
+
+        metrics = Metrics()
+        with temporary_directory() as tmp:
+            tmpdir = Path(tmp.name)
+            opts = opts.replace(
+                tblout=_optional_filepath(tblout, tmpdir / "tbl.txt"),
+                domtblout=_optional_filepath(domtblout, tmpdir / "domtbl.txt"),
+                alignment=_optional_filepath(alignment, tmpdir / "alignment.sto"),
             )
+            with metrics.phase("target"):
+                target = make_target(target, tmpdir)
+            if cache is None:
+                result = self._match(
+                    binaries.phmmer, target, opts, nworkers, tmpdir, metrics
+                )
+            else:
+                result = self._cached_match(
+                    cache, binaries.phmmer, target, opts, nworkers, tmpdir, metrics
+                )
+            return result._measured(metrics)._own(tmp)
 
+    async def aphmmer(
+        self,
+        target: Union[Path, str, TextIO],
+        output: Optional[Union[Path, str]] = None,
+        tblout: Union[Path, str, bool] = True,
+        domtblout: Union[Path, str, bool] = True,
+        heuristic: bool = True,
+        Z: Optional[int] = None,
+        alignment: Optional[Union[Path, str]] = None,
+        notextw: bool = False,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        pipeline: Union[str, Pipeline, None] = None,
+        timeout: Optional[float] = None,
+    ) -> Result:
+        """
+        Asynchronous version of :meth:`.phmmer`.
+
+        At most :attr:`.concurrency` binaries run at once. The run is killed if the
+        awaiting task is cancelled.
+
+        Parameters
+        ----------
+        timeout
+            Seconds after which the run is killed, raising
+            :class:`subprocess.TimeoutExpired`. Defaults to no limit, as in
+            :meth:`.phmmer`.
+        """
+        from ._aio import run_async
+
+        with temporary_directory() as tmp:
+            tmpdir = Path(tmp.name)
             opts = Options(
                 output,
-                tblout=tbl_file,
-                domtblout=domtbl_file,
+                tblout=_optional_filepath(tblout, tmpdir / "tbl.txt"),
+                domtblout=_optional_filepath(domtblout, tmpdir / "domtbl.txt"),
                 heuristic=heuristic,
+                pipeline=pipeline,
                 notextw=notextw,
-                alignment=alignment_file,
+                alignment=_optional_filepath(alignment, tmpdir / "alignment.sto"),
                 Z=Z,
+                domZ=domZ,
+                cpu=cpu,
+            )
+            target = make_target(target, tmpdir).absolute()
+            cmd = (
+                [str(binaries.phmmer)]
+                + opts.aslist()
+                + [str(target), str(self.sequences)]
             )
-            target = make_target(target, Path(tmpdir))
-            return self._match(phmmer, target, opts)
+            await run_async(cmd, self._limits(), timeout)
+            return Result(
+                opts.tblout, opts.domtblout, opts.output, opts.alignment
+            )._own(tmp)
+
+    async def aphmmer_rows(
+        self,
+        target: Union[Path, str, TextIO],
+        output: Optional[Union[Path, str]] = None,
+        heuristic: bool = True,
+        Z: Optional[int] = None,
+        domZ: Optional[int] = None,
+        cpu: Optional[int] = None,
+        typed: bool = False,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[DomTBLRow]:
+        """
+        Search query sequences against the sequence database and yield domtbl rows
+        while phmmer is running.
+
+        See :meth:`.HMMER.ascan_rows`.
+        """
+        from ._aio import stream_domtbl
+
+        with tempfile.TemporaryDirectory() as tmp:
+            opts = Options(
+                output or os.devnull,
+                domtblout=Path("/dev/stdout"),
+                heuristic=heuristic,
+                Z=Z,
+                domZ=domZ,
+                cpu=cpu,
+            )
+            target = make_target(target, Path(tmp)).absolute()
+            cmd = (
+                [str(binaries.phmmer)]
+                + opts.aslist()
+                + [str(target), str(self.sequences)]
+            )
+            rows = stream_domtbl(cmd, self._limits(), timeout, typed)
+            try:
+                async for row in rows:
+                    yield row
+            finally:
+                await rows.aclose()
+
+    def all_vs_all(
+        self,
+        block_size: int = 1000,
+        nworkers: Optional[int] = None,
+        heuristic: bool = True,
+        Z: Optional[int] = None,
+        cpu: int = 1,
+        pipeline: Union[str, Pipeline, None] = None,
+    ) -> SimilarityMatrix:
+        """
+        Search every sequence of the database against all of them.
+
+        The query × target space is tiled into blocks of ``block_size`` sequences
+        per side, and the tiles are searched by concurrent phmmer processes. Every
+        tile uses the same ``-Z``, so that E-values are those of searches against
+        the whole database. Hits of each tile are merged as soon as it finishes,
+        keeping only their indices and scores.
+
+        Parameters
+        ----------
+        block_size
+            Number of sequences per block. Defaults to ``1000``.
+        nworkers
+            Number of concurrent phmmer processes. Defaults to the number of cores.
+        Z
+            Database size used for E-values. Defaults to the number of sequences.
+        cpu
+            Number of worker threads of each phmmer process. Defaults to ``1``.
+        """
+        names = sequence_names(self.sequences)
+        index = {name: i for i, name in enumerate(names)}
+        if len(index) != len(names):
+            raise ValueError(f"{self.sequences} has duplicate sequence names.")
+
+        import numpy as np
+
+        coo: List[Tuple[np.ndarray, ...]] = []
+        nblocks = -(-len(names) // block_size)
+        sizes = shard_sizes(len(names), nblocks) if nblocks > 0 else []
+        nworkers = nworkers or os.cpu_count() or 1
+        opts = Options(
+            os.devnull,
+            heuristic=heuristic,
+            pipeline=pipeline,
+            Z=Z or len(names),
+            cpu=cpu,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmpdir = Path(tmp)
+            blocks = split_fasta(self.sequences, sizes, tmpdir)
+
+            def run(i: int, j: int) -> Path:
+                tbl = tmpdir / f"tile.{i}.{j}.txt"
+                cmd = [str(binaries.phmmer)] + opts.replace(tblout=tbl).aslist()
+                check_call(cmd + [str(blocks[i]), str(blocks[j])])
+                return tbl
+
+            with ThreadPoolExecutor(max_workers=nworkers) as executor:
+                tiles = [
+                    executor.submit(run, i, j)
+                    for i in range(len(blocks))
+                    for j in range(len(blocks))
+                ]
+                for future in as_completed(tiles):
+                    tbl = future.result()
+                    cols = read_tbl_columns(tbl)
+                    tbl.unlink()
+                    n = len(cols)
+                    query = (index[name] for name in cols.query_name)
+                    target = (index[name] for name in cols.target_name)
+                    coo.append(
+                        (
+                            np.fromiter(query, dtype=np.int32, count=n),
+                            np.fromiter(target, dtype=np.int32, count=n),
+                            cols.score,
+                            cols.e_value,
+                        )
+                    )
+
+        if not coo:
+            coo.append((np.empty(0, np.int32),) * 2 + (np.empty(0, np.float64),) * 2)
+        query, target, score, e_value = [np.concatenate(a) for a in zip(*coo)]
+
+        order = np.lexsort((target, query))
+        return SimilarityMatrix(
+            np.array(names, dtype=object),
+            query[order],
+            target[order],
+            score[order],
+            e_value[order],
+        )
@@ -0,0 +1,235 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from subprocess import CalledProcessError, Popen, TimeoutExpired
+from sys import platform
+from typing import Any, Dict, Iterator, List, Optional
+
+__all__ = ["Metrics", "ProcessMetrics", "TableMetrics"]
+
+
+@dataclass
+class ProcessMetrics:
+    """
+    Resource usage of one binary run.
+
+    Parameters
+    ----------
+    program
+        Name of the binary, such as ``"hmmscan"``.
+    args
+        Command line.
+    wall_time
+        Seconds from start to exit.
+    user_time
+        CPU seconds spent in user mode, all threads included.
+    system_time
+        CPU seconds spent in kernel mode, all threads included.
+    max_rss
+        Peak resident set size in bytes.
+    returncode
+        Exit status.
+    """
+
+    program: str
+    args: List[str]
+    wall_time: float
+    user_time: float
+    system_time: float
+    max_rss: int
+    returncode: int
+
+
+@dataclass
+class TableMetrics:
+    """
+    Output and parsing of one table.
+
+    Parameters
+    ----------
+    bytes_written
+        Size of the table written by the binaries.
+    bytes_read
+        Size of the table text parsed.
+    rows
+        Number of rows parsed.
+    parse_time
+        Seconds spent parsing.
+    """
+
+    bytes_written: int = 0
+    bytes_read: int = 0
+    rows: int = 0
+    parse_time: float = 0.0
+
+
+@dataclass
+class Metrics:
+    """
+    Time and resources spent producing a :class:`hmmer.typing.Result`, available as
+    its ``metrics`` attribute.
+
+    Parameters
+    ----------
+    processes
+        One record per binary run, in order of exit.
+    phases
+        Wall seconds spent in each phase: ``"target"`` (writing the target to a
+        temporary file), ``"split"`` and ``"merge"`` (sharding), ``"cache"`` (looking
+        up and storing cached rows), ``"run"`` (running the binaries) and
+        ``"parse"`` (parsing tables). Phases that did not happen are missing.
+    tables
+        Output and parsing of the ``"tbl"`` and ``"domtbl"`` tables. Tables are
+        parsed on first access, so parsing is accounted at that time.
+    """
+
+    processes: List[ProcessMetrics] = field(default_factory=list)
+    phases: Dict[str, float] = field(default_factory=dict)
+    tables: Dict[str, TableMetrics] = field(
+        default_factory=lambda: {"tbl": TableMetrics(), "domtbl": TableMetrics()}
+    )
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def cpu_time(self) -> float:
+        """
+        CPU seconds spent by all binaries.
+        """
+        return sum(p.user_time + p.system_time for p in self.processes)
+
+    @property
+    def max_rss(self) -> int:
+        """
+        Largest peak resident set size of the binaries, in bytes.
+        """
+        return max([p.max_rss for p in self.processes], default=0)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Add the wall time of the block to a phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_process(self, process: ProcessMetrics):
+        with self._lock:
+            self.processes.append(process)
+
+    def add_written(self, table: str, nbytes: int):
+        with self._lock:
+            self.tables[table].bytes_written += nbytes
+
+    def add_parse(self, table: str, nbytes: int, rows: int, seconds: float):
+        with self._lock:
+            stats = self.tables[table]
+            stats.bytes_read += nbytes
+            stats.rows += rows
+            stats.parse_time += seconds
+            self.phases["parse"] = self.phases.get("parse", 0.0) + seconds
+
+    def asdict(self) -> Dict[str, Any]:
+        """
+        Plain dictionary of the metrics, including :attr:`.cpu_time` and
+        :attr:`.max_rss`, suitable for JSON.
+        """
+        with self._lock:
+            return {
+                "processes": [asdict(p) for p in self.processes],
+                "phases": dict(self.phases),
+                "tables": {k: asdict(v) for k, v in self.tables.items()},
+                "cpu_time": self.cpu_time,
+                "max_rss": self.max_rss,
+            }
+
+
+def _exitcode(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _wait4(proc: Popen, timeout: Optional[float]):
+    # Popen.wait would reap the process and lose its resource usage. With a timeout,
+    # a thread blocks in wait4 so that the exit is seen at once, where polling would
+    # add up to its interval to the call.
+    if timeout is None:
+        _, status, usage = os.wait4(proc.pid, 0)
+    else:
+        waited: List[Any] = []
+
+        def wait():
+            try:
+                waited.append(os.wait4(proc.pid, 0))
+            except ChildProcessError as error:
+                waited.append(error)
+
+        thread = threading.Thread(target=wait, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            raise TimeoutExpired(proc.args, timeout)
+        if isinstance(waited[0], ChildProcessError):
+            raise waited[0]
+        _, status, usage = waited[0]
+    proc.returncode = _exitcode(status)
+    return usage
+
+
+def wait_measured(
+    proc: Popen, metrics: Optional[Metrics], start: float, timeout=None
+) -> int:
+    """
+    Wait for a process started at ``start`` (:func:`time.perf_counter`) and record
+    its resource usage in ``metrics``.
+    """
+    try:
+        usage = _wait4(proc, timeout)
+    except ChildProcessError:
+        # Reaped by someone else.
+        return proc.wait()
+
+    if metrics is not None:
+        args = [str(arg) for arg in proc.args]
+        # Kilobytes on Linux, bytes on macOS.
+        scale = 1 if platform == "darwin" else 1024
+        metrics.add_process(
+            ProcessMetrics(
+                program=Path(args[0]).name.split("_")[0],
+                args=args,
+                wall_time=time.perf_counter() - start,
+                user_time=usage.ru_utime,
+                system_time=usage.ru_stime,
+                max_rss=usage.ru_maxrss * scale,
+                returncode=proc.returncode,
+            )
+        )
+    return proc.returncode
+
+
+def call_measured(cmd: List[str], metrics: Optional[Metrics], timeout=None, **kwargs):
+    """
+    Same as :func:`subprocess.check_call`, recording the resource usage of the
+    process in ``metrics``.
+    """
+    start = time.perf_counter()
+    with Popen(cmd, **kwargs) as proc:
+        try:
+            returncode = wait_measured(proc, metrics, start, timeout)
+        except TimeoutExpired:
+            proc.kill()
+            raise
+    if returncode != 0:
+        raise CalledProcessError(returncode, cmd)
@@ -0,0 +1,184 @@
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Union
+
+__all__ = ["DomainAlignment", "iter_domain_alignments"]
+
+
+@dataclass
+class DomainAlignment:
+    """
+    Alignment of one domain, from the main output of hmmscan, hmmsearch or phmmer.
+
+    Parameters
+    ----------
+    query
+        Query name.
+    target
+        Target name.
+    domain
+        Domain number within the target.
+    score
+        Domain score.
+    c_value
+        Domain conditional E-value.
+    model
+        Profile row of the alignment: consensus residues, upper case for highly
+        conserved positions, and ``.`` for insertions.
+    match
+        Middle row: identities, ``+`` for positive scores, and spaces.
+    sequence
+        Sequence row of the alignment, with ``-`` for deletions.
+    pp
+        Posterior probability of each aligned residue, from ``0`` to ``9`` and
+        ``*``, with ``.`` for gaps.
+    hmm_from
+        First profile position.
+    hmm_to
+        Last profile position.
+    seq_from
+        First sequence position.
+    seq_to
+        Last sequence position.
+    """
+
+    query: str
+    target: str
+    domain: int
+    score: float
+    c_value: float
+    model: str
+    match: str
+    sequence: str
+    pp: str
+    hmm_from: int
+    hmm_to: int
+    seq_from: int
+    seq_to: int
+
+
+_query = re.compile(r"^Query:\s+(\S+)")
+_domain = re.compile(
+    r"^\s+== domain (\d+)\s+score: (\S+) bits;\s+conditional E-value: (\S+)"
+)
+_row = re.compile(r"^\s*(\S+)\s+(\d+|-)\s+(\S+)\s+(\d+|-)\s*$")
+
+
+class _Domain:
+    def __init__(self, query: str, target: str, domain: int, score: str, c_value: str):
+        self.ali = DomainAlignment(
+            query,
+            target,
+            domain,
+            float(score),
+            float(c_value),
+            "",
+            "",
+            "",
+            "",
+            0,
+            0,
+            0,
+            0,
+        )
+        self._model: List[str] = []
+        self._match: List[str] = []
+        self._sequence: List[str] = []
+        self._pp: List[str] = []
+        self._hmm: List[int] = []
+        self._seq: List[int] = []
+
+    def add_block(self, lines: List[str]):
+        # Optional RF and CS annotation rows come before the profile row.
+        rows = [line for line in lines if not line.rstrip().endswith((" RF", " CS"))]
+        model = _row.match(rows[0])
+        sequence = _row.match(rows[2])
+        if model is None or sequence is None:
+            raise ValueError(f"Unexpected alignment block: {rows[0]!r}.")
+
+        start, stop = model.span(3)
+        self._model.append(model.group(3))
+        self._match.append(rows[1][start:stop].ljust(stop - start))
+        self._sequence.append(sequence.group(3))
+        if len(rows) > 3:
+            self._pp.append(rows[3][start:stop])
+        for coords, match in [(self._hmm, model), (self._seq, sequence)]:
+            coords += [int(match.group(i)) for i in [2, 4] if match.group(i) != "-"]
+
+    def finish(self) -> DomainAlignment:
+        ali = self.ali
+        ali.model = "".join(self._model)
+        ali.match = "".join(self._match)
+        ali.sequence = "".join(self._sequence)
+        ali.pp = "".join(self._pp)
+        if self._hmm:
+            ali.hmm_from, ali.hmm_to = self._hmm[0], self._hmm[-1]
+        if self._seq:
+            ali.seq_from, ali.seq_to = self._seq[0], self._seq[-1]
+        return ali
+
+
+def iter_domain_alignments(
+    file: Union[str, Path, IO[str]],
+) -> Iterator[DomainAlignment]:
+    """
+    Iterate over the domain alignments of a main output file of hmmscan, hmmsearch
+    or phmmer, reading it line by line.
+
+    Alignments wrapped over several blocks are joined.
+
+    Parameters
+    ----------
+    file
+        File path or file stream.
+    """
+    closeit = False
+    if isinstance(file, str):
+        file = Path(file)
+
+    if isinstance(file, Path):
+        file = open(file, "r")
+        closeit = True
+
+    query = ""
+    target = ""
+    current: Optional[_Domain] = None
+    block: List[str] = []
+    try:
+        for line in file:
+            if current is not None:
+                if not line.strip():
+                    if block:
+                        current.add_block(block)
+                        block = []
+                    continue
+                ends = not line.startswith(" ") or _domain.match(line) is not None
+                if block or not ends:
+                    block.append(line.rstrip("\n"))
+                    continue
+                yield current.finish()
+                current = None
+
+            if line.startswith(">> "):
+                target = line[3:].split(None, 1)[0]
+                continue
+
+            match = _domain.match(line)
+            if match is not None:
+                current = _Domain(
+                    query, target, int(match.group(1)), *match.groups()[1:]
+                )
+                continue
+
+            match = _query.match(line)
+            if match is not None:
+                query = match.group(1)
+
+        if current is not None:
+            if block:
+                current.add_block(block)
+            yield current.finish()
+    finally:
+        if closeit:
+            file.close()
@@ -0,0 +1,228 @@
+import dataclasses
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Union
+
+__all__ = ["PRESETS", "Pipeline", "PipelineStats", "read_pipeline_stats"]
+
+
+@dataclass(frozen=True)
+class Pipeline:
+    """
+    Thresholds of HMMER's acceleration pipeline.
+
+    Targets go through the MSV filter, the biased composition filter, the Viterbi
+    filter and the Forward filter before being scored in full. Lower thresholds
+    drop more targets early, which is faster and less sensitive.
+
+    Parameters
+    ----------
+    F1
+        P-value threshold of the MSV filter (``--F1``). Defaults to HMMER's 0.02.
+    F2
+        P-value threshold of the Viterbi filter (``--F2``). Defaults to HMMER's
+        1e-3.
+    F3
+        P-value threshold of the Forward filter (``--F3``). Defaults to HMMER's
+        1e-5.
+    bias
+        ``False`` to turn the biased composition filter off (``--nobias``).
+        Defaults to ``True``.
+    max
+        Turn all filters off (``--max``), for maximum sensitivity. Cannot be
+        combined with ``F1``, ``F2`` or ``F3``. Defaults to ``False``.
+    """
+
+    F1: Optional[float] = None
+    F2: Optional[float] = None
+    F3: Optional[float] = None
+    bias: bool = True
+    max: bool = False
+
+    def __post_init__(self):
+        if self.max and self._thresholds():
+            raise ValueError("Filter thresholds cannot be combined with max.")
+
+    def _thresholds(self) -> Dict[str, float]:
+        names = ["F1", "F2", "F3"]
+        return {n: getattr(self, n) for n in names if getattr(self, n) is not None}
+
+    def aslist(self) -> List[str]:
+        options = []
+        if self.max:
+            options += ["--max"]
+        for name, value in self._thresholds().items():
+            options += [f"--{name}", repr(value)]
+        if not self.bias:
+            options += ["--nobias"]
+        return options
+
+    def replace(self, **kwargs) -> "Pipeline":
+        return dataclasses.replace(self, **kwargs)
+
+
+PRESETS = {
+    "fast": Pipeline(F1=0.002, F2=1e-4, F3=1e-6),
+    "default": Pipeline(),
+    "sensitive": Pipeline(F1=0.1, F2=1e-2, F3=1e-4),
+    "max": Pipeline(max=True),
+}
+
+
+def make_pipeline(pipeline: Union[str, Pipeline, None], heuristic: bool) -> Pipeline:
+    """
+    Pipeline of a preset name, or of ``heuristic=False`` meaning ``max``.
+    """
+    if pipeline is None:
+        pipeline = Pipeline()
+    elif isinstance(pipeline, str):
+        if pipeline not in PRESETS:
+            raise ValueError(f"Unknown pipeline preset: {pipeline}.")
+        pipeline = PRESETS[pipeline]
+    if not heuristic:
+        pipeline = pipeline.replace(max=True)
+    return pipeline
+
+
+@dataclass
+class PipelineStats:
+    """
+    Internal pipeline statistics of one query, from the main output.
+
+    Parameters
+    ----------
+    query
+        Query name.
+    queries
+        Number of query profiles or sequences.
+    targets
+        Number of target profiles or sequences.
+    residues
+        Number of residues searched.
+    nodes
+        Number of profile nodes.
+    passed_msv
+        Number of targets that passed the MSV filter.
+    passed_bias
+        Number of targets that passed the biased composition filter.
+    passed_vit
+        Number of targets that passed the Viterbi filter.
+    passed_fwd
+        Number of targets that passed the Forward filter.
+    Z
+        Search space size used for E-values.
+    domZ
+        Search space size used for conditional E-values.
+    user_time
+        CPU seconds spent in user mode on the query.
+    system_time
+        CPU seconds spent in kernel mode on the query.
+    elapsed
+        Wall seconds spent on the query.
+    mcells_per_sec
+        Throughput, in millions of dynamic programming cells per second.
+    """
+
+    query: str
+    queries: int = 0
+    targets: int = 0
+    residues: int = 0
+    nodes: int = 0
+    passed_msv: int = 0
+    passed_bias: int = 0
+    passed_vit: int = 0
+    passed_fwd: int = 0
+    Z: float = 0.0
+    domZ: float = 0.0
+    user_time: float = 0.0
+    system_time: float = 0.0
+    elapsed: float = 0.0
+    mcells_per_sec: float = 0.0
+
+
+_query = re.compile(r"^Query:\s+(\S+)")
+_count = re.compile(r"^(Query|Target) (model|sequence)\S*:\s+(\d+)\s+\((\d+) (\w+)")
+_passed = re.compile(r"^Passed (MSV|bias|Vit|Fwd) filter:\s+(\d+)")
+_space = re.compile(r"^(Initial|Domain) search space\s+\((\w+)\):\s+(\S+)")
+_time = re.compile(r"^# CPU time: (\S+)u (\S+)s \S+ Elapsed: (\S+)")
+_speed = re.compile(r"^# Mc/sec: (\S+)")
+
+
+def _seconds(clock: str) -> float:
+    # hh:mm:ss.ss
+    seconds = 0.0
+    for field in clock.split(":"):
+        seconds = seconds * 60 + float(field)
+    return seconds
+
+
+def read_pipeline_stats(file: Union[str, Path, IO[str]]) -> List[PipelineStats]:
+    """
+    Read the internal pipeline statistics of each query of a main output file of
+    hmmscan, hmmsearch or phmmer.
+
+    Parameters
+    ----------
+    file
+        File path or file stream.
+    """
+    closeit = False
+    if isinstance(file, str):
+        file = Path(file)
+
+    if isinstance(file, Path):
+        file = open(file, "r")
+        closeit = True
+
+    stats: List[PipelineStats] = []
+    current: Optional[PipelineStats] = None
+    try:
+        for line in file:
+            match = _query.match(line)
+            if match is not None:
+                current = PipelineStats(match.group(1))
+                continue
+            if current is None:
+                continue
+
+            match = _count.match(line)
+            if match is not None:
+                side, _, count, size, unit = match.groups()
+                setattr(
+                    current, "queries" if side == "Query" else "targets", int(count)
+                )
+                setattr(current, "nodes" if unit == "nodes" else "residues", int(size))
+                continue
+
+            match = _passed.match(line)
+            if match is not None:
+                name = "passed_" + match.group(1).lower()
+                setattr(current, name, int(match.group(2)))
+                continue
+
+            match = _space.match(line)
+            if match is not None:
+                setattr(current, match.group(2), float(match.group(3)))
+                continue
+
+            match = _time.match(line)
+            if match is not None:
+                current.user_time = float(match.group(1))
+                current.system_time = float(match.group(2))
+                current.elapsed = _seconds(match.group(3))
+                continue
+
+            match = _speed.match(line)
+            if match is not None:
+                current.mcells_per_sec = float(match.group(1))
+                continue
+
+            if line.startswith("//"):
+                stats.append(current)
+                current = None
+    finally:
+        if closeit:
+            file.close()
+
+    return stats
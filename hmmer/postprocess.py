@@ -0,0 +1,179 @@
+from bisect import bisect_left
+from typing import Mapping, Optional
+
+import numpy as np
+
+from .domtbl import DomTBLColumns
+
+__all__ = ["best_hits", "filter_domains", "resolve_overlaps"]
+
+# Post-processing of columnar domtbl tables. Every function returns an array of row
+# indices, in increasing order, that selects rows of the table without copying them:
+# index the table with it to get the rows, or pass it as ``index`` to another
+# function to chain them.
+
+
+def _index(cols: DomTBLColumns, index: Optional[np.ndarray]) -> np.ndarray:
+    if index is None:
+        return np.arange(len(cols))
+    return np.asarray(index)
+
+
+def _codes(values: np.ndarray) -> np.ndarray:
+    return np.unique(values, return_inverse=True)[1].reshape(-1)
+
+
+def filter_domains(
+    cols: DomTBLColumns,
+    e_value: Optional[float] = None,
+    i_value: Optional[float] = None,
+    c_value: Optional[float] = None,
+    score: Optional[float] = None,
+    domain_score: Optional[float] = None,
+    index: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Rows whose E-values are at most and whose scores are at least the given
+    thresholds.
+
+    Parameters
+    ----------
+    cols
+        Domtbl table.
+    e_value
+        Maximum full sequence E-value.
+    i_value
+        Maximum domain independent E-value.
+    c_value
+        Maximum domain conditional E-value.
+    score
+        Minimum full sequence score.
+    domain_score
+        Minimum domain score.
+    index
+        Rows to consider. Defaults to all of them.
+    """
+    index = _index(cols, index)
+    keep = np.ones(len(index), dtype=bool)
+    for name, value in [
+        ("e_value", e_value),
+        ("i_value", i_value),
+        ("c_value", c_value),
+    ]:
+        if value is not None:
+            keep &= getattr(cols, name)[index] <= value
+    for name, value in [("score", score), ("domain_score", domain_score)]:
+        if value is not None:
+            keep &= getattr(cols, name)[index] >= value
+    return index[keep]
+
+
+def best_hits(
+    cols: DomTBLColumns,
+    by: str = "query_name",
+    index: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Row of highest domain score, ties broken by lowest independent E-value, for each
+    distinct value of a name column.
+
+    Parameters
+    ----------
+    cols
+        Domtbl table.
+    by
+        Column that defines the groups: ``"query_name"`` (sequences in hmmscan
+        output) or ``"target_name"``. Defaults to ``"query_name"``.
+    index
+        Rows to consider. Defaults to all of them.
+    """
+    index = _index(cols, index)
+    if len(index) == 0:
+        return index
+
+    group = _codes(getattr(cols, by)[index])
+    order = np.lexsort((cols.i_value[index], -cols.domain_score[index], group))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = group[order][1:] != group[order][:-1]
+    return np.sort(index[order[first]])
+
+
+def resolve_overlaps(
+    cols: DomTBLColumns,
+    clans: Optional[Mapping[str, str]] = None,
+    by: str = "query_name",
+    coord: str = "env",
+    index: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Remove domains that overlap a better domain of the same sequence.
+
+    Domains of each sequence are taken by increasing independent E-value,
+    ties broken by highest domain score, and kept unless they overlap a domain
+    already kept. Kept intervals are maintained sorted, so each domain is checked in
+    logarithmic time.
+
+    Parameters
+    ----------
+    cols
+        Domtbl table.
+    clans
+        Clan of each profile name or accession. If given, only domains of profiles
+        of the same clan compete, and domains of profiles without a clan are all
+        kept. Defaults to every domain competing with the others.
+    by
+        Column of the sequence names: ``"query_name"`` for hmmscan output or
+        ``"target_name"`` for hmmsearch output. Defaults to ``"query_name"``.
+    coord
+        ``"env"`` for envelope or ``"ali"`` for alignment coordinates. Defaults to
+        ``"env"``.
+    index
+        Rows to consider. Defaults to all of them.
+    """
+    index = _index(cols, index)
+    if len(index) == 0:
+        return index
+
+    seqs = getattr(cols, by)[index]
+    if clans is None:
+        group = _codes(seqs)
+        compete = np.ones(len(index), dtype=bool)
+    else:
+        other = "target" if by == "query_name" else "query"
+        names = getattr(cols, f"{other}_name")[index]
+        accs = getattr(cols, f"{other}_accession")[index]
+        clan = [clans.get(n, clans.get(a, "")) for n, a in zip(names, accs)]
+        compete = np.array([c != "" for c in clan], dtype=bool)
+        keys = [f"{s}\0{c}" for s, c in zip(seqs, clan)]
+        group = _codes(np.array(keys, dtype=object))
+
+    order = np.lexsort((-cols.domain_score[index], cols.i_value[index], group))
+    starts = getattr(cols, f"{coord}_start")[index][order].tolist()
+    stops = getattr(cols, f"{coord}_stop")[index][order].tolist()
+    groups = group[order].tolist()
+    competes = compete[order].tolist()
+
+    keep = np.zeros(len(order), dtype=bool)
+    current = -1
+    kept_starts: list = []
+    kept_stops: list = []
+    for i, g in enumerate(groups):
+        if not competes[i]:
+            keep[i] = True
+            continue
+        if g != current:
+            current = g
+            kept_starts = []
+            kept_stops = []
+        start, stop = starts[i], stops[i]
+        # Kept intervals are disjoint, so only the neighbours can overlap.
+        j = bisect_left(kept_starts, start)
+        if j > 0 and kept_stops[j - 1] >= start:
+            continue
+        if j < len(kept_starts) and kept_starts[j] <= stop:
+            continue
+        kept_starts.insert(j, start)
+        kept_stops.insert(j, stop)
+        keep[i] = True
+
+    return np.sort(index[order[keep]])
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ["SimilarityMatrix"]
+
+
+@dataclass
+class SimilarityMatrix:
+    """
+    Sparse matrix of sequence similarities in coordinate (COO) format, as given by
+    :meth:`hmmer.SeqDB.all_vs_all`.
+
+    Entry ``k`` is a hit of query ``names[query[k]]`` against target
+    ``names[target[k]]``. Entries are sorted by query, then target.
+
+    Parameters
+    ----------
+    names
+        Sequence names, as an object array, in database order.
+    query
+        Query indices, as an int32 array.
+    target
+        Target indices, as an int32 array.
+    score
+        Full sequence bit scores, as a float64 array.
+    e_value
+        Full sequence E-values, as a float64 array.
+    """
+
+    names: "np.ndarray"
+    query: "np.ndarray"
+    target: "np.ndarray"
+    score: "np.ndarray"
+    e_value: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    @property
+    def shape(self):
+        return (len(self.names), len(self.names))
+
+    def to_scipy(self, values: str = "score"):
+        """
+        Same matrix as a :class:`scipy.sparse.coo_matrix` of ``"score"`` or
+        ``"e_value"``. Requires SciPy.
+        """
+        from scipy.sparse import coo_matrix
+
+        data = getattr(self, values)
+        return coo_matrix((data, (self.query, self.target)), shape=self.shape)
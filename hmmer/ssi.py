@@ -0,0 +1,174 @@
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from ._misc import make_path
+
+__all__ = ["SSIIndex"]
+
+# Easel SSI v3.0 format: big-endian header, then file, primary key and secondary key
+# records of fixed sizes. Keys are NUL-padded and sorted, which allows binary search.
+_MAGIC = 0xD3D3C9B3
+_HEADER = struct.Struct(">IIIHQQIIIIII")
+
+
+class SSIIndex:
+    """
+    Reader of the SSI index of a HMMER3 profile file, as built by ``hmmfetch
+    --index``.
+
+    The index and the indexed files are memory-mapped. Names and accessions are
+    resolved by binary search over the sorted keys, and profiles are returned as
+    slices of the mapped file, without copying.
+
+    Profiles are returned as stored in the file, whereas ``hmmfetch`` parses and
+    writes them back; both are identical for files written by HMMER itself.
+
+    Parameters
+    ----------
+    filepath
+        Path to the ``.ssi`` file.
+    """
+
+    def __init__(self, filepath: Union[Path, str]):
+        self._filepath = make_path(filepath)
+        with open(self._filepath, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            _,
+            offsz,
+            nfiles,
+            self._nprimary,
+            self._nsecondary,
+            flen,
+            self._plen,
+            self._slen,
+            frecsize,
+            self._precsize,
+            self._srecsize,
+        ) = _HEADER.unpack_from(self._mm, 0)
+
+        if magic != _MAGIC:
+            raise ValueError(f"{self._filepath} is not a SSI v3.0 index.")
+
+        self._off = struct.Struct(">Q" if offsz == 8 else ">I")
+        foffset, self._poffset, self._soffset = [
+            self._off.unpack_from(self._mm, _HEADER.size + k * offsz)[0]
+            for k in range(3)
+        ]
+
+        self._files: List[Path] = []
+        for i in range(nfiles):
+            name = self._string(foffset + i * frecsize, flen)
+            self._files.append(self._filepath.parent / name)
+        self._maps: Dict[int, mmap.mmap] = {}
+
+    def _string(self, start: int, size: int) -> str:
+        raw = self._mm[start : start + size]
+        return raw.split(b"\0", 1)[0].decode()
+
+    def _primary_key(self, i: int) -> bytes:
+        start = self._poffset + i * self._precsize
+        return self._mm[start : start + self._plen].split(b"\0", 1)[0]
+
+    def _secondary_key(self, i: int) -> bytes:
+        start = self._soffset + i * self._srecsize
+        return self._mm[start : start + self._slen].split(b"\0", 1)[0]
+
+    @staticmethod
+    def _bisect(key: bytes, n: int, get) -> Optional[int]:
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if get(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < n and get(lo) == key:
+            return lo
+        return None
+
+    def _find_primary(self, key: bytes) -> Optional[int]:
+        i = self._bisect(key, self._nprimary, self._primary_key)
+        if i is not None:
+            return i
+
+        j = self._bisect(key, self._nsecondary, self._secondary_key)
+        if j is None:
+            return None
+        start = self._soffset + j * self._srecsize + self._slen
+        pkey = self._mm[start : start + self._plen].split(b"\0", 1)[0]
+        return self._bisect(pkey, self._nprimary, self._primary_key)
+
+    def __len__(self) -> int:
+        return self._nprimary
+
+    def __contains__(self, key: str) -> bool:
+        return self._find_primary(key.encode()) is not None
+
+    def keys(self) -> Iterator[str]:
+        """
+        Primary keys (profile names), in sorted order.
+        """
+        for i in range(self._nprimary):
+            yield self._primary_key(i).decode()
+
+    def _record(self, key: str) -> Tuple[int, int]:
+        i = self._find_primary(key.encode())
+        if i is None:
+            raise KeyError(key)
+        start = self._poffset + i * self._precsize + self._plen
+        (fnum,) = struct.unpack_from(">H", self._mm, start)
+        (r_off,) = self._off.unpack_from(self._mm, start + 2)
+        return fnum, r_off
+
+    def offset(self, key: str) -> Tuple[Path, int]:
+        """
+        File and byte offset of the profile of a given name or accession.
+        """
+        fnum, r_off = self._record(key)
+        return self._files[fnum], r_off
+
+    def profile(self, key: str) -> memoryview:
+        """
+        Text of the profile of a given name or accession, including the ``//`` line.
+
+        The returned view maps the profile file: release it before closing the
+        index.
+        """
+        fnum, r_off = self._record(key)
+        mm = self._map(fnum)
+        end = mm.find(b"\n//", r_off)
+        if end < 0:
+            raise ValueError(f"Unterminated profile {key} in {self._files[fnum]}.")
+        end = mm.find(b"\n", end + 1)
+        end = len(mm) if end < 0 else end + 1
+        return memoryview(mm)[r_off:end]
+
+    def _map(self, fnum: int) -> mmap.mmap:
+        if fnum not in self._maps:
+            with open(self._files[fnum], "rb") as file:
+                self._maps[fnum] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._maps[fnum]
+
+    def close(self):
+        """
+        Unmap the index and the profile files.
+
+        Files still referenced by a returned view stay mapped until it is released.
+        """
+        for mm in list(self._maps.values()) + [self._mm]:
+            try:
+                mm.close()
+            except BufferError:
+                pass
+        self._maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
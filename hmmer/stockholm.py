@@ -0,0 +1,168 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Tuple, Union
+
+__all__ = ["StockholmAlignment", "iter_stockholm"]
+
+
+class StockholmAlignment:
+    """
+    One alignment of a Stockholm file, as written by the ``-A`` option of hmmsearch
+    and phmmer.
+
+    Aligned sequences are held as byte arrays, one byte per column. Per-column
+    (``#=GC``) and per-residue (``#=GR``) annotations are kept as raw bytes and
+    assembled on first access.
+
+    Parameters
+    ----------
+    gf
+        File annotations (``#=GF``) by tag, such as ``"ID"`` and ``"AC"``. Repeated
+        tags are joined with spaces.
+    gs
+        Sequence annotations (``#=GS``) by sequence name, then by tag.
+    """
+
+    def __init__(self, gf: Dict[str, str], gs: Dict[str, Dict[str, str]]):
+        self.gf = gf
+        self.gs = gs
+        self._rows: Dict[str, bytearray] = OrderedDict()
+        self._gc: Dict[str, List[bytes]] = OrderedDict()
+        self._gr: Dict[Tuple[str, str], List[bytes]] = OrderedDict()
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the query, from the ``ID`` file annotation.
+        """
+        return self.gf.get("ID", "")
+
+    @property
+    def accession(self) -> str:
+        """
+        Accession of the query, from the ``AC`` file annotation.
+        """
+        return self.gf.get("AC", "")
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Names of the aligned sequences, in file order. HMMER names them
+        ``name/start-end``.
+        """
+        return list(self._rows)
+
+    @property
+    def width(self) -> int:
+        """
+        Number of columns.
+        """
+        return max((len(row) for row in self._rows.values()), default=0)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Tuple[str, bytearray]]:
+        return iter(self._rows.items())
+
+    def __getitem__(self, name: str) -> bytearray:
+        return self._rows[name]
+
+    @property
+    def column_tags(self) -> List[str]:
+        """
+        Tags of the per-column annotations, such as ``"RF"`` and ``"PP_cons"``.
+        """
+        return list(self._gc)
+
+    def column_annotation(self, tag: str) -> bytes:
+        """
+        Per-column annotation of a tag, one byte per column.
+        """
+        return self._join(tag, self._gc)
+
+    def residue_annotation(self, name: str, tag: str) -> bytes:
+        """
+        Per-residue annotation of a sequence, such as ``"PP"`` for posterior
+        probabilities, one byte per column.
+        """
+        return self._join((name, tag), self._gr)
+
+    @staticmethod
+    def _join(key, chunks: Dict) -> bytes:
+        parts = chunks[key]
+        if len(parts) > 1:
+            parts[:] = [b"".join(parts)]
+        return parts[0]
+
+    def _add_row(self, name: str, residues: bytes):
+        row = self._rows.get(name)
+        if row is None:
+            self._rows[name] = bytearray(residues)
+        else:
+            row += residues
+
+    def __repr__(self) -> str:
+        return (
+            f"StockholmAlignment(name={self.name!r}, nseqs={len(self)}, "
+            f"width={self.width})"
+        )
+
+
+def _fields(line: bytes, n: int) -> List[bytes]:
+    # Annotation lines split into n fields, the last one possibly empty.
+    fields = line.rstrip().split(None, n - 1)
+    return fields + [b""] * (n - len(fields))
+
+
+def iter_stockholm(
+    file: Union[str, Path, IO[bytes], IO[str]],
+) -> Iterator[StockholmAlignment]:
+    """
+    Iterate over the alignments of a Stockholm file.
+
+    The file is read line by line, so only the current alignment is held in
+    memory. Interleaved blocks are joined.
+
+    Parameters
+    ----------
+    file
+        File path or file stream.
+    """
+    closeit = False
+    if isinstance(file, str):
+        file = Path(file)
+
+    if isinstance(file, Path):
+        file = open(file, "rb")
+        closeit = True
+
+    try:
+        ali = StockholmAlignment(OrderedDict(), OrderedDict())
+        for line in file:
+            if isinstance(line, str):
+                line = line.encode()
+            if line.startswith(b"//"):
+                yield ali
+                ali = StockholmAlignment(OrderedDict(), OrderedDict())
+            elif line.startswith(b"#=GC "):
+                _, tag, text = _fields(line, 3)
+                ali._gc.setdefault(tag.decode(), []).append(text)
+            elif line.startswith(b"#=GR "):
+                _, name, tag, text = _fields(line, 4)
+                key = (name.decode(), tag.decode())
+                ali._gr.setdefault(key, []).append(text)
+            elif line.startswith(b"#=GS "):
+                _, name, tag, text = [f.decode() for f in _fields(line, 4)]
+                ali.gs.setdefault(name, OrderedDict())[tag] = text
+            elif line.startswith(b"#=GF "):
+                _, tag, text = [f.decode() for f in _fields(line, 3)]
+                if tag in ali.gf:
+                    text = f"{ali.gf[tag]} {text}"
+                ali.gf[tag] = text
+            elif not line.startswith(b"#") and line.strip():
+                name, residues = _fields(line, 2)
+                ali._add_row(name.decode(), residues)
+    finally:
+        if closeit:
+            file.close()
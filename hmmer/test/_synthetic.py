@@ -0,0 +1,201 @@
+import math
+import random
+from pathlib import Path
+from typing import List, Union
+
+__all__ = ["write_domtbl", "write_profiles", "write_sequences", "write_tbl"]
+
+_amino = "ACDEFGHIKLMNPQRSTVWY"
+
+
+def _fmt(prob: float) -> str:
+    if prob <= 0.0:
+        return "        *"
+    return f"{-math.log(prob):9.5f}"
+
+
+def _emission(consensus: int, weight: float) -> List[float]:
+    rest = (1.0 - weight) / (len(_amino) - 1)
+    return [weight if i == consensus else rest for i in range(len(_amino))]
+
+
+def _consensus(nprofiles: int, length: int, seed: int) -> List[List[int]]:
+    rng = random.Random(seed)
+    return [
+        [rng.randrange(len(_amino)) for _ in range(length)] for _ in range(nprofiles)
+    ]
+
+
+def _profile(index: int, cons: List[int]) -> str:
+    name = f"Fam{index + 1}"
+    length = len(cons)
+    background = [1.0 / len(_amino)] * len(_amino)
+    trans = [0.9, 0.05, 0.05, 0.5, 0.5, 0.7, 0.3]
+    last = [0.95, 0.05, 0.0, 0.5, 0.5, 1.0, 0.0]
+
+    lines = [
+        "HMMER3/f [3.3.2 | Nov 2020]",
+        f"NAME  {name}",
+        f"ACC   PF{index + 1:05d}.1",
+        f"DESC  Synthetic family {index + 1}",
+        f"LENG  {length}",
+        "ALPH  amino",
+        "RF    no",
+        "MM    no",
+        "CONS  yes",
+        "CS    no",
+        "MAP   yes",
+        "NSEQ  10",
+        "EFFN  1.000000",
+        f"CKSUM {sum(cons)}",
+        "GA    10.00 10.00",
+        "TC    10.00 10.00",
+        "NC    9.00 9.00",
+        "STATS LOCAL MSV      -9.9014  0.70957",
+        "STATS LOCAL VITERBI -10.7224  0.70957",
+        "STATS LOCAL FORWARD  -4.1637  0.70957",
+        "HMM          " + "        ".join(_amino),
+        "            m->m     m->i     m->d     i->m     i->i     d->m     d->d",
+        "  COMPO   " + " ".join(_fmt(p) for p in background),
+        "          " + " ".join(_fmt(p) for p in background),
+        "          " + " ".join(_fmt(p) for p in [0.9, 0.05, 0.05, 0.5, 0.5, 1.0, 0.0]),
+    ]
+    for k in range(length):
+        emis = " ".join(_fmt(p) for p in _emission(cons[k], 0.6))
+        annot = f"{k + 1:6d} {_amino[cons[k]].lower()} - - -"
+        lines.append(f"  {k + 1:5d}   {emis} {annot}")
+        lines.append("          " + " ".join(_fmt(p) for p in background))
+        t = last if k == length - 1 else trans
+        lines.append("          " + " ".join(_fmt(p) for p in t))
+    lines.append("//")
+    return "\n".join(lines) + "\n"
+
+
+def write_profiles(
+    filepath: Union[str, Path], nprofiles: int = 4, length: int = 40, seed: int = 0
+) -> Path:
+    """
+    Write a database of synthetic amino acid profiles in HMMER3/f format.
+
+    Parameters
+    ----------
+    filepath
+        Destination file path.
+    nprofiles
+        Number of profiles.
+    length
+        Number of match states of each profile.
+    seed
+        Random seed.
+    """
+    filepath = Path(filepath)
+    with open(filepath, "w") as file:
+        for i, cons in enumerate(_consensus(nprofiles, length, seed)):
+            file.write(_profile(i, cons))
+    return filepath
+
+
+def write_sequences(
+    filepath: Union[str, Path],
+    nsequences: int = 8,
+    nprofiles: int = 4,
+    length: int = 40,
+    seed: int = 0,
+) -> Path:
+    """
+    Write amino acid sequences that carry domains from :func:`write_profiles`.
+
+    Every sequence embeds the consensus of one profile, chosen round-robin, between
+    random flanks. ``nprofiles``, ``length`` and ``seed`` must match the ones used to
+    write the profiles.
+    """
+    filepath = Path(filepath)
+    consensus = [
+        "".join(_amino[i] for i in cons) for cons in _consensus(nprofiles, length, seed)
+    ]
+
+    rng = random.Random(seed + 1)
+    with open(filepath, "w") as file:
+        for i in range(nsequences):
+            left = "".join(rng.choice(_amino) for _ in range(rng.randrange(10, 60)))
+            right = "".join(rng.choice(_amino) for _ in range(rng.randrange(10, 60)))
+            seq = left + consensus[i % nprofiles] + right
+            file.write(f">seq{i + 1} Synthetic sequence {i + 1}\n")
+            for j in range(0, len(seq), 60):
+                file.write(seq[j : j + 60] + "\n")
+    return filepath
+
+
+_tbl_header = """\
+#                                                               --- full sequence ---- --- best 1 domain ---- --- domain number estimation ----
+# target name        accession  query name           accession    E-value  score  bias   E-value  score  bias   exp reg clu  ov env dom rep inc description of target
+#------------------- ---------- -------------------- ---------- --------- ------ ----- --------- ------ -----   --- --- --- --- --- --- --- --- ---------------------
+"""
+
+_domtbl_header = """\
+#                                                                            --- full sequence --- -------------- this domain -------------   hmm coord   ali coord   env coord
+# target name        accession   tlen query name           accession   qlen   E-value  score  bias   #  of  c-Evalue  i-Evalue  score  bias  from    to  from    to  from    to  acc description of target
+#------------------- ---------- ----- -------------------- ---------- ----- --------- ------ ----- --- --- --------- --------- ------ ----- ----- ----- ----- ----- ----- ----- ---- ---------------------
+"""
+
+
+def write_tbl(filepath: Union[str, Path], nrows: int, seed: int = 0) -> Path:
+    """
+    Write a tbl file of ``nrows`` random rows in HMMER's layout.
+    """
+    filepath = Path(filepath)
+    rng = random.Random(seed)
+    fmt = "%-20s %-10s %-20s %-10s %9.2g %6.1f %5.1f %9.2g %6.1f %5.1f %5.1f"
+    fmt += " %3d %3d %3d %3d %3d %3d %3d %s\n"
+    with open(filepath, "w") as file:
+        file.write(_tbl_header)
+        for i in range(nrows):
+            evalue = 10 ** rng.uniform(-50, 1)
+            score = rng.uniform(0, 300)
+            ndom = rng.randrange(1, 4)
+            row = (f"seq{i}", "-", f"Fam{i % 1000}", f"PF{i % 1000:05d}.1")
+            row += (evalue, score, rng.uniform(0, 20), evalue, score, 1.0)
+            row += (rng.uniform(1, 3), ndom, 0, 0, ndom, ndom, ndom, ndom)
+            row += (f"Synthetic sequence {i}",)
+            file.write(fmt % row)
+        file.write("#\n# [ok]\n")
+    return filepath
+
+
+def write_domtbl(filepath: Union[str, Path], nrows: int, seed: int = 0) -> Path:
+    """
+    Write a domtbl file of ``nrows`` random rows in HMMER's layout.
+
+    Rows come in groups of up to three domains of a same (target, query) pair.
+    """
+    filepath = Path(filepath)
+    rng = random.Random(seed)
+    fmt = "%-20s %-10s %5d %-20s %-10s %5d %9.2g %6.1f %5.1f %3d %3d %9.2g %9.2g"
+    fmt += " %6.1f %5.1f %5d %5d %5d %5d %5d %5d %4.2f %s\n"
+    with open(filepath, "w") as file:
+        file.write(_domtbl_header)
+        i = 0
+        while i < nrows:
+            ndom = min(rng.randrange(1, 4), nrows - i)
+            fam = rng.randrange(1000)
+            tlen = rng.randrange(20, 400)
+            qlen = rng.randrange(50, 1000)
+            evalue = 10 ** rng.uniform(-50, 1)
+            score = rng.uniform(0, 300)
+            bias = rng.uniform(0, 20)
+            for d in range(ndom):
+                hstart = rng.randrange(1, tlen)
+                hstop = rng.randrange(hstart, tlen + 1)
+                astart = rng.randrange(1, qlen)
+                astop = min(qlen, astart + hstop - hstart)
+                estart = max(1, astart - rng.randrange(3))
+                estop = min(qlen, astop + rng.randrange(3))
+                row = (f"Fam{fam}", f"PF{fam:05d}.1", tlen, f"seq{i}", "-", qlen)
+                row += (evalue, score, bias, d + 1, ndom)
+                row += (evalue * rng.uniform(0.1, 1), evalue, score / ndom, 0.1)
+                row += (hstart, hstop, astart, astop, estart, estop)
+                row += (rng.uniform(0.5, 1), f"Synthetic family {fam}")
+                file.write(fmt % row)
+            i += ndom
+        file.write("#\n# [ok]\n")
+    return filepath
@@ -0,0 +1,53 @@
+from pathlib import Path
+from typing import Callable, Tuple
+
+import pytest
+
+from hmmer import HMMER
+from hmmer.test._synthetic import write_profiles, write_sequences
+
+
+@pytest.fixture
+def make_db(tmp_path: Path) -> Callable[..., Tuple[HMMER, Path]]:
+    """
+    Factory of synthetic profile databases and of target sequences carrying their
+    domains, as ``(hmmer, target)``.
+    """
+
+    def make(
+        nprofiles: int = 4, nsequences: int = 8, length: int = 40, press: bool = True
+    ) -> Tuple[HMMER, Path]:
+        profile = write_profiles(tmp_path / "db.hmm", nprofiles, length)
+        target = write_sequences(tmp_path / "seqs.fasta", nsequences, nprofiles, length)
+        hmmer = HMMER(profile)
+        if press:
+            hmmer.press()
+        return hmmer, target
+
+    return make
+
+
+@pytest.fixture
+def profile(tmp_path: Path) -> Path:
+    """
+    Database of four synthetic profiles.
+    """
+    return write_profiles(tmp_path / "db.hmm", nprofiles=4)
+
+
+@pytest.fixture
+def target(tmp_path: Path) -> Path:
+    """
+    Eight target sequences carrying domains of :func:`profile`.
+    """
+    return write_sequences(tmp_path / "seqs.fasta", nsequences=8, nprofiles=4)
+
+
+@pytest.fixture
+def hmmer(profile: Path) -> HMMER:
+    """
+    Pressed :func:`profile` database.
+    """
+    hmmer = HMMER(profile)
+    hmmer.press()
+    return hmmer
@@ -0,0 +1,30 @@
+import os
+
+import numpy as np
+
+from hmmer import SeqDB, read_tbl_columns
+from hmmer.test._synthetic import write_sequences
+
+
+def test_all_vs_all(tmp_path):
+    seqs = write_sequences(tmp_path / "seqs.fasta", nsequences=10, nprofiles=3)
+    seqdb = SeqDB(seqs)
+
+    tbl = tmp_path / "tbl.txt"
+    seqdb.phmmer(seqs, output=os.devnull, tblout=tbl, domtblout=False, Z=10)
+    cols = read_tbl_columns(tbl)
+    expected = sorted(
+        (int(q[3:]) - 1, int(t[3:]) - 1, s)
+        for q, t, s in zip(cols.query_name, cols.target_name, cols.score)
+    )
+
+    sim = seqdb.all_vs_all(block_size=3, nworkers=2)
+    assert sim.shape == (10, 10)
+    assert list(sim.names) == [f"seq{i + 1}" for i in range(10)]
+    assert sim.query.dtype == np.int32
+    assert list(zip(sim.query.tolist(), sim.target.tolist(), sim.score)) == expected
+    assert np.array_equal(np.sort(sim.e_value), np.sort(cols.e_value))
+
+    empty = tmp_path / "empty.fasta"
+    empty.write_text("")
+    assert len(SeqDB(empty).all_vs_all()) == 0
@@ -0,0 +1,60 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from hmmer import (
+    DomTBLArchive,
+    TBLArchive,
+    read_domtbl,
+    read_domtbl_columns,
+    read_tbl,
+    write_domtbl_archive,
+    write_tbl_archive,
+)
+from hmmer.test._synthetic import write_domtbl, write_tbl
+from hmmer.typing import Result
+
+
+def test_domtbl_archive(tmp_path):
+    domtbl = write_domtbl(tmp_path / "domtbl.txt", 3000)
+    rows = read_domtbl(domtbl, typed=True)
+
+    write_domtbl_archive(domtbl, tmp_path / "domtbl.bin")
+    archive = DomTBLArchive(tmp_path / "domtbl.bin")
+    assert len(archive) == len(rows)
+    assert list(archive) == rows
+    assert archive[1234] == rows[1234]
+    assert archive[-1] == rows[-1]
+
+    assert isinstance(archive.records, np.memmap)
+    expected = read_domtbl_columns(domtbl)
+    cols = archive.columns()
+    for field in dataclasses.fields(cols):
+        assert np.array_equal(getattr(cols, field.name), getattr(expected, field.name))
+
+    write_domtbl_archive(Result(domtbl=domtbl), tmp_path / "result.bin")
+    assert list(DomTBLArchive(tmp_path / "result.bin")) == rows
+
+    with pytest.raises(ValueError):
+        TBLArchive(tmp_path / "domtbl.bin")
+    with pytest.raises(ValueError):
+        DomTBLArchive(domtbl)
+
+
+def test_tbl_archive(tmp_path):
+    tbl = write_tbl(tmp_path / "tbl.txt", 3000)
+    rows = read_tbl(tbl, typed=True)
+
+    write_tbl_archive(tbl, tmp_path / "tbl.bin")
+    archive = TBLArchive(tmp_path / "tbl.bin")
+    assert list(archive) == rows
+    assert archive[42] == rows[42]
+
+    empty = tmp_path / "empty.txt"
+    empty.write_text("#\n")
+    write_tbl_archive(empty, tmp_path / "empty.bin")
+    archive = TBLArchive(tmp_path / "empty.bin")
+    assert len(archive) == 0
+    assert list(archive) == []
+    assert len(archive.columns()) == 0
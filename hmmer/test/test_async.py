@@ -0,0 +1,78 @@
+import asyncio
+from subprocess import TimeoutExpired
+
+import pytest
+
+from hmmer import SeqDB
+from hmmer.test._synthetic import write_sequences
+
+
+def test_ascan_asearch(tmp_path, hmmer, target):
+    hmmer.concurrency = 2
+    output = tmp_path / "output.txt"
+
+    scan = hmmer.scan(target, output=output)
+    search = hmmer.search(target, output=output, hmmkey="Fam3")
+
+    async def main():
+        results = await asyncio.gather(
+            *[hmmer.ascan(target, output=output) for _ in range(3)],
+            hmmer.asearch(target, output=output, hmmkey="Fam3"),
+        )
+        rows = [row async for row in hmmer.ascan_rows(target)]
+        return results, rows
+
+    results, rows = asyncio.run(main())
+    for result in results[:3]:
+        assert result.tbl == scan.tbl
+        assert result.domtbl == scan.domtbl
+    assert results[3].domtbl == search.domtbl
+    assert rows == scan.domtbl
+
+
+def test_aphmmer(tmp_path):
+    target = write_sequences(tmp_path / "seqs.fasta", nsequences=6)
+    seqdb = SeqDB(target)
+    output = tmp_path / "output.txt"
+
+    expected = seqdb.phmmer(target, output=output)
+
+    async def main():
+        result = await seqdb.aphmmer(target, output=output)
+        rows = [row async for row in seqdb.aphmmer_rows(target, typed=True)]
+        return result, rows
+
+    result, rows = asyncio.run(main())
+    assert result.domtbl == expected.domtbl
+    assert [r.target.name for r in rows] == [r.target.name for r in expected.domtbl]
+    assert isinstance(rows[0].full_sequence.e_value, float)
+
+
+def test_async_timeout_cancel(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=4, nsequences=400, press=False)
+    output = tmp_path / "output.txt"
+
+    with pytest.raises(TimeoutExpired):
+        asyncio.run(hmmer.asearch(target, output=output, timeout=0.01))
+
+    # As in search, the timeout attribute bounds hmmkey fetches only.
+    hmmer.timeout = 0.001
+    expected = hmmer.search(target, output=output)
+    assert asyncio.run(hmmer.asearch(target, output=output)).domtbl == expected.domtbl
+
+    async def cancel():
+        task = asyncio.ensure_future(hmmer.asearch(target))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel())
+
+    async def first():
+        rows = hmmer.asearch_rows(target)
+        async for row in rows:
+            await rows.aclose()
+            return row
+
+    assert asyncio.run(first()).query.name == "Fam1"
@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from hmmer.bin import (
+    Backend,
+    _registry,
+    backend,
+    discover_backends,
+    hmmscan,
+    register_backend,
+    select_backend,
+)
+from hmmer.bin._registry import TOOLS, bundled_backend, probe_version
+
+
+def _fake_binaries(dirpath, version):
+    dirpath.mkdir(exist_ok=True)
+    for tool in TOOLS:
+        script = dirpath / tool
+        script.write_text(f"#!/bin/sh\necho '# HMMER {version} (February 2015)'\n")
+        script.chmod(0o755)
+    return dirpath
+
+
+def _link_bundled(dirpath):
+    dirpath.mkdir()
+    bundled = bundled_backend()
+    for tool in TOOLS:
+        os.symlink(bundled.binary(tool), dirpath / tool)
+    return dirpath
+
+
+def test_backend_default(tmp_path):
+    assert hmmscan == backend().binary("hmmscan")
+    assert hmmscan.exists()
+
+    # Backends registered once the binaries are in use would be ignored.
+    with pytest.raises(RuntimeError):
+        register_backend(_link_bundled(tmp_path / "late"))
+
+
+def test_backend_discover(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    local = _link_bundled(tmp_path / "local")
+    monkeypatch.setenv("HMMER_BIN", os.pathsep.join([str(local), str(tmp_path)]))
+    monkeypatch.setenv("PATH", str(tmp_path / "nowhere"))
+    backends = discover_backends()
+    assert [b.name for b in backends] == ["env", "bundled"]
+    assert backends[0].version == "3.3.2"
+    assert backends[0].binary("hmmscan") == local / "hmmscan"
+
+    # Same speed and version: the first source wins, unless a name is forced.
+    assert select_backend(backends, frozenset()).name == "env"
+    monkeypatch.setenv("HMMER_BACKEND", "bundled")
+    assert select_backend(backends, frozenset()).name == "bundled"
+
+
+def test_backend_probe(tmp_path, monkeypatch):
+    assert probe_version(tmp_path) is None
+    assert probe_version(_fake_binaries(tmp_path, "3.1b2")) == "3.1"
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("HMMER_BIN", str(_fake_binaries(tmp_path / "env", "3.3.1")))
+    assert discover_backends()[0].version == "3.3.1"
+    assert (tmp_path / "cache" / "hmmer" / "backends.json").is_file()
+
+    # Probed versions are reused until the binary changes.
+    def probe(dirpath, suffix=""):
+        raise AssertionError("Probed again.")
+
+    monkeypatch.setattr(_registry, "probe_version", probe)
+    assert discover_backends()[0].version == "3.3.1"
+
+    monkeypatch.undo()
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("HMMER_BIN", str(_fake_binaries(tmp_path / "env", "3.4")))
+    os.utime(tmp_path / "env" / "hmmscan", ns=(0, 0))
+    assert discover_backends()[0].version == "3.4"
+
+
+def test_backend_select():
+    bundled = Backend("bundled", bundled_backend().dirpath, "3.3.2")
+    newer = Backend("path", bundled.dirpath, "3.4")
+    avx2 = Backend("avx2", bundled.dirpath, "3.3.2", features=frozenset(["avx2"]))
+    avx512 = Backend(
+        "avx512", bundled.dirpath, "3.3.2", features=frozenset(["avx512bw"])
+    )
+    backends = [bundled, newer, avx2, avx512]
+
+    assert select_backend(backends, frozenset(["sse2"])) == newer
+    assert select_backend(backends, frozenset(["sse2", "avx2"])) == avx2
+    assert select_backend(backends, frozenset(["avx2", "avx512bw"])) == avx512
+    assert select_backend(backends, frozenset(), name="bundled") == bundled
+    with pytest.raises(RuntimeError):
+        select_backend(backends, frozenset(), name="missing")
+
+
+def test_backend_lazy(tmp_path, monkeypatch):
+    # Importing the wrappers neither probes binaries nor writes the probe cache.
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("HMMER_BIN", str(_link_bundled(tmp_path / "env")))
+    code = "import hmmer.hmmer, hmmer.bin._registry as r; print(r._selected)"
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    assert output == "None\n"
+    assert not (tmp_path / "cache").exists()
+
+    # A cache that cannot be written only means probing again.
+    (tmp_path / "file").write_text("")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "file"))
+    assert discover_backends()[0].version == "3.3.2"
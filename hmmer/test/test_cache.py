@@ -0,0 +1,80 @@
+from io import StringIO
+
+import pytest
+
+from hmmer import ResultCache, SeqDB
+
+
+def _records(filepath):
+    return [">" + block for block in filepath.read_text().split(">")[1:]]
+
+
+def test_cache_scan(tmp_path, hmmer, target):
+    output = tmp_path / "output.txt"
+    expected = hmmer.scan(target, output=output)
+    records = _records(target)
+
+    with ResultCache(tmp_path / "cache.sqlite") as cache:
+        first = hmmer.scan(StringIO("".join(records[:5])), output=output, cache=cache)
+        assert len(cache) == 5
+        assert (
+            first.domtbl
+            == hmmer.scan(StringIO("".join(records[:5])), output=output).domtbl
+        )
+
+        result = hmmer.scan(target, output=output, cache=cache)
+        assert len(cache) == 8
+        assert result.tbl == expected.tbl
+        assert result.domtbl == expected.domtbl
+
+        # Renamed sequences hit the cache.
+        renamed = "".join(records[:3]).replace(">seq", ">other")
+        result = hmmer.scan(StringIO(renamed), output=output, cache=cache)
+        assert len(cache) == 8
+        assert result.domtbl == hmmer.scan(StringIO(renamed), output=output).domtbl
+
+        # Other options make other keys.
+        hmmer.scan(target, output=output, cut_ga=True, cache=cache)
+        assert len(cache) == 16
+
+        cache.max_size = cache.size // 2
+        assert cache.size <= cache.max_size
+        assert len(cache) < 16
+
+
+def test_cache_search_phmmer(tmp_path, hmmer, target):
+    output = tmp_path / "output.txt"
+    records = _records(target)
+
+    with ResultCache(tmp_path / "cache.sqlite") as cache:
+        with pytest.raises(ValueError):
+            hmmer.search(target, output=output, cache=cache)
+
+        expected = hmmer.search(target, output=output, Z=100, domZ=100)
+        part = StringIO("".join(records[::2]))
+        hmmer.search(part, output=output, Z=100, domZ=100, cache=cache)
+        result = hmmer.search(target, output=output, Z=100, domZ=100, cache=cache)
+        assert result.tbl == expected.tbl
+        assert result.domtbl == expected.domtbl
+
+        # Cached rows take the name and description of the new header.
+        text = "".join(records)
+        text = text.replace(">seq1 Synthetic", ">other1 Renamed").replace(
+            ">seq2 Synthetic sequence 2", ">seq2"
+        )
+        n = len(cache)
+        result = hmmer.search(
+            StringIO(text), output=output, Z=100, domZ=100, cache=cache
+        )
+        assert len(cache) == n
+        expected = hmmer.search(StringIO(text), output=output, Z=100, domZ=100)
+        assert result.tbl == expected.tbl
+        assert result.domtbl == expected.domtbl
+        assert "Renamed sequence 1" in [row.description for row in result.tbl]
+
+        seqdb = SeqDB(target)
+        expected = seqdb.phmmer(target, output=output)
+        seqdb.phmmer(StringIO("".join(records[:4])), output=output, cache=cache)
+        result = seqdb.phmmer(target, output=output, cache=cache)
+        assert result.tbl == expected.tbl
+        assert result.domtbl == expected.domtbl
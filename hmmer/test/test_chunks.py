@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+
+def test_scan_chunks(tmp_path, hmmer, target):
+    expected = hmmer.scan(target, output=tmp_path / "output.txt")
+
+    results = list(hmmer.scan_chunks(target, chunk_size=3))
+    assert len(results) == 3
+    assert [row for r in results for row in r.tbl] == expected.tbl
+    assert [row for r in results for row in r] == expected.domtbl
+
+    checkpoint = tmp_path / "checkpoint.json"
+    chunks = hmmer.scan_chunks(target, chunk_size=3, checkpoint=checkpoint)
+    first = [next(chunks), next(chunks)]
+    chunks.close()
+    assert json.loads(checkpoint.read_text())["done"] == 1
+
+    with pytest.raises(ValueError):
+        next(hmmer.scan_chunks(target, chunk_size=2, checkpoint=checkpoint))
+
+    rest = list(hmmer.scan_chunks(target, chunk_size=3, checkpoint=checkpoint))
+    assert len(rest) == 2
+    assert rest[0].domtbl == first[1].domtbl
+    rows = [row for r in first[:1] + rest for row in r.domtbl]
+    assert rows == expected.domtbl
+    assert not checkpoint.exists()
+
+
+def test_scan_chunks_timeout(tmp_path, hmmer, target):
+    expected = hmmer.scan(target, output=tmp_path / "output.txt")
+
+    # The timeout bounds hmmkey fetches only, not the scan of a chunk.
+    hmmer.timeout = 0.001
+    results = list(hmmer.scan_chunks(target, chunk_size=3))
+    assert [row for r in results for row in r] == expected.domtbl
@@ -0,0 +1,35 @@
+import pytest
+
+from hmmer import HMMER
+from hmmer.test._synthetic import write_profiles
+
+
+def test_emit_many(tmp_path):
+    profile = write_profiles(tmp_path / "db.hmm", nprofiles=6)
+    hmmer = HMMER(profile)
+
+    counts = {"Fam1": 2, "Fam3": 2, "PF00004.1": 1, "Fam6": 3}
+    pairs = list(hmmer.emit_many(counts, seed=7, batch_size=2))
+    assert [key for key, _ in pairs] == ["Fam1"] * 2 + ["Fam3"] * 2 + ["PF00004.1"] + [
+        "Fam6"
+    ] * 3
+    assert pairs[0][1].id == "Fam1-sample1"
+    assert pairs[4][1].id == "Fam4-sample1"
+
+    # Reproducible, whatever the number of workers and the index.
+    assert list(hmmer.emit_many(counts, seed=7, batch_size=2, nworkers=3)) == pairs
+    hmmer.index()
+    assert list(hmmer.emit_many(counts, seed=7, batch_size=2)) == pairs
+    assert list(hmmer.emit_many(counts, seed=8, batch_size=2)) != pairs
+
+    # One profile per batch: samples of a key depend on the key alone.
+    single = dict(hmmer.emit_many(["Fam2", "Fam5"], seed=3, batch_size=1))
+    assert dict(hmmer.emit_many(["Fam5"], seed=3, batch_size=1)) == {
+        "Fam5": single["Fam5"]
+    }
+
+    consensus = list(hmmer.emit_many(["Fam2", "Fam5"], consensus=True))
+    assert [item.id for _, item in consensus] == ["Fam2-consensus", "Fam5-consensus"]
+
+    with pytest.raises(ValueError):
+        list(hmmer.emit_many(["Fam1", "Fam9"]))
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from hmmer import (
+    iter_domtbl,
+    read_domtbl_columns,
+    read_tbl_columns,
+    write_domtbl_parquet,
+    write_domtbl_sqlite,
+    write_tbl_parquet,
+    write_tbl_sqlite,
+)
+
+
+def _results(tmp_path, hmmer, target):
+    output = tmp_path / "output.txt"
+    scan = hmmer.scan(
+        target,
+        output=output,
+        tblout=tmp_path / "scan.tbl.txt",
+        domtblout=tmp_path / "scan.domtbl.txt",
+    )
+    search = hmmer.search(target, output=output, tblout=tmp_path / "search.tbl.txt")
+    return scan, search
+
+
+def test_export_sqlite(tmp_path, hmmer, target):
+    scan, search = _results(tmp_path, hmmer, target)
+    db = tmp_path / "hits.sqlite"
+
+    cols = read_domtbl_columns(tmp_path / "scan.domtbl.txt")
+    assert write_domtbl_sqlite(scan, db, batch_size=5) == len(cols)
+    # Replaced, not appended.
+    assert write_domtbl_sqlite(iter_domtbl(tmp_path / "scan.domtbl.txt"), db) == len(
+        cols
+    )
+
+    n = write_domtbl_sqlite([search], db, append=True)
+    assert write_tbl_sqlite(scan, db) == len(scan.tbl)
+
+    with sqlite3.connect(str(db)) as conn:
+        count = conn.execute("SELECT COUNT(*) FROM domtbl").fetchone()[0]
+        assert count == len(cols) + n
+        rows = conn.execute(
+            "SELECT target_name, query_name, e_value, hmm_start FROM domtbl "
+            "WHERE query_accession = '-' ORDER BY rowid LIMIT ?",
+            (len(cols),),
+        ).fetchall()
+        expected = zip(cols.target_name, cols.query_name, cols.e_value, cols.hmm_start)
+        assert rows == [(t, q, float(e), int(h)) for t, q, e, h in expected]
+
+        indexes = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'domtbl'"
+        ).fetchall()
+        assert sorted(i[0] for i in indexes) == [
+            "domtbl_e_value",
+            "domtbl_query_accession",
+            "domtbl_target_name",
+        ]
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM domtbl WHERE target_name = 'Fam1'"
+        ).fetchall()
+        assert "domtbl_target_name" in str(plan)
+
+    # Table names are quoted identifiers.
+    assert write_tbl_sqlite(scan, db, table="select") == len(scan.tbl)
+    with pytest.raises(ValueError):
+        write_tbl_sqlite(scan, db, table="tbl; DROP TABLE domtbl")
+
+
+def test_export_parquet(tmp_path, hmmer, target):
+    pq = pytest.importorskip("pyarrow.parquet")
+    scan, search = _results(tmp_path, hmmer, target)
+
+    filepath = write_domtbl_parquet(scan, tmp_path / "domtbl.parquet", batch_size=5)
+    table = pq.read_table(str(filepath))
+    cols = read_domtbl_columns(tmp_path / "scan.domtbl.txt")
+    assert table.column("target_name").to_pylist() == list(cols.target_name)
+    assert table.column("e_value").to_pylist() == list(cols.e_value)
+
+    dataset = tmp_path / "tbl"
+    write_tbl_parquet(scan, dataset, append=True)
+    write_tbl_parquet(search, dataset, append=True)
+    nrows = len(read_tbl_columns(tmp_path / "scan.tbl.txt"))
+    nrows += len(read_tbl_columns(tmp_path / "search.tbl.txt"))
+    assert pq.read_table(str(dataset)).num_rows == nrows
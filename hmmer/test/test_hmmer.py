@@ -1,4 +1,8 @@
+import gc
 import hashlib
+import os
+import warnings
+from io import StringIO
 
 from hmmer import HMMER, example_filepath
 
@@ -10,3 +14,32 @@ def test_fetch():
 
     hex = hashlib.sha256(profiles.encode()).hexdigest()
     assert hex == "1d869020a903c80da47eec0464b91b3e48aa095996e2f0df44e41e9e0e7bd6aa"
+
+
+def test_result_close(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=2, nsequences=4)
+
+    with hmmer.scan(StringIO(target.read_text()), output=os.devnull) as result:
+        filepath = result._tbl_file
+        assert len(result.tbl) > 0
+        # The copy of the stream target is removed once the run is done.
+        assert sorted(p.name for p in filepath.parent.iterdir()) == [
+            "domtbl.txt",
+            "tbl.txt",
+        ]
+    assert not filepath.parent.exists()
+    assert len(result.tbl) > 0
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = hmmer.scan(target, output=os.devnull)
+        filepath = result._tbl_file
+        del result
+        gc.collect()
+    assert not filepath.parent.exists()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+    tbl = tmp_path / "tbl.txt"
+    result = hmmer.scan(target, output=os.devnull, tblout=tbl, domtblout=False)
+    assert result._finalizer is None
+    assert len(result.tbl) > 0
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+_HEAVY = ["fasta_reader", "gff_io", "numpy", "pooch", "pytest", "requests"]
+
+
+def _loaded(code: str):
+    check = f"import sys; {code}; print(' '.join(sorted(sys.modules)))"
+    output = subprocess.check_output([sys.executable, "-c", check], text=True)
+    return set(output.split())
+
+
+def test_import_is_lazy():
+    modules = _loaded("import hmmer")
+    assert not modules & set(_HEAVY)
+    assert not [m for m in modules if m.startswith("hmmer.") and m != "hmmer._version"]
+
+
+def test_import_on_access():
+    modules = _loaded("import hmmer; hmmer.read_tbl")
+    assert "hmmer.tbl" in modules
+    assert "hmmer.hmmer" not in modules
+
+    modules = _loaded("import hmmer; hmmer.read_domtbl")
+    assert "hmmer.domtbl" in modules
+    assert not modules & set(_HEAVY)
+
+    modules = _loaded("from hmmer import HMMER, typing; HMMER.scan")
+    assert "hmmer.hmmer" in modules
+    assert not modules & set(_HEAVY + ["asyncio"])
@@ -0,0 +1,61 @@
+import json
+import os
+import time
+from io import StringIO
+from subprocess import TimeoutExpired
+
+import pytest
+
+from hmmer import SeqDB
+from hmmer.metrics import Metrics, call_measured
+
+
+def test_metrics(tmp_path, hmmer, target):
+    result = hmmer.scan(StringIO(target.read_text()), output=os.devnull)
+    metrics = result.metrics
+    assert [p.program for p in metrics.processes] == ["hmmscan"]
+    process = metrics.processes[0]
+    assert process.returncode == 0
+    assert process.max_rss > 0
+    assert process.wall_time > 0
+    assert metrics.cpu_time == process.user_time + process.system_time
+    assert set(metrics.phases) == {"target", "run"}
+    assert metrics.tables["domtbl"].bytes_written > 0
+    assert metrics.tables["domtbl"].rows == 0
+
+    nrows = len(result.domtbl)
+    assert nrows > 0
+    table = metrics.tables["domtbl"]
+    assert table.rows == nrows
+    assert table.bytes_read == table.bytes_written
+    assert "parse" in metrics.phases
+    json.dumps(metrics.asdict())
+
+    metrics = hmmer.scan(target, output=os.devnull, pipe=True).metrics
+    assert [p.program for p in metrics.processes] == ["hmmscan"]
+    assert metrics.tables["tbl"].rows > 0
+    assert metrics.tables["tbl"].bytes_read == metrics.tables["tbl"].bytes_written
+
+    metrics = hmmer.search(target, output=os.devnull, hmmkey="Fam2").metrics
+    assert sorted(p.program for p in metrics.processes) == ["hmmfetch", "hmmsearch"]
+
+    metrics = hmmer.search(target, domZ=10, nworkers=2).metrics
+    assert [p.program for p in metrics.processes] == ["hmmsearch"] * 2
+    assert {"split", "run", "merge"} <= set(metrics.phases)
+
+    metrics = SeqDB(target).phmmer(target, output=os.devnull).metrics
+    assert [p.program for p in metrics.processes] == ["phmmer"]
+
+
+def test_metrics_timeout():
+    metrics = Metrics()
+    call_measured(["sleep", "0.01"], metrics, timeout=10)
+    assert metrics.processes[0].program == "sleep"
+    assert metrics.processes[0].returncode == 0
+    assert metrics.processes[0].wall_time < 5
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutExpired):
+        call_measured(["sleep", "10"], metrics, timeout=0.1)
+    assert time.perf_counter() - start < 5
+    assert len(metrics.processes) == 1
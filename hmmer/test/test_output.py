@@ -0,0 +1,66 @@
+from subprocess import check_call
+
+from hmmer import HMMER, SeqDB, iter_domain_alignments
+from hmmer.bin import hmmsearch
+from hmmer.test._synthetic import write_profiles, write_sequences
+
+
+def _consistent(ali) -> bool:
+    # Identities on the middle row are the residues of both rows.
+    for m, s, q in zip(ali.match, ali.sequence, ali.model):
+        if m.isalpha() and not (m.upper() == s.upper() == q.upper()):
+            return False
+    return True
+
+
+def test_output_search(tmp_path):
+    # Long profiles, so that alignments wrap over several blocks.
+    profile = write_profiles(tmp_path / "db.hmm", nprofiles=3, length=150)
+    target = write_sequences(tmp_path / "seqs.fasta", nprofiles=3, length=150)
+    hmmer = HMMER(profile)
+    output = tmp_path / "output.txt"
+
+    result = hmmer.search(target, output=output)
+    alis = list(result.iter_domain_alignments())
+    rows = result.domtbl
+    assert len(alis) == len(rows)
+    for ali, row in zip(alis, rows):
+        assert (ali.query, ali.target) == (row.query.name, row.target.name)
+        assert ali.domain == int(row.domain.id)
+        assert ali.score == float(row.domain.score)
+        assert (ali.hmm_from, ali.hmm_to) == (row.hmm_coord.start, row.hmm_coord.stop)
+        assert (ali.seq_from, ali.seq_to) == (row.ali_coord.start, row.ali_coord.stop)
+        assert len(ali.model) == len(ali.match) == len(ali.sequence) == len(ali.pp)
+        assert _consistent(ali)
+
+    assert "  Fam1 106 " in output.read_text()
+    unwrapped = tmp_path / "unwrapped.txt"
+    check_call([str(hmmsearch), "--notextw", "-o", unwrapped, profile, target])
+    assert list(iter_domain_alignments(unwrapped)) == alis
+
+    stats = result.pipeline_stats
+    assert len(stats) == 3
+    assert all(s.elapsed >= 0 and s.mcells_per_sec > 0 for s in stats)
+
+
+def test_output_scan(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=4, nsequences=6)
+
+    result = hmmer.scan(target, output=tmp_path / "output.txt")
+    alis = list(result.iter_domain_alignments())
+    assert [(a.query, a.target) for a in alis] == [
+        (r.query.name, r.target.name) for r in result.domtbl
+    ]
+    assert all(_consistent(a) for a in alis)
+    assert list(hmmer.scan(target).iter_domain_alignments()) == []
+
+
+def test_output_phmmer(tmp_path):
+    target = write_sequences(tmp_path / "seqs.fasta", nsequences=6, nprofiles=3)
+    query = tmp_path / "query.fasta"
+    query.write_text(">" + target.read_text().split(">")[1])
+
+    result = SeqDB(target).phmmer(query, output=tmp_path / "output.txt")
+    alis = list(result.iter_domain_alignments())
+    assert len(alis) == len(result.domtbl)
+    assert alis[0].query == alis[0].target == "seq1"
@@ -0,0 +1,62 @@
+import pytest
+
+from hmmer import SeqDB
+from hmmer.test._synthetic import write_sequences
+
+
+def _key(row):
+    return (row.query.name, row.target.name, row.domain.id)
+
+
+def _tbl_key(row):
+    return (row.query.name, row.target.name)
+
+
+def test_scan_nworkers(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=6, nsequences=30)
+    output = tmp_path / "output.txt"
+
+    single = hmmer.scan(target, output=output)
+    sharded = hmmer.scan(target, output=output, nworkers=4, cpu=1)
+
+    assert len(single.domtbl) > 30
+    assert single.tbl == sharded.tbl
+    assert single.domtbl == sharded.domtbl
+
+
+def test_search_nworkers(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=6, nsequences=30, press=False)
+    output = tmp_path / "output.txt"
+
+    single = hmmer.search(target, output=output, domZ=30)
+    sharded = hmmer.search(target, domZ=30, nworkers=3)
+    assert sorted(single.tbl, key=_tbl_key) == sorted(sharded.tbl, key=_tbl_key)
+    assert sorted(single.domtbl, key=_key) == sorted(sharded.domtbl, key=_key)
+
+    # Domains of shards are reported against the number of targets of the whole run.
+    single = hmmer.search(target, output=output)
+    sharded = hmmer.search(target, nworkers=3)
+    assert [r.query.name for r in single.tbl] == [r.query.name for r in sharded.tbl]
+    assert sorted(single.tbl, key=_tbl_key) == sorted(sharded.tbl, key=_tbl_key)
+    assert sorted(single.domtbl, key=_key) == sorted(sharded.domtbl, key=_key)
+
+    sharded = hmmer.search(target, hmmkey="Fam2", nworkers=3)
+    assert len(sharded.tbl) == 5
+    assert all(row.query.name == "Fam2" for row in sharded.tbl)
+
+    with pytest.raises(ValueError):
+        hmmer.search(target, output=output, nworkers=3)
+    with pytest.raises(ValueError):
+        hmmer.search(target, alignment=True, nworkers=3)
+
+
+def test_phmmer_nworkers(tmp_path):
+    target = write_sequences(tmp_path / "seqs.fasta", nsequences=12)
+    seqdb = SeqDB(target)
+    output = tmp_path / "output.txt"
+
+    single = seqdb.phmmer(target, output=output)
+    sharded = seqdb.phmmer(target, output=output, nworkers=5)
+
+    assert single.tbl == sharded.tbl
+    assert single.domtbl == sharded.domtbl
@@ -0,0 +1,61 @@
+import os
+from io import StringIO
+
+from hmmer import SeqDB
+from hmmer.test._synthetic import write_sequences
+
+
+def test_pipe_scan_search(tmp_path, hmmer, target):
+    output = tmp_path / "output.txt"
+    text = target.read_text()
+
+    expected = hmmer.scan(target, output=output)
+    result = hmmer.scan(StringIO(text), output=output, pipe=True)
+    assert result.tbl == expected.tbl
+    assert result.domtbl == expected.domtbl
+
+    result = hmmer.scan(target, output=output, tblout=False, pipe=True)
+    assert not result.has_tbl
+    assert result.domtbl == expected.domtbl
+
+    expected = hmmer.search(target, output=output)
+    result = hmmer.search(StringIO(text), output=output, pipe=True)
+    assert result.tbl == expected.tbl
+    assert result.domtbl == expected.domtbl
+
+    expected = hmmer.search(target, output=output, hmmkey="Fam2")
+    domtbl = tmp_path / "domtbl.txt"
+    result = hmmer.search(
+        StringIO(text), output=output, domtblout=domtbl, hmmkey="Fam2", pipe=True
+    )
+    assert len(result.tbl) > 0
+    assert result.tbl == expected.tbl
+    assert result.domtbl == expected.domtbl
+    assert domtbl.exists()
+
+
+def test_pipe_phmmer(tmp_path):
+    target = write_sequences(tmp_path / "seqs.fasta", nsequences=6)
+    seqdb = SeqDB(target)
+    output = tmp_path / "output.txt"
+
+    expected = seqdb.phmmer(target, output=output)
+    result = seqdb.phmmer(StringIO(target.read_text()), output=output, pipe=True)
+    assert result.tbl == expected.tbl
+    assert result.domtbl == expected.domtbl
+
+
+def test_pipe_timeout(tmp_path, hmmer, target):
+    seqdb = SeqDB(target)
+    expected = [
+        hmmer.scan(target, output=os.devnull).domtbl,
+        hmmer.search(target, output=os.devnull).domtbl,
+        seqdb.phmmer(target, output=os.devnull).domtbl,
+    ]
+
+    # As without a pipe, runs not reading an hmmkey fetch are not bounded.
+    hmmer.timeout = 0.001
+    seqdb.timeout = 0.001
+    assert hmmer.scan(target, output=os.devnull, pipe=True).domtbl == expected[0]
+    assert hmmer.search(target, output=os.devnull, pipe=True).domtbl == expected[1]
+    assert seqdb.phmmer(target, output=os.devnull, pipe=True).domtbl == expected[2]
@@ -0,0 +1,45 @@
+import pytest
+
+from hmmer.pipeline import PRESETS, read_pipeline_stats
+from hmmer.typing import Pipeline
+
+
+def test_pipeline_options():
+    assert Pipeline().aslist() == []
+    assert Pipeline(F1=0.1, bias=False).aslist() == ["--F1", "0.1", "--nobias"]
+    assert PRESETS["max"].aslist() == ["--max"]
+    with pytest.raises(ValueError):
+        Pipeline(F2=1e-3, max=True)
+
+
+def test_pipeline_stats(tmp_path, hmmer, target):
+    output = tmp_path / "output.txt"
+
+    stats = hmmer.scan(target, output=output).pipeline_stats
+    assert [s.query for s in stats] == [f"seq{i + 1}" for i in range(8)]
+    for s in stats:
+        assert (s.queries, s.targets, s.nodes, s.Z) == (1, 4, 160, 4)
+        assert s.residues > 0
+        assert s.targets >= s.passed_msv >= s.passed_vit >= s.passed_fwd >= 1
+
+    stats = hmmer.scan(target, output=output, heuristic=False).pipeline_stats
+    assert all(s.passed_fwd == s.targets for s in stats)
+    assert read_pipeline_stats(output) == stats
+
+    fast = hmmer.search(target, output=output, pipeline="fast").pipeline_stats
+    default = hmmer.search(target, output=output, pipeline="default").pipeline_stats
+    assert [s.query for s in fast] == ["Fam1", "Fam2", "Fam3", "Fam4"]
+    for f, d in zip(fast, default):
+        assert f.targets == 8
+        assert f.passed_msv <= d.passed_msv
+
+    pipeline = Pipeline(F1=0.5, F2=0.5, F3=0.5, bias=False)
+    stats = hmmer.search(target, output=output, Z=100, pipeline=pipeline).pipeline_stats
+    assert all(s.Z == 100 and s.passed_bias == s.passed_msv for s in stats)
+
+    with pytest.raises(ValueError, match="main output"):
+        hmmer.scan(target).pipeline_stats
+    with pytest.raises(ValueError):
+        hmmer.scan(target, heuristic=False, pipeline="fast")
+    with pytest.raises(ValueError):
+        hmmer.scan(target, pipeline="slow")
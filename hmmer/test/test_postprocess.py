@@ -0,0 +1,86 @@
+import dataclasses
+
+import numpy as np
+
+from hmmer import best_hits, filter_domains, resolve_overlaps
+from hmmer.typing import DomTBLColumns
+
+
+def _table(n: int, seed: int = 0) -> DomTBLColumns:
+    rng = np.random.RandomState(seed)
+    fams = rng.randint(0, 12, n)
+    start = rng.randint(1, 300, n).astype(np.int32)
+    cols = {f.name: np.zeros(n) for f in dataclasses.fields(DomTBLColumns)}
+    cols.update(
+        target_name=np.array([f"Fam{i}" for i in fams], dtype=object),
+        target_accession=np.array([f"PF{i:05d}.1" for i in fams], dtype=object),
+        query_name=np.array([f"seq{i}" for i in rng.randint(0, 15, n)], dtype=object),
+        i_value=10.0 ** rng.uniform(-30, 1, n),
+        c_value=10.0 ** rng.uniform(-30, 1, n),
+        e_value=10.0 ** rng.uniform(-30, 1, n),
+        domain_score=rng.uniform(0, 100, n).round(1),
+        score=rng.uniform(0, 100, n),
+        env_start=start,
+        env_stop=(start + rng.randint(0, 60, n)).astype(np.int32),
+    )
+    return DomTBLColumns(**cols)
+
+
+def _resolve(cols, index, clans=None):
+    kept = []
+    order = sorted(index, key=lambda i: (cols.i_value[i], -cols.domain_score[i]))
+    for i in order:
+        clan = "" if clans is None else clans.get(cols.target_name[i], "")
+        if clans is not None and clan == "":
+            kept.append(i)
+            continue
+        overlap = False
+        for j in kept:
+            other = "" if clans is None else clans.get(cols.target_name[j], "")
+            if cols.query_name[i] != cols.query_name[j] or clan != other:
+                continue
+            if (
+                cols.env_start[i] <= cols.env_stop[j]
+                and cols.env_start[j] <= cols.env_stop[i]
+            ):
+                overlap = True
+        if not overlap:
+            kept.append(i)
+    return sorted(kept)
+
+
+def test_filter_best():
+    cols = _table(500)
+
+    index = filter_domains(cols, i_value=1e-5, domain_score=20)
+    expected = [
+        i
+        for i in range(len(cols))
+        if cols.i_value[i] <= 1e-5 and cols.domain_score[i] >= 20
+    ]
+    assert index.tolist() == expected
+    assert len(cols[index]) == len(expected)
+
+    best = best_hits(cols, index=index)
+    expected = {}
+    for i in index:
+        q = cols.query_name[i]
+        key = (-cols.domain_score[i], cols.i_value[i])
+        if q not in expected or key < expected[q][0]:
+            expected[q] = (key, i)
+    assert best.tolist() == sorted(i for _, i in expected.values())
+    assert len(best_hits(cols, by="target_name")) == 12
+
+
+def test_resolve_overlaps():
+    cols = _table(2000, seed=1)
+    index = filter_domains(cols, i_value=1e-2)
+
+    kept = resolve_overlaps(cols, index=index)
+    assert kept.tolist() == _resolve(cols, index.tolist())
+
+    clans = {f"Fam{i}": f"CL{i % 3}" for i in range(8)}
+    kept = resolve_overlaps(cols, clans=clans, index=index)
+    assert kept.tolist() == _resolve(cols, index.tolist(), clans)
+
+    assert len(resolve_overlaps(cols[:0])) == 0
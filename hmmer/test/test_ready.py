@@ -0,0 +1,106 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from hmmer import HMMER
+from hmmer.test._synthetic import write_profiles, write_sequences
+
+
+def test_ensure_ready(tmp_path):
+    profile = write_profiles(tmp_path / "db.hmm", nprofiles=3)
+    target = write_sequences(tmp_path / "seqs.fasta", nsequences=3, nprofiles=3)
+    hmmer = HMMER(profile)
+    assert not hmmer.is_pressed
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: HMMER(profile).ensure_ready(), range(4)))
+
+    hmmer.ensure_ready()
+    assert hmmer.is_pressed
+    assert hmmer.is_indexed
+    assert len(hmmer.ssi) == 3
+    assert len(hmmer.scan(target, output=tmp_path / "output.txt").tbl) > 0
+
+    # Artifacts sit in a generation directory, next to a link to the profile.
+    first = hmmer._profile
+    assert first.parent.parent == profile.with_suffix(".hmm.ready")
+    assert first.resolve() == profile.resolve()
+    assert not profile.with_suffix(".hmm.h3m").exists()
+    h3m = first.with_suffix(".hmm.h3m")
+    built = h3m.stat().st_mtime_ns
+    manifest = json.loads((first.parent.parent / "ready.json").read_text())
+    assert manifest["generation"] == first.parent.name
+    assert set(manifest["exts"]) == {".h3f", ".h3i", ".h3m", ".h3p", ".ssi"}
+
+    # Touched but unchanged: nothing is rebuilt.
+    os.utime(profile, ns=(built + 10**9, built + 10**9))
+    hmmer.ensure_ready()
+    assert hmmer._profile == first
+    assert h3m.stat().st_mtime_ns == built
+
+    # Changed content is built into a new generation, leaving the former one whole.
+    write_profiles(profile, nprofiles=4)
+    hmmer.ensure_ready()
+    assert hmmer._profile != first
+    assert len(hmmer.ssi) == 4
+    assert h3m.stat().st_mtime_ns == built
+
+    # Generations older than the former one are removed.
+    second = hmmer._profile
+    write_profiles(profile, nprofiles=2)
+    hmmer.ensure_ready()
+    assert len(hmmer.ssi) == 2
+    assert second.parent.exists()
+    assert not first.parent.exists()
+
+
+def test_ensure_ready_cache_dir(tmp_path):
+    cache_dir = tmp_path / "cache"
+    profiles = []
+    for name in ["a", "b"]:
+        (tmp_path / name).mkdir()
+        profiles.append(write_profiles(tmp_path / name / "db.hmm", nprofiles=3))
+
+    first = HMMER(profiles[0])
+    first.ensure_ready(index=False, cache_dir=cache_dir)
+    assert first.is_pressed
+    assert not profiles[0].with_suffix(".hmm.h3m").exists()
+
+    second = HMMER(profiles[1])
+    second.ensure_ready(cache_dir=cache_dir)
+    assert second.is_indexed
+    assert first._profile == second._profile
+    assert len(list(cache_dir.iterdir())) == 3
+
+    target = write_sequences(tmp_path / "seqs.fasta", nsequences=3, nprofiles=3)
+    output = tmp_path / "output.txt"
+    assert (
+        first.scan(target, output=output).tbl == second.scan(target, output=output).tbl
+    )
+    assert second.fetch_profile("Fam2").startswith("HMMER3/f")
+
+    # Contents that no source has now or had last are removed.
+    def digests():
+        return {p.name for p in cache_dir.iterdir() if p.is_dir()}
+
+    shared = first._profile.parent.parent.name
+    write_profiles(profiles[1], nprofiles=4)
+    second.ensure_ready(cache_dir=cache_dir)
+    replaced = second._profile.parent.parent.name
+    write_profiles(profiles[1], nprofiles=2)
+    second.ensure_ready(cache_dir=cache_dir)
+    assert len(second.ssi) == 2
+    last = second._profile.parent.parent.name
+    assert digests() == {shared, replaced, last}
+
+    write_profiles(profiles[1], nprofiles=1)
+    second.ensure_ready(cache_dir=cache_dir)
+    assert digests() == {shared, last, second._profile.parent.parent.name}
+
+    # Moved sources are forgotten, with the contents only they had.
+    moved = profiles[1].rename(tmp_path / "moved.hmm")
+    profiles[0].unlink()
+    HMMER(moved).ensure_ready(cache_dir=cache_dir)
+    sources = json.loads((cache_dir / "sources.json").read_text())
+    assert list(sources) == [str(moved)]
+    assert digests() == {second._profile.parent.parent.name}
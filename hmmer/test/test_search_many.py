@@ -0,0 +1,46 @@
+from io import StringIO
+
+import pytest
+
+from hmmer import HMMER
+from hmmer.test._synthetic import write_profiles
+
+
+def test_search_many(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=5, nsequences=10, press=False)
+    output = tmp_path / "output.txt"
+
+    keys = ["Fam4", "PF00002.1", "Fam5"]
+    results = hmmer.search_many(keys, StringIO(target.read_text()), output=output)
+    assert list(results.keys()) == keys
+
+    for key, name in zip(keys, ["Fam4", "Fam2", "Fam5"]):
+        expected = hmmer.search(target, output=output, hmmkey=key)
+        assert len(expected.tbl) > 0
+        assert results[key].tbl == expected.tbl
+        assert results[key].domtbl == expected.domtbl
+        assert all(row.query.name == name for row in results[key].domtbl)
+
+    # Missing keys are reported the same way with and without an index.
+    with pytest.raises(ValueError, match=r"^Profiles not found: Nope, Gone\.$"):
+        hmmer.search_many(["Fam1", "Nope", "Gone"], target, output=output)
+
+    hmmer.index()
+    results = hmmer.search_many(keys, target, nworkers=2)
+    expected = hmmer.search(target, output=output, hmmkey="Fam5")
+    assert results["Fam5"].tbl == expected.tbl
+    assert results["Fam5"].domtbl == expected.domtbl
+
+    with pytest.raises(ValueError, match=r"^Profiles not found: Nope, Gone\.$"):
+        hmmer.search_many(["Fam1", "Nope", "Gone"], target, output=output)
+
+
+def test_fetch_many(tmp_path):
+    profile = write_profiles(tmp_path / "db.hmm", nprofiles=3)
+    hmmer = HMMER(profile)
+
+    profiles = hmmer.fetch(["Fam3", "PF00001.1"])
+    names = [
+        line.split()[1] for line in profiles.splitlines() if line.startswith("NAME")
+    ]
+    assert sorted(names) == ["Fam1", "Fam3"]
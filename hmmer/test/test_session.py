@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pytest
+
+
+def _split(filepath):
+    text = filepath.read_text()
+    return [">" + block for block in text.split(">")[1:]]
+
+
+def test_session_scan(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=4, nsequences=6)
+    output = tmp_path / "output.txt"
+
+    records = _split(target)
+    expected = [hmmer.scan(StringIO(r), output=output) for r in records]
+
+    with hmmer.session(batch_size=4) as session:
+        futures = [session.submit_scan(StringIO(r)) for r in records]
+        results = [f.result() for f in futures]
+        assert session.scan(StringIO(records[0])).domtbl == expected[0].domtbl
+
+    for e, r in zip(expected, results):
+        assert len(r.domtbl) > 0
+        assert e.tbl == r.tbl
+        assert e.domtbl == r.domtbl
+
+    with pytest.raises(RuntimeError):
+        session.scan(target)
+
+
+def test_session_search(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=4, nsequences=6, press=False)
+    output = tmp_path / "output.txt"
+
+    expected = hmmer.search(target, output=output)
+    with hmmer.session(nworkers=2) as session:
+        futures = [session.submit_search(target) for _ in range(3)]
+        for future in futures:
+            result = future.result()
+            assert result.tbl == expected.tbl
+            assert result.domtbl == expected.domtbl
+
+
+def test_session_close_race(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=2, nsequences=2)
+    record = _split(target)[0]
+
+    session = hmmer.session(nworkers=2)
+    futures = []
+
+    def submit():
+        for _ in range(100):
+            try:
+                futures.append(session.submit_scan(StringIO(record)))
+            except RuntimeError:
+                return
+            time.sleep(0.005)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(4):
+            executor.submit(submit)
+        time.sleep(0.1)
+        session.close()
+
+    # Every call accepted before closing is served.
+    assert len(futures) > 0
+    for future in futures:
+        assert len(future.result(timeout=10).domtbl) > 0
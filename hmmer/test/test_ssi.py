@@ -0,0 +1,41 @@
+from subprocess import check_output
+
+import pytest
+
+from hmmer import HMMER, SSIIndex
+from hmmer.bin import hmmfetch
+from hmmer.test._synthetic import write_profiles
+
+
+def test_ssi(tmp_path):
+    synthetic = write_profiles(tmp_path / "synthetic.hmm", nprofiles=5)
+    # Profiles as written by HMMER itself.
+    profile = tmp_path / "db.hmm"
+    profile.write_text(HMMER(synthetic).fetch([f"Fam{i}" for i in range(1, 6)]) + "\n")
+
+    hmmer = HMMER(profile)
+    assert hmmer.ssi is None
+    hmmer.index()
+    ssi = hmmer.ssi
+    assert isinstance(ssi, SSIIndex)
+    assert len(ssi) == 5
+    assert list(ssi.keys()) == ["Fam1", "Fam2", "Fam3", "Fam4", "Fam5"]
+    assert "PF00004.1" in ssi
+    assert "Fam6" not in ssi
+
+    for key in ["Fam1", "Fam3", "PF00005.1"]:
+        expected = check_output([str(hmmfetch), str(profile), key], text=True)
+        assert hmmer.fetch_profile(key) == expected[:-1]
+
+    filepath, offset = ssi.offset("Fam2")
+    assert filepath == profile
+    with open(profile, "rb") as file:
+        file.seek(offset)
+        assert file.read(8) == b"HMMER3/f"
+
+    with pytest.raises(KeyError):
+        hmmer.fetch_profile("Fam6")
+
+    items = hmmer.emit("Fam4", nsamples=3, seed=1)
+    assert len(items) == 3
+    assert HMMER(synthetic).emit("Fam4", nsamples=3, seed=1) == items
@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+
+from hmmer import SeqDB, iter_stockholm
+
+_INTERLEAVED = """# STOCKHOLM 1.0
+#=GF ID Fam1
+#=GF CC First line
+#=GF CC second line
+#=GS seq1/1-6 DE Synthetic sequence 1
+
+seq1/1-6         ACD
+#=GR seq1/1-6 PP 9*8
+seq2/2-7         AC-
+#=GC RF          xxx
+
+seq1/1-6         EFG
+#=GR seq1/1-6 PP 7*9
+seq2/2-7         -FG
+#=GC RF          xx.
+//
+# STOCKHOLM 1.0
+#=GF ID Fam2
+//
+"""
+
+
+def test_stockholm_interleaved():
+    alis = list(iter_stockholm(StringIO(_INTERLEAVED)))
+    assert [ali.name for ali in alis] == ["Fam1", "Fam2"]
+
+    ali = alis[0]
+    assert ali.gf["CC"] == "First line second line"
+    assert ali.gs["seq1/1-6"]["DE"] == "Synthetic sequence 1"
+    assert ali.names == ["seq1/1-6", "seq2/2-7"]
+    assert (len(ali), ali.width) == (2, 6)
+    assert ali["seq1/1-6"] == bytearray(b"ACDEFG")
+    assert dict(ali)["seq2/2-7"] == b"AC--FG"
+    assert ali.column_tags == ["RF"]
+    assert ali.column_annotation("RF") == b"xxxxx."
+    assert ali.residue_annotation("seq1/1-6", "PP") == b"9*87*9"
+    with pytest.raises(KeyError):
+        ali.residue_annotation("seq2/2-7", "PP")
+
+    assert (len(alis[1]), alis[1].width) == (0, 0)
+
+
+def test_stockholm_search(tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=3, nsequences=6, press=False)
+
+    result = hmmer.search(target, output=tmp_path / "output.txt", alignment=True)
+    assert not hmmer.search(target, output=tmp_path / "output.txt").has_alignment
+    alis = list(result.iter_alignments())
+    assert [ali.name for ali in alis] == ["Fam1", "Fam2", "Fam3"]
+    assert [ali.accession for ali in alis] == ["PF00001.1", "PF00002.1", "PF00003.1"]
+
+    domtbl = result.domtbl
+    for ali in alis:
+        # Only domains that pass the inclusion thresholds are aligned.
+        rows = [r for r in domtbl if r.query.name == ali.name]
+        names = {
+            f"{r.target.name}/{r.ali_coord.start}-{r.ali_coord.stop}" for r in rows
+        }
+        assert len(ali) > 0 and set(ali.names) <= names
+        assert len(ali.column_annotation("RF")) == ali.width
+        for name, row in ali:
+            assert len(ali.residue_annotation(name, "PP")) == len(row)
+
+    alignment = tmp_path / "alignment.sto"
+    piped = hmmer.search(StringIO(target.read_text()), alignment=alignment, pipe=True)
+    assert [ali.names for ali in piped.iter_alignments()] == [ali.names for ali in alis]
+
+    seqdb = SeqDB(target)
+    query = StringIO(">" + target.read_text().split(">")[1])
+    result = seqdb.phmmer(query, output=tmp_path / "output.txt", alignment=alignment)
+    assert [ali.name for ali in result.iter_alignments()] == ["seq1"]
@@ -1,8 +1,17 @@
 from io import StringIO
 
+import numpy as np
 import pytest
 
-from hmmer import read_domtbl, read_tbl
+from hmmer import (
+    iter_domtbl,
+    iter_tbl,
+    read_domtbl,
+    read_domtbl_columns,
+    read_tbl,
+    read_tbl_columns,
+)
+from hmmer.typing import Result
 
 _tbl_content = """#                                                               --- full sequence ---- --- best 1 domain ---- --- domain number estimation ----
 # target name        accession  query name           accession    E-value  score  bias   E-value  score  bias   exp reg clu  ov env dom rep inc description of target
@@ -145,3 +154,90 @@ def test_domtbl_empty():
     tbl = iter(read_domtbl(StringIO(_domtbl_empty_content)))
     with pytest.raises(StopIteration):
         next(tbl)
+
+
+def test_iter_tables():
+    rows = iter_tbl(StringIO(_tbl_content))
+    assert next(rows).target.name == "item2"
+    assert next(rows).target.name == "item3"
+    with pytest.raises(StopIteration):
+        next(rows)
+
+    rows = iter_domtbl(StringIO(_domtbl_content))
+    assert next(rows) == read_domtbl(StringIO(_domtbl_content))[0]
+    assert len(list(rows)) == 7
+
+
+def test_result_lazy(tmp_path):
+    tbl = tmp_path / "tbl.txt"
+    domtbl = tmp_path / "domtbl.txt"
+    tbl.write_text(_tbl_content)
+    domtbl.write_text(_domtbl_content)
+
+    result = Result(tbl, domtbl)
+    assert result.has_tbl
+    assert result.has_domtbl
+    assert [row.target.name for row in result][:2] == ["Leader_Thr", "Y1_Tnp"]
+    assert result._domtbl is None
+    assert result.tbl == read_tbl(tbl)
+    assert result.domtbl == read_domtbl(domtbl)
+    assert list(result.iter_domtbl()) == result.domtbl
+
+    result = Result(domtbl=domtbl)
+    assert not result.has_tbl
+
+
+def test_tbl_columns():
+    cols = read_tbl_columns(StringIO(_tbl_content))
+    assert len(cols) == 2
+    assert list(cols.target_name) == ["item2", "item3"]
+    assert cols.e_value.dtype == np.float64
+    assert cols.inc.dtype == np.int32
+    assert cols.e_value[0] == 1.2e-07
+    assert cols.exp[1] == 1.0
+    assert list(cols.description) == ["Description one two three", "-"]
+
+    assert len(read_tbl_columns(StringIO(""))) == 0
+
+
+def test_domtbl_columns():
+    rows = read_domtbl(StringIO(_domtbl_content))
+    cols = read_domtbl_columns(StringIO(_domtbl_content))
+    assert len(cols) == len(rows)
+    assert cols.hmm_start.dtype == np.int32
+    assert cols.i_value.dtype == np.float64
+    for i, row in enumerate(rows):
+        assert cols.target_name[i] == row.target.name
+        assert cols.query_length[i] == row.query.length
+        assert cols.e_value[i] == float(row.full_sequence.e_value)
+        assert cols.c_value[i] == float(row.domain.c_value)
+        assert cols.domain_id[i] == row.domain.id
+        assert cols.env_stop[i] == row.env_coord.stop
+        assert cols.acc[i] == float(row.acc)
+        assert cols.description[i] == row.description
+
+    subset = cols[cols.target_name == "ACT_7"]
+    assert len(subset) == 2
+    assert list(subset.domain_id) == [1, 2]
+
+    cols = read_domtbl_columns(StringIO(_domtbl_empty_content))
+    assert len(cols) == 0
+    assert cols.score.dtype == np.float64
+
+
+def test_tables_typed():
+    row = read_tbl(StringIO(_tbl_content), typed=True)[0]
+    assert row.full_sequence.e_value == 1.2e-07
+    assert row.best_1_domain.score == 19.5
+    assert row.domain_numbers.inc == 1
+
+    row = read_domtbl(StringIO(_domtbl_content), typed=True)[0]
+    assert row.full_sequence.e_value == 5.3e-10
+    assert row.full_sequence.bias == 17.5
+    assert row.domain.id == 1
+    assert row.domain.c_value == 3e-14
+    assert row.domain.i_value == 5.5e-10
+    assert row.domain.score == 38.8
+    assert row.hmm_coord.interval.end == 22
+    assert not hasattr(row, "__dict__")
+    assert not hasattr(row.domain, "__dict__")
@@ -0,0 +1,118 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hmmer import (
+    DirectoryQueue,
+    SQLiteQueue,
+    merge_scan,
+    publish_scan,
+    read_domtbl,
+    run_worker,
+)
+from hmmer.typing import Lease, TaskQueue
+
+
+@pytest.fixture(params=["directory", "sqlite"])
+def make_queue(request, tmp_path):
+    def make():
+        if request.param == "directory":
+            return DirectoryQueue(tmp_path / "queue")
+        return SQLiteQueue(tmp_path / "queue.sqlite")
+
+    return make
+
+
+def test_queue_abstract():
+    class Incomplete(TaskQueue):
+        def put(self, task_id, data):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_queue_leases(make_queue):
+    queue = make_queue()
+    queue.put("a", b"first")
+    queue.put("b", b"second")
+    queue.put("a", b"other")
+    assert queue.status() == {"pending": 2, "leased": 0, "done": 0}
+
+    lease = queue.lease("w1", 60)
+    assert (lease.task_id, lease.data) == ("a", b"first")
+    assert make_queue().lease("w2", 60).task_id == "b"
+    assert queue.lease("w3", 60) is None
+    assert queue.status() == {"pending": 0, "leased": 2, "done": 0}
+
+    # An expired lease goes to another worker, and the first one loses it.
+    queue.release(lease)
+    stale = queue.lease("w1", 0.01)
+    time.sleep(0.05)
+    taken = make_queue().lease("w2", 60)
+    assert taken.task_id == stale.task_id
+    assert not queue.heartbeat(stale, 60)
+    assert queue.heartbeat(taken, 60)
+
+    # The first result wins.
+    queue.complete(taken, b"result")
+    queue.complete(stale, b"late")
+    assert list(queue.results()) == [("a", b"result")]
+    assert not queue.done
+    with pytest.raises(ValueError):
+        merge_scan(queue, "unused.txt")
+
+
+def test_directory_queue_races(tmp_path):
+    queue = DirectoryQueue(tmp_path / "queue")
+    queue.put("a", b"first")
+
+    # The owner renews its expired lease after another worker read it.
+    owner = queue.lease("w1", 0.05)
+    time.sleep(0.1)
+    current = queue._current_lease
+    renewed = []
+
+    def racing(task_id):
+        found = current(task_id)
+        if not renewed:
+            renewed.append(None)
+            renewed[0] = queue.heartbeat(owner, 60)
+        return found
+
+    queue._current_lease = racing
+    assert queue.lease("w2", 60) is None
+    del queue._current_lease
+    assert renewed == [True]
+    assert queue.heartbeat(owner, 60)
+
+    # Once another worker took the expired lease, the owner cannot renew it.
+    owner = Lease(owner.task_id, owner.data, owner.token, time.time())
+    queue.release(owner)
+    owner = queue.lease("w1", 0.05)
+    time.sleep(0.1)
+    other = queue.lease("w2", 60)
+    assert other is not None
+    assert not queue.heartbeat(owner, 60)
+    queue.release(owner)
+    assert queue.heartbeat(other, 60)
+    assert queue.status() == {"pending": 0, "leased": 1, "done": 0}
+
+
+def test_queue_scan(make_queue, tmp_path, make_db):
+    hmmer, target = make_db(nprofiles=4, nsequences=10)
+    expected = hmmer.scan(target, output=tmp_path / "output.txt").domtbl
+
+    queue = make_queue()
+    assert publish_scan(target, queue, chunk_size=3) == 4
+    assert publish_scan(target, queue, chunk_size=3) == 4
+    assert queue.status()["pending"] == 4
+
+    with ThreadPoolExecutor(2) as executor:
+        futures = [executor.submit(run_worker, hmmer, make_queue()) for _ in range(2)]
+        assert sum(f.result() for f in futures) == 4
+    assert queue.done
+
+    merged = merge_scan(queue, tmp_path / "domtbl.txt")
+    assert read_domtbl(merged) == expected
@@ -1,16 +1,48 @@
-from .domtbl import DomTBLCoord, DomTBLDomScore, DomTBLIndex, DomTBLRow, DomTBLSeqScore
+from ._session import Session
+from .domtbl import (
+    DomTBLColumns,
+    DomTBLCoord,
+    DomTBLDomScore,
+    DomTBLFloatDomScore,
+    DomTBLFloatSeqScore,
+    DomTBLIndex,
+    DomTBLRow,
+    DomTBLSeqScore,
+)
 from .hmmer import Result
-from .tbl import TBLDom, TBLIndex, TBLRow, TBLScore
+from .metrics import Metrics, ProcessMetrics, TableMetrics
+from .output import DomainAlignment
+from .pipeline import Pipeline, PipelineStats
+from .similarity import SimilarityMatrix
+from .stockholm import StockholmAlignment
+from .tbl import TBLColumns, TBLDom, TBLFloatScore, TBLIndex, TBLRow, TBLScore
+from .workqueue import Lease, TaskQueue
 
 __all__ = [
+    "DomTBLColumns",
     "DomTBLCoord",
     "DomTBLDomScore",
+    "DomTBLFloatDomScore",
+    "DomTBLFloatSeqScore",
     "DomTBLIndex",
     "DomTBLRow",
     "DomTBLSeqScore",
+    "DomainAlignment",
+    "Lease",
+    "Metrics",
+    "Pipeline",
+    "PipelineStats",
+    "ProcessMetrics",
     "Result",
+    "Session",
+    "SimilarityMatrix",
+    "StockholmAlignment",
+    "TBLColumns",
     "TBLDom",
+    "TBLFloatScore",
     "TBLIndex",
     "TBLRow",
     "TBLScore",
+    "TaskQueue",
+    "TableMetrics",
 ]
@@ -0,0 +1,559 @@
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from ._misc import make_path
+from ._shard import concat_tables, fasta_records
+from .hmmer import HMMER, make_target
+from .pipeline import Pipeline
+
+__all__ = [
+    "DirectoryQueue",
+    "Lease",
+    "SQLiteQueue",
+    "TaskQueue",
+    "merge_scan",
+    "publish_scan",
+    "run_worker",
+]
+
+
+@dataclass
+class Lease:
+    """
+    Temporary claim of a worker on a task.
+
+    Parameters
+    ----------
+    task_id
+        Identifier of the task.
+    data
+        Payload of the task.
+    token
+        Unique token of the claim. A lease taken over by another worker after it
+        expired has a new token.
+    expires
+        Time, as of :func:`time.time`, after which other workers may claim the task.
+    """
+
+    task_id: str
+    data: bytes
+    token: str
+    expires: float
+
+
+class TaskQueue(ABC):
+    """
+    Queue of tasks shared by workers that may run on different machines.
+
+    A worker leases a task for a given duration and renews the lease with
+    :meth:`.heartbeat` while it works. Tasks whose lease expires, because their
+    worker died or hung, go back to the queue. Completing a task stores its result
+    once: results of a task run more than once are ignored after the first, so
+    workers can upload them without coordination.
+    """
+
+    @abstractmethod
+    def put(self, task_id: str, data: bytes):
+        """
+        Add a task, unless a task of the same identifier exists.
+        """
+
+    @abstractmethod
+    def lease(self, worker: str, duration: float) -> Optional[Lease]:
+        """
+        Claim the first task that has no result and no valid lease, or return
+        ``None`` if there is none.
+        """
+
+    @abstractmethod
+    def heartbeat(self, lease: Lease, duration: float) -> bool:
+        """
+        Extend a lease by ``duration`` seconds from now. Returns ``False`` if the
+        lease was lost to another worker or the task is complete.
+        """
+
+    @abstractmethod
+    def release(self, lease: Lease):
+        """
+        Give a task back to the queue without a result.
+        """
+
+    @abstractmethod
+    def complete(self, lease: Lease, result: bytes):
+        """
+        Store the result of a task, unless it already has one, and end its lease.
+        """
+
+    @abstractmethod
+    def results(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        Identifier and result of each complete task, by identifier.
+        """
+
+    @abstractmethod
+    def status(self) -> Dict[str, int]:
+        """
+        Number of ``"pending"``, ``"leased"`` and ``"done"`` tasks.
+        """
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether every task is complete.
+        """
+        status = self.status()
+        return status["pending"] == 0 and status["leased"] == 0
+
+
+class DirectoryQueue(TaskQueue):
+    """
+    Task queue stored in a directory, for workers sharing a filesystem.
+
+    Tasks and results are one file each, under the ``tasks`` and ``results``
+    subdirectories. Each change of a lease writes its next version, numbered, to a
+    directory of the task under ``leases``. Claims and renewals rely on exclusive file
+    creation, which local filesystems and NFSv3 or later provide.
+
+    Parameters
+    ----------
+    dirpath
+        Path to the directory, created if missing.
+    """
+
+    def __init__(self, dirpath: Union[Path, str]):
+        self._dirpath = make_path(dirpath)
+        for name in ["tasks", "leases", "results"]:
+            (self._dirpath / name).mkdir(parents=True, exist_ok=True)
+
+    def _path(self, kind: str, task_id: str) -> Path:
+        return self._dirpath / kind / task_id
+
+    def _write_new(self, dest: Path, data: bytes) -> bool:
+        # Written aside, then linked, so that readers never see a partial file and
+        # the first writer wins.
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.link(tmp, dest)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.unlink(tmp)
+
+    def _current_lease(self, task_id: str) -> Tuple[int, Optional[Dict]]:
+        # Latest version of the lease of a task and its content, or 0 if none.
+        dirpath = self._path("leases", task_id)
+        while True:
+            try:
+                names = os.listdir(dirpath)
+            except FileNotFoundError:
+                return 0, None
+            versions = [int(name) for name in names if not name.startswith(".")]
+            if len(versions) == 0:
+                return 0, None
+            version = max(versions)
+            try:
+                with open(dirpath / str(version), "r") as file:
+                    return version, json.load(file)
+            except FileNotFoundError:
+                # Removed after a newer version was written.
+                continue
+
+    def _write_lease(self, task_id: str, version: int, lease: Dict) -> bool:
+        # Each change of a lease writes its next version, so that of the workers
+        # racing to change a given version, the first one wins.
+        dirpath = self._path("leases", task_id)
+        dirpath.mkdir(exist_ok=True)
+        if not self._write_new(dirpath / str(version), json.dumps(lease).encode()):
+            return False
+        # A late writer can create again a version removed after a newer one was
+        # written, and then finds that it is not the latest one.
+        if self._current_lease(task_id)[0] != version:
+            return False
+        for name in os.listdir(dirpath):
+            if not name.startswith(".") and int(name) < version:
+                try:
+                    os.unlink(dirpath / name)
+                except FileNotFoundError:
+                    pass
+        return True
+
+    def _task_ids(self) -> List[str]:
+        names = os.listdir(self._dirpath / "tasks")
+        return sorted(name for name in names if not name.startswith("."))
+
+    def put(self, task_id: str, data: bytes):
+        self._write_new(self._path("tasks", task_id), data)
+
+    def lease(self, worker: str, duration: float) -> Optional[Lease]:
+        for task_id in self._task_ids():
+            if self._path("results", task_id).exists():
+                continue
+            version, current = self._current_lease(task_id)
+            if current is not None and current["expires"] > time.time():
+                continue
+            token = uuid.uuid4().hex
+            expires = time.time() + duration
+            claim = {"worker": worker, "token": token, "expires": expires}
+            if not self._write_lease(task_id, version + 1, claim):
+                continue
+            data = self._path("tasks", task_id).read_bytes()
+            return Lease(task_id, data, token, expires)
+        return None
+
+    def heartbeat(self, lease: Lease, duration: float) -> bool:
+        version, current = self._current_lease(lease.task_id)
+        if current is None or current["token"] != lease.token:
+            return False
+        if self._path("results", lease.task_id).exists():
+            return False
+        expires = time.time() + duration
+        if not self._write_lease(
+            lease.task_id, version + 1, dict(current, expires=expires)
+        ):
+            return False
+        lease.expires = expires
+        return True
+
+    def release(self, lease: Lease):
+        released = {"worker": None, "token": None, "expires": 0.0}
+        while True:
+            version, current = self._current_lease(lease.task_id)
+            if current is None or current["token"] != lease.token:
+                return
+            # Retried if a heartbeat of the same lease got in first.
+            if self._write_lease(lease.task_id, version + 1, released):
+                return
+
+    def complete(self, lease: Lease, result: bytes):
+        self._write_new(self._path("results", lease.task_id), result)
+        self.release(lease)
+
+    def results(self) -> Iterator[Tuple[str, bytes]]:
+        for task_id in self._task_ids():
+            filepath = self._path("results", task_id)
+            if filepath.exists():
+                yield task_id, filepath.read_bytes()
+
+    def status(self) -> Dict[str, int]:
+        status = {"pending": 0, "leased": 0, "done": 0}
+        now = time.time()
+        for task_id in self._task_ids():
+            if self._path("results", task_id).exists():
+                status["done"] += 1
+                continue
+            lease = self._current_lease(task_id)[1]
+            if lease is not None and lease["expires"] > now:
+                status["leased"] += 1
+            else:
+                status["pending"] += 1
+        return status
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    worker TEXT,
+    token TEXT,
+    expires REAL NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+
+class SQLiteQueue(TaskQueue):
+    """
+    Task queue stored in a SQLite file, for workers on the same machine.
+
+    SQLite locking is unreliable over network filesystems, where
+    :class:`DirectoryQueue` should be used instead.
+
+    Parameters
+    ----------
+    filepath
+        Path to the SQLite file, created if missing.
+    timeout
+        Seconds to wait for another process to release the database. Defaults to
+        ``30``.
+    """
+
+    def __init__(self, filepath: Union[Path, str], timeout: float = 30.0):
+        self._filepath = make_path(filepath)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self._filepath),
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def _execute(self, *statements: Tuple[str, tuple]) -> List[tuple]:
+        # Statements run in a write transaction, taken before reading so that two
+        # workers cannot claim the same task.
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows: List[tuple] = []
+                for sql, params in statements:
+                    rows = self._conn.execute(sql, params).fetchall()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def put(self, task_id: str, data: bytes):
+        self._execute(
+            ("INSERT OR IGNORE INTO tasks (id, data) VALUES (?, ?)", (task_id, data))
+        )
+
+    def lease(self, worker: str, duration: float) -> Optional[Lease]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT id, data FROM tasks WHERE done = 0 AND expires <= ? "
+                    "ORDER BY id LIMIT 1",
+                    (now,),
+                ).fetchone()
+                lease = None
+                if row is not None:
+                    lease = Lease(
+                        row[0], bytes(row[1]), uuid.uuid4().hex, now + duration
+                    )
+                    self._conn.execute(
+                        "UPDATE tasks SET worker = ?, token = ?, expires = ? "
+                        "WHERE id = ?",
+                        (worker, lease.token, lease.expires, lease.task_id),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return lease
+
+    def heartbeat(self, lease: Lease, duration: float) -> bool:
+        expires = time.time() + duration
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET expires = ? WHERE id = ? AND token = ? AND done = 0",
+                (expires, lease.task_id, lease.token),
+            )
+        if cursor.rowcount == 0:
+            return False
+        lease.expires = expires
+        return True
+
+    def release(self, lease: Lease):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET worker = NULL, token = NULL, expires = 0 "
+                "WHERE id = ? AND token = ?",
+                (lease.task_id, lease.token),
+            )
+
+    def complete(self, lease: Lease, result: bytes):
+        self._execute(
+            ("INSERT OR IGNORE INTO results VALUES (?, ?)", (lease.task_id, result)),
+            ("UPDATE tasks SET done = 1 WHERE id = ?", (lease.task_id,)),
+        )
+        self.release(lease)
+
+    def results(self) -> Iterator[Tuple[str, bytes]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM results ORDER BY id")
+            rows = rows.fetchall()
+        for task_id, data in rows:
+            yield task_id, bytes(data)
+
+    def status(self) -> Dict[str, int]:
+        with self._lock:
+            done, leased, total = self._conn.execute(
+                "SELECT COALESCE(SUM(done), 0), "
+                "COALESCE(SUM(done = 0 AND expires > ?), 0), COUNT(*) FROM tasks",
+                (time.time(),),
+            ).fetchone()
+        return {"pending": total - done - leased, "leased": leased, "done": done}
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def publish_scan(
+    target: Union[Path, str, TextIO], queue: TaskQueue, chunk_size: int = 1000
+) -> int:
+    """
+    Split target sequences into tasks of up to ``chunk_size`` sequences each.
+
+    Task identifiers follow the order of the sequences, so that :func:`merge_scan`
+    gives the rows of a single scan. Publishing the same target again adds no task.
+
+    Returns
+    -------
+    Number of tasks.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = make_target(target, Path(tmpdir))
+        ntasks = 0
+        chunk: List[str] = []
+        for _, text, _ in fasta_records(filepath):
+            chunk.append(text)
+            if len(chunk) == chunk_size:
+                queue.put(f"{ntasks:08d}", "".join(chunk).encode())
+                ntasks += 1
+                chunk = []
+        if chunk:
+            queue.put(f"{ntasks:08d}", "".join(chunk).encode())
+            ntasks += 1
+    return ntasks
+
+
+def _heartbeats(
+    queue: TaskQueue, lease: Lease, duration: float, interval: float
+) -> Tuple[threading.Thread, threading.Event]:
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            if not queue.heartbeat(lease, duration):
+                break
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    return thread, stop
+
+
+def run_worker(
+    hmmer: HMMER,
+    queue: TaskQueue,
+    worker: Optional[str] = None,
+    lease_time: float = 60.0,
+    wait: bool = False,
+    poll: float = 1.0,
+    heuristic: bool = True,
+    cut_ga: bool = False,
+    Z: Optional[int] = None,
+    domZ: Optional[int] = None,
+    cpu: Optional[int] = None,
+    pipeline: Union[str, Pipeline, None] = None,
+) -> int:
+    """
+    Scan tasks of a queue until none is left, storing their domtbl rows as results.
+
+    The lease of the current task is renewed every third of ``lease_time`` while
+    hmmscan runs. A task whose scan fails is released for another attempt and the
+    error is raised.
+
+    Parameters
+    ----------
+    hmmer
+        Profile database.
+    queue
+        Queue filled by :func:`publish_scan`.
+    worker
+        Name of the worker, for inspection. Defaults to ``host:pid``.
+    lease_time
+        Seconds without heartbeat after which a task goes back to the queue.
+        Defaults to ``60``.
+    wait
+        Keep polling, every ``poll`` seconds, while tasks are leased by other
+        workers, in case they die. Defaults to ``False``, returning as soon as no
+        task can be claimed.
+    poll
+        See ``wait``. Defaults to ``1``.
+
+    Returns
+    -------
+    Number of tasks completed by this worker.
+    """
+    if worker is None:
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    ncompleted = 0
+    while True:
+        lease = queue.lease(worker, lease_time)
+        if lease is None:
+            if not wait or queue.done:
+                return ncompleted
+            time.sleep(poll)
+            continue
+
+        thread, stop = _heartbeats(queue, lease, lease_time, lease_time / 3)
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                domtblout = Path(tmpdir) / "domtbl.txt"
+                hmmer.scan(
+                    StringIO(lease.data.decode()),
+                    output=os.devnull,
+                    tblout=False,
+                    domtblout=domtblout,
+                    heuristic=heuristic,
+                    cut_ga=cut_ga,
+                    Z=Z,
+                    domZ=domZ,
+                    cpu=cpu,
+                    pipeline=pipeline,
+                )
+                result = domtblout.read_bytes()
+        except BaseException:
+            stop.set()
+            thread.join()
+            queue.release(lease)
+            raise
+        stop.set()
+        thread.join()
+        queue.complete(lease, result)
+        ncompleted += 1
+
+
+def merge_scan(queue: TaskQueue, filepath: Union[Path, str]) -> Path:
+    """
+    Write the domtbl rows of all tasks to a single file, in task order.
+
+    Raises ``ValueError`` if some tasks are not complete.
+    """
+    filepath = make_path(filepath)
+    status = queue.status()
+    if status["pending"] > 0 or status["leased"] > 0:
+        raise ValueError(
+            f"{status['pending'] + status['leased']} tasks are not complete."
+        )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        parts: List[Path] = []
+        for task_id, data in queue.results():
+            part = Path(tmpdir) / f"{task_id}.txt"
+            part.write_bytes(data)
+            parts.append(part)
+        if parts:
+            concat_tables(parts, filepath)
+        else:
+            filepath.write_text("")
+    return filepath